@@ -1,5 +1,6 @@
 from rest_framework import serializers
 
+from core.reference import ReferenceField
 from core.serializers import AddressSerializer
 
 from .models import AthleteExam, Exam, Highschool, University
@@ -49,7 +50,7 @@ class ExamSerializer(serializers.ModelSerializer):
 
 
 class AthleteExamSerializer(serializers.ModelSerializer):
-    exam = ExamSerializer(read_only=True)
+    exam = ReferenceField("academics.Exam")
 
     class Meta:
         model = AthleteExam
@@ -59,3 +60,14 @@ class AthleteExamSerializer(serializers.ModelSerializer):
             "score",
             "date_taken",
         ]
+
+
+class AthleteExamUpdateSerializer(serializers.ModelSerializer):
+    """An exam result on a profile update, rows without an `id` are created. `exam` is the exam's uuid."""
+
+    id = serializers.IntegerField(required=False)
+    exam = serializers.UUIDField()
+
+    class Meta:
+        model = AthleteExam
+        fields = ["id", "exam", "score", "date_taken"]
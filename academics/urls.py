@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .views import ExamCatalogView, UniversityCatalogView
+
+urlpatterns = [
+    path("exams/", ExamCatalogView.as_view(), name="exam-catalog"),
+    path("universities/", UniversityCatalogView.as_view(), name="university-catalog"),
+]
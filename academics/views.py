@@ -1 +1,19 @@
-# Create your views here.
+from core.views import CatalogView, catalog_schema
+
+from .serializers import ExamSerializer, UniversitySerializer
+
+
+class ExamCatalogView(CatalogView):
+    table = "academics.Exam"
+
+    @catalog_schema(ExamSerializer)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class UniversityCatalogView(CatalogView):
+    table = "academics.University"
+
+    @catalog_schema(UniversitySerializer)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
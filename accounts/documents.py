@@ -0,0 +1,141 @@
+"""
+Precomputed profile documents.
+
+Rendering a full profile takes six queries and the whole `AccountResponseSerializer` tree, and coaches open the same
+profiles over and over. Each account's rendered profile is therefore stored in `ProfileDocument` and served with a
+single query by `AccountRetrieve`. Documents hold every field, viewer-dependent projections such as hiding an
+athlete's scores are applied when the document is read.
+
+Sports, positions, schools and exams are stored as `core.reference` markers and hydrated when the document is read,
+so changes to them never touch the documents. Any other row that goes into a profile (the account, athlete or coach,
+statistics, exams taken, clubs and leagues) invalidates the documents it appears in, see `accounts.signals`: the
+stale documents are deleted at once and rebuilt when the transaction commits, one rebuild per transaction however
+many rows changed. Rebuilds of more than `INLINE_REBUILD_LIMIT` documents, such as a renamed club, are queued as
+background jobs instead. A missing document is built on first read.
+
+Two rebuilds of the same document (two quick edits, or a first read racing an edit) lock the account rows for the
+render and the upsert, so the one that runs last always renders the latest committed rows and no older render can
+overwrite it.
+
+Writes that skip model signals (`bulk_create`, `QuerySet.update`, raw SQL) have to call `invalidate`.
+"""
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Q
+
+from accounts.models import ProfileDocument
+from accounts.profiles import profile_queryset
+from api.instrumentation import cache_fill
+from api.replicas import primary
+from core.reference import hydrate
+from core.transactions import once_on_commit
+
+BATCH_SIZE = 500
+# Larger rebuilds leave the request for the job workers
+INLINE_REBUILD_LIMIT = 50
+
+
+def render(account):
+    """The document of `account`, loaded with `profile_queryset`."""
+    from accounts.serializers import AccountResponseSerializer
+
+    return AccountResponseSerializer(account, context={"reference_markers": True}).data
+
+
+def rebuild(accounts=(), athletes=()):
+    """Render and store the documents of `accounts` and of the accounts of `athletes` (ids). Returns {pk: data}."""
+    documents = {}
+    # A document rendered from a lagging replica would stay stale until the next invalidation
+    with primary():
+        for field, ids in [("pk", sorted(set(accounts))), ("athlete__pk", sorted(set(athletes)))]:
+            for start in range(0, len(ids), BATCH_SIZE):
+                batch = {f"{field}__in": ids[start : start + BATCH_SIZE]}
+                with transaction.atomic():
+                    # Held until the upsert commits, ordered by pk so concurrent rebuilds cannot deadlock
+                    locked = get_user_model().objects.select_for_update(of=("self",)).filter(**batch).order_by("pk")
+                    list(locked.values_list("pk", flat=True))
+                    rows = [
+                        ProfileDocument(account=profile, data=render(profile))
+                        for profile in profile_queryset().filter(**batch)
+                        if profile.pk not in documents
+                    ]
+                    ProfileDocument.objects.bulk_create(
+                        rows,
+                        update_conflicts=True,
+                        unique_fields=["account"],
+                        update_fields=["data", "built_at"],
+                    )
+                documents.update((row.account_id, row.data) for row in rows)
+    return documents
+
+
+def rebuild_all():
+    """Rebuild every document. Used to backfill and after bulk imports."""
+    ids = list(get_user_model().objects.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(ids), BATCH_SIZE):
+        rebuild(accounts=ids[start : start + BATCH_SIZE])
+    return len(ids)
+
+
+def get_document(account_id):
+    """The hydrated document of an account, built when missing. None when the account does not exist."""
+    data = ProfileDocument.objects.filter(account_id=account_id).values_list("data", flat=True).first()
+    if data is None:
+        with cache_fill():
+            data = rebuild(accounts=[account_id]).get(account_id)
+        if data is None:
+            return None
+    return hydrate(data)
+
+
+class Rebuild:
+    """The rebuild pending for the current transaction, collecting the accounts and athletes to rebuild."""
+
+    def __init__(self):
+        self.accounts = set()
+        self.athletes = set()
+        # Athletes whose account is already in `accounts`
+        self.covered = set()
+
+    def __call__(self):
+        athletes = self.athletes - self.covered
+        if len(self.accounts) + len(athletes) <= INLINE_REBUILD_LIMIT:
+            rebuild(self.accounts, athletes)
+            return
+        from accounts.tasks import rebuild_profile_documents
+
+        for field, ids in [("accounts", sorted(self.accounts)), ("athletes", sorted(athletes))]:
+            for start in range(0, len(ids), BATCH_SIZE):
+                rebuild_profile_documents.enqueue(**{field: ids[start : start + BATCH_SIZE]})
+
+
+def pending_rebuild():
+    return once_on_commit("accounts.documents.rebuild", Rebuild)
+
+
+def invalidate(accounts=(), athletes=()):
+    """
+    Drop the documents of `accounts` and of the accounts of `athletes` (ids) and rebuild them once the current
+    transaction commits.
+    """
+    accounts = {pk for pk in accounts if pk is not None}
+    athletes = {pk for pk in athletes if pk is not None}
+    if not connection.in_atomic_block:
+        rebuild(accounts, athletes)
+        return
+    pending = pending_rebuild()
+    # Deleted now so reads later in this transaction build a fresh document instead of serving the old one
+    accounts -= pending.accounts
+    athletes -= pending.athletes | pending.covered
+    if accounts or athletes:
+        ProfileDocument.objects.filter(Q(account__in=accounts) | Q(account__athlete__in=athletes)).delete()
+    pending.accounts |= accounts
+    pending.athletes |= athletes
+
+
+def invalidate_athlete(athlete):
+    """`invalidate` for an athlete instance: its account is known, so its rows changing later cost no query."""
+    invalidate(accounts=[athlete.user_id])
+    if athlete.user_id is not None and connection.in_atomic_block:
+        pending_rebuild().covered.add(athlete.pk)
@@ -0,0 +1,102 @@
+"""
+Coach entitlements.
+
+A coach is paid while their university has an active "university" plan, or they have an active "coach" plan of
+their own, and the plan's `current_period_end` has not passed. The latest period end of each university and each
+coach is cached (`False` when there is none), so resolving an entitlement costs no query once warm. Expiry is
+checked against the cached period end on every read, and `accounts.signals` drops the affected keys whenever a
+`Payment` is saved or deleted. Those drops only reach other processes through a shared cache (`REDIS_URL`), which
+is why `ENTITLEMENT_CACHE_TIMEOUT` defaults to seconds on the per-process fallback.
+"""
+
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from accounts.models import Payment
+
+
+class Entitlement(namedtuple("Entitlement", ["plan", "paid_until"])):
+    @property
+    def is_paid(self):
+        return self.plan is not None
+
+
+NOT_PAID = Entitlement(None, None)
+
+
+def university_key(university_id):
+    return f"entitlements:university:{university_id}"
+
+
+def coach_key(coach_id):
+    return f"entitlements:coach:{coach_id}"
+
+
+def invalidate(university_id=None, coach_id=None):
+    keys = []
+    if university_id is not None:
+        keys.append(university_key(university_id))
+    if coach_id is not None:
+        keys.append(coach_key(coach_id))
+    if keys:
+        cache.delete_many(keys)
+
+
+def get_entitlement(coach):
+    """The `Entitlement` of one coach."""
+    return resolve_entitlements([coach])[coach.pk]
+
+
+def resolve_entitlements(coaches):
+    """
+    Resolve the entitlements of many coaches with at most one query for whatever is not cached yet. Each coach's
+    `entitlement` attribute is set, so reading `is_paid` on them afterwards is free. Returns {coach pk: Entitlement}.
+    """
+    coaches = list(coaches)
+    keys = {coach_key(coach.pk) for coach in coaches}
+    keys |= {university_key(coach.university_id) for coach in coaches if coach.university_id is not None}
+    paid_until = cache.get_many(keys)
+
+    missing = keys - paid_until.keys()
+    if missing:
+        fetched = _fetch_paid_until(missing)
+        cache.set_many(fetched, timeout=settings.ENTITLEMENT_CACHE_TIMEOUT)
+        paid_until.update(fetched)
+
+    now = timezone.now()
+    entitlements = {}
+    for coach in coaches:
+        entitlement = NOT_PAID
+        candidates = [("coach", paid_until[coach_key(coach.pk)])]
+        if coach.university_id is not None:
+            candidates.insert(0, ("university", paid_until[university_key(coach.university_id)]))
+        for plan, until in candidates:
+            if until and until > now:
+                entitlement = Entitlement(plan, until)
+                break
+        coach.entitlement = entitlements[coach.pk] = entitlement
+    return entitlements
+
+
+def _fetch_paid_until(keys):
+    university_ids = [key.rsplit(":", 1)[1] for key in keys if key.startswith("entitlements:university:")]
+    coach_ids = [key.rsplit(":", 1)[1] for key in keys if key.startswith("entitlements:coach:")]
+    rows = (
+        Payment.objects.filter(
+            Q(plan="university", university_id__in=university_ids) | Q(plan="coach", coach_id__in=coach_ids),
+            active=True,
+        )
+        .values("plan", "university_id", "coach_id")
+        .annotate(paid_until=Max("current_period_end"))
+    )
+    fetched = dict.fromkeys(keys, False)
+    for row in rows:
+        if row["plan"] == "university":
+            fetched[university_key(row["university_id"])] = row["paid_until"]
+        else:
+            fetched[coach_key(row["coach_id"])] = row["paid_until"]
+    return fetched
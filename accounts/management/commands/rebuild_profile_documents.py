@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from accounts import documents
+
+
+class Command(BaseCommand):
+    help = "Rebuild every stored profile document from scratch."
+
+    def handle(self, *args, **options):
+        count = documents.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Profile documents rebuilt: {count} accounts."))
@@ -0,0 +1,38 @@
+from django.db import migrations
+
+# Trigram indexes over UPPER(column::text), the expression Django's `icontains` compiles to on Postgres, so the
+# lookups in `accounts.search` are served by the index. They are Postgres-only and not part of the model state.
+TRIGRAM_INDEXES = [
+    ("accounts_account_first_name_trgm", "accounts_account", "first_name"),
+    ("accounts_account_last_name_trgm", "accounts_account", "last_name"),
+    ("academics_highschool_name_trgm", "academics_highschool", "name"),
+    ("academics_university_name_trgm", "academics_university", "name"),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table}" USING gin (UPPER("{column}"::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _, _ in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("academics", "0003_universityemaildomain_university_email_domains"),
+        ("accounts", "0004_account_notify_applications_in_app_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
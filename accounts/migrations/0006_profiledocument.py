@@ -0,0 +1,31 @@
+# Generated by Django 5.2.1 on 2026-10-18 20:54
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0005_search_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfileDocument",
+            fields=[
+                (
+                    "account",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="profile_document",
+                        serialize=False,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                ("data", models.JSONField()),
+                ("built_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
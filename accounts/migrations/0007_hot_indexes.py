@@ -0,0 +1,40 @@
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("academics", "0003_universityemaildomain_university_email_domains"),
+        ("accounts", "0006_profiledocument"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="notificationtoken",
+            index=models.Index(fields=["account", "token"], name="notificationtoken_account_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="payment",
+            index=models.Index(
+                condition=models.Q(("active", True), ("plan", "university")),
+                fields=["university", "current_period_end"],
+                name="payment_university_active_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="payment",
+            index=models.Index(
+                condition=models.Q(("active", True), ("plan", "coach")),
+                fields=["coach", "current_period_end"],
+                name="payment_coach_active_idx",
+            ),
+        ),
+        AddIndexConcurrently(
+            model_name="savedaccount",
+            index=models.Index(fields=["coach", "-saved_at", "-id"], name="savedaccount_coach_recent_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-18 21:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0007_hot_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="account",
+            name="request_count",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
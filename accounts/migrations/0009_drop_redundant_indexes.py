@@ -0,0 +1,39 @@
+# Generated by Django 5.2.1 on 2026-10-18 21:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from core.operations import RemoveForeignKeyIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # DROP INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0008_account_request_count"),
+    ]
+
+    operations = [
+        RemoveForeignKeyIndexConcurrently(
+            model_name="notificationtoken",
+            name="account",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="notification_tokens",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        RemoveForeignKeyIndexConcurrently(
+            model_name="savedaccount",
+            name="athlete",
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to="accounts.athlete"),
+        ),
+        RemoveForeignKeyIndexConcurrently(
+            model_name="savedaccount",
+            name="coach",
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to="accounts.coach"),
+        ),
+    ]
@@ -2,6 +2,7 @@ import uuid
 
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 from academics.models import Highschool, University
@@ -27,6 +28,9 @@ class Account(AbstractUser):
     notify_feedback_email = models.BooleanField(default=True)
     notify_product_updates_email = models.BooleanField(default=True)
 
+    # Authenticated requests made by the account, counted in memory and written behind by `user_auth.activity`
+    request_count = models.PositiveBigIntegerField(default=0, editable=False)
+
     objects = CustomUserManager()
 
     def __str__(self):
@@ -35,10 +39,14 @@ class Account(AbstractUser):
 
 
 class NotificationToken(models.Model):
-    account = models.ForeignKey(Account, related_name="notification_tokens", on_delete=models.CASCADE)
+    # Indexed by notificationtoken_account_idx, which leads with the account
+    account = models.ForeignKey(Account, related_name="notification_tokens", on_delete=models.CASCADE, db_index=False)
     token = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["account", "token"], name="notificationtoken_account_idx")]
+
     def __str__(self):
         return f"{self.account.email} - {self.token}"
 
@@ -81,30 +89,44 @@ class Coach(models.Model):
     def __str__(self):
         return f"{self.user if self.user else ''} - {self.university.name if self.university else 'No University'}"
 
+    @cached_property
+    def entitlement(self):
+        from accounts.entitlements import get_entitlement
+
+        return get_entitlement(self)
+
     @property
     def is_paid(self):
-        is_university_plan_active = Payment.objects.filter(
-            plan="university", university=self.university, active=True
-        ).exists()
-        if is_university_plan_active:
-            return True
-        is_coach_plan_active = Payment.objects.filter(plan="coach", coach=self, active=True).exists()
-
-        return is_coach_plan_active
+        return self.entitlement.is_paid
 
 
 class SavedAccount(models.Model):
-    athlete = models.ForeignKey(Athlete, on_delete=models.CASCADE)
-    coach = models.ForeignKey(Coach, on_delete=models.CASCADE)
+    # Indexed by the unique (athlete, coach) constraint, which leads with the athlete
+    athlete = models.ForeignKey(Athlete, on_delete=models.CASCADE, db_index=False)
+    # Indexed by savedaccount_coach_recent_idx, which leads with the coach
+    coach = models.ForeignKey(Coach, on_delete=models.CASCADE, db_index=False)
     saved_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         unique_together = ("athlete", "coach")
+        # The saved-accounts list pages a coach's rows newest first
+        indexes = [models.Index(fields=["coach", "-saved_at", "-id"], name="savedaccount_coach_recent_idx")]
 
     def __str__(self):
         return f"{self.coach.user.email} saved {self.athlete.user.email}"
 
 
+class ProfileDocument(models.Model):
+    """The rendered profile of an account, kept up to date by `accounts.documents`."""
+
+    account = models.OneToOneField(Account, primary_key=True, related_name="profile_document", on_delete=models.CASCADE)
+    data = models.JSONField()
+    built_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Profile document of {self.account_id}"
+
+
 class Payment(models.Model):
     plan = models.CharField(
         max_length=10,
@@ -126,6 +148,21 @@ class Payment(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # `accounts.entitlements` looks up the latest active period of each university or coach plan
+        indexes = [
+            models.Index(
+                fields=["university", "current_period_end"],
+                condition=models.Q(plan="university", active=True),
+                name="payment_university_active_idx",
+            ),
+            models.Index(
+                fields=["coach", "current_period_end"],
+                condition=models.Q(plan="coach", active=True),
+                name="payment_coach_active_idx",
+            ),
+        ]
+
     def __str__(self):
         name = (
             self.university.name
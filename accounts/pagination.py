@@ -0,0 +1,5 @@
+from api.pagination import KeysetPagination
+
+
+class SavedAccountPagination(KeysetPagination):
+    ordering = ("-saved_at", "-id")
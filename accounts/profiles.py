@@ -0,0 +1,123 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
+from rest_framework.exceptions import ValidationError
+
+from academics.models import AthleteExam, Exam, Highschool
+from accounts.models import Athlete
+from core.reference import invalidate_on_commit
+from sports.models import Club, League, PersonalStatistic, Sport, SportStatistic
+
+PROFILE_LISTS = ["clubs", "leagues", "sport_statistics", "personal_statistics", "exams"]
+
+
+def profile_queryset():
+    """
+    Accounts with everything `AccountResponseSerializer` renders loaded up front.
+
+    Sports, positions, schools and exams are rendered from `core.reference`, so only the profiles themselves are
+    joined in the main query and every collection is fetched with one prefetch query: a full athlete profile costs
+    six queries regardless of how many clubs, leagues, statistics or exams it has.
+    """
+    return (
+        get_user_model()
+        .objects.select_related("athlete", "coach")
+        .prefetch_related(
+            "athlete__clubs",
+            "athlete__leagues",
+            Prefetch("athlete__sportstatistic_set", queryset=SportStatistic.objects.select_related("club")),
+            "athlete__personalstatistic_set",
+            "athlete__athleteexam_set",
+        )
+    )
+
+
+def update_athlete_profile(user, data):
+    """
+    Apply validated `AthleteUpdateSerializer` data to the athlete of `user`, creating the athlete if needed.
+
+    Clubs and leagues are matched by name (and level) within the athlete's sport and created when missing. Sport
+    statistics, personal statistics and exams are owned rows: the list sent replaces the current one, rows with an
+    `id` are overwritten, rows without one are created and the others are deleted. Every list costs a fixed number of
+    queries, independent of its length. Must run inside a transaction.
+    """
+    lists = {name: data.pop(name) for name in PROFILE_LISTS if name in data}
+    athlete, _ = Athlete.objects.update_or_create(user=user, defaults=data)
+
+    if "clubs" in lists:
+        athlete.clubs.set(_get_or_create_for_sport(Club, athlete, lists["clubs"], "clubs"))
+    if "leagues" in lists:
+        athlete.leagues.set(_get_or_create_for_sport(League, athlete, lists["leagues"], "leagues"))
+    if "sport_statistics" in lists:
+        rows = lists["sport_statistics"]
+        sports = _resolve(Sport, "id", [row.get("sport", athlete.sport_id) for row in rows], "sport_statistics")
+        clubs = _resolve(Club, "id", [row.get("club") for row in rows], "sport_statistics")
+        highschools = _resolve(Highschool, "uuid", [row.get("highschool") for row in rows], "sport_statistics")
+        for row in rows:
+            sport = row.pop("sport", athlete.sport_id)
+            if sport is None:
+                raise ValidationError({"sport_statistics": ["Sport must be specified for sport statistics."]})
+            row["sport_id"] = sports[sport]
+            row["club_id"] = clubs.get(row.pop("club", None))
+            row["highschool_id"] = highschools.get(row.pop("highschool", None))
+        _replace_owned(SportStatistic, athlete, rows, "sport_statistics")
+    if "personal_statistics" in lists:
+        _replace_owned(PersonalStatistic, athlete, lists["personal_statistics"], "personal_statistics")
+    if "exams" in lists:
+        rows = lists["exams"]
+        exams = _resolve(Exam, "uuid", [row["exam"] for row in rows], "exams")
+        for row in rows:
+            row["exam_id"] = exams[row.pop("exam")]
+        # bulk_create sends no post_save, the athlete's save above already scheduled its eligibility refresh and
+        # document rebuild
+        _replace_owned(AthleteExam, athlete, rows, "exams")
+    return athlete
+
+
+def _resolve(model, field, values, error_key):
+    """Map each non-null `field` value to the primary key of its `model` row, with one query."""
+    values = {value for value in values if value is not None}
+    if not values:
+        return {}
+    found = {getattr(obj, field): obj.pk for obj in model.objects.filter(**{f"{field}__in": values}).only("pk", field)}
+    missing = values - found.keys()
+    if missing:
+        name = model._meta.verbose_name
+        raise ValidationError({error_key: [f"Unknown {name} {value}." for value in sorted(missing, key=str)]})
+    return found
+
+
+def _get_or_create_for_sport(model, athlete, rows, error_key):
+    """Clubs or leagues of the athlete's sport matching `rows` on every field sent, creating the missing ones."""
+    if athlete.sport_id is None:
+        raise ValidationError(f"Sport must be specified when updating {error_key}.")
+    if not rows:
+        return []
+    fields = sorted(rows[0])
+    wanted = {tuple(row[field] for field in fields): row for row in rows}
+    existing = {}
+    for obj in model.objects.filter(sport_id=athlete.sport_id, name__in={row["name"] for row in rows}):
+        existing.setdefault(tuple(getattr(obj, field) for field in fields), obj)
+    missing = [model(sport_id=athlete.sport_id, **row) for key, row in wanted.items() if key not in existing]
+    for obj in model.objects.bulk_create(missing):
+        existing[tuple(getattr(obj, field) for field in fields)] = obj
+    if missing:
+        # bulk_create sends no post_save, the catalogs in the reference cache have to be told directly
+        invalidate_on_commit(model._meta.label)
+    return [existing[key] for key in wanted]
+
+
+def _replace_owned(model, athlete, rows, error_key):
+    current = set(model.objects.filter(athlete=athlete).values_list("pk", flat=True))
+    kept = {row["id"] for row in rows if "id" in row}
+    if kept - current:
+        raise ValidationError({error_key: [f"Unknown id {pk}." for pk in sorted(kept - current)]})
+    if current - kept:
+        model.objects.filter(pk__in=current - kept).delete()
+    if rows:
+        update_fields = [field.name for field in model._meta.concrete_fields if field.name not in ("id", "athlete")]
+        model.objects.bulk_create(
+            [model(athlete=athlete, **row) for row in rows],
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=update_fields,
+        )
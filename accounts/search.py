@@ -0,0 +1,114 @@
+"""
+Account search.
+
+Every term of the query has to match at least one of the account's names, the athlete's sport, position, high
+school or university, the coach's university, or (for numeric terms) the athlete's graduation year. Matching uses
+`icontains`, which Postgres runs as `UPPER(column::text) LIKE ...`; the trigram GIN indexes created in
+`accounts/migrations/0005_search_indexes.py` cover exactly that expression. A single `OR` across the joined tables
+could not use them, so each term is matched by a `UNION` of one query per table (`term_matches`), each of which can
+be served by its own index, while the same queries run unchanged on SQLite.
+
+Results are ranked by how well the terms match the names: prefix matches beat substring matches, and on Postgres
+with the `pg_trgm` extension installed the trigram word similarity between the query and the full name is added on
+top.
+"""
+
+from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections
+from django.db.models import Case, F, FloatField, Q, Value, When
+from django.db.models.functions import Coalesce, Concat
+
+from accounts.models import Athlete, Coach
+from api.instrumentation import cache_fill
+
+NAME_FIELDS = ["first_name", "last_name"]
+# (model, relation, text fields of the related model), the model's `user_id` is the matching account
+RELATED_TEXT_FIELDS = [
+    (Athlete, "sport", ["name"]),
+    (Athlete, "position", ["name", "abbreviation"]),
+    (Athlete, "highschool", ["name"]),
+    (Athlete, "university", ["name"]),
+    (Coach, "university", ["name"]),
+]
+SEARCH_HIT_RELATIONS = [
+    "athlete__sport",
+    "athlete__position",
+    "athlete__highschool",
+    "athlete__university",
+    "coach__university",
+]
+
+
+def any_contains(fields, term):
+    q = Q()
+    for field in fields:
+        q |= Q(**{f"{field}__icontains": term})
+    return q
+
+
+def term_matches(term):
+    """
+    Ids of the accounts `term` matches. The name columns are searched on the account table and every related text
+    column on its own table, so each part of the union is a plain index lookup.
+    """
+    matches = [get_user_model().objects.filter(any_contains(NAME_FIELDS, term)).values("id")]
+    for model, relation, fields in RELATED_TEXT_FIELDS:
+        related = model._meta.get_field(relation).related_model.objects.filter(any_contains(fields, term))
+        matches.append(model.objects.filter(**{f"{relation}__in": related.values("id")}).values("user_id"))
+    if term.isdigit():
+        matches.append(Athlete.objects.filter(highschool_grad_year=int(term)).values("user_id"))
+    return matches[0].union(*matches[1:])
+
+
+def term_rank(term):
+    rank = Value(0.0)
+    for field in NAME_FIELDS:
+        rank += Case(
+            When(**{f"{field}__iexact": term}, then=Value(3.0)),
+            When(**{f"{field}__istartswith": term}, then=Value(2.0)),
+            When(**{f"{field}__icontains": term}, then=Value(1.0)),
+            default=Value(0.0),
+            output_field=FloatField(),
+        )
+    return rank
+
+
+def has_trigram(using):
+    """Whether the `pg_trgm` extension, which the similarity ranking needs, is installed on the `using` database."""
+    connection = connections[using]
+    if connection.vendor != "postgresql":
+        return False
+    if not hasattr(connection, "has_pg_trgm"):
+        with cache_fill(), connection.cursor() as cursor:
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm')")
+            connection.has_pg_trgm = cursor.fetchone()[0]
+    return connection.has_pg_trgm
+
+
+def search_accounts(query="", sport=None, position=None, highschool=None, university=None, grad_year=None):
+    """
+    Accounts matching `query` and the given filters, best match first. Each result is annotated with `rank`.
+    """
+    accounts = get_user_model().objects.select_related(*SEARCH_HIT_RELATIONS)
+    terms = query.split()
+    rank = Value(0.0)
+    for term in terms:
+        accounts = accounts.filter(id__in=term_matches(term))
+        rank += term_rank(term)
+    if terms and has_trigram(accounts.db):
+        full_name = Concat(Coalesce("first_name", Value("")), Value(" "), Coalesce("last_name", Value("")))
+        rank += TrigramWordSimilarity(Value(" ".join(terms)), full_name)
+
+    if sport is not None:
+        accounts = accounts.filter(athlete__sport_id=sport)
+    if position is not None:
+        accounts = accounts.filter(athlete__position_id=position)
+    if highschool is not None:
+        accounts = accounts.filter(athlete__highschool__uuid=highschool)
+    if university is not None:
+        accounts = accounts.filter(Q(athlete__university__uuid=university) | Q(coach__university__uuid=university))
+    if grad_year is not None:
+        accounts = accounts.filter(athlete__highschool_grad_year=grad_year)
+
+    return accounts.annotate(rank=rank).order_by(F("rank").desc(), "id")
@@ -1,25 +1,39 @@
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from rest_framework import fields, serializers
 from rest_framework.serializers import ModelSerializer
 
-from academics.serializers import (
-    AthleteExamSerializer,
-    HighschoolSerializer,
-    UniversitySerializer,
-)
+from academics.models import Highschool, University
+from academics.serializers import AthleteExamSerializer, AthleteExamUpdateSerializer
 from accounts.models import Athlete, Coach, NotificationToken, SavedAccount
+from accounts.profiles import update_athlete_profile
+from core.reference import ReferenceField
+from sports.models import Position, Sport
 from sports.serializers import (
     ClubSerializer,
+    ClubUpdateSerializer,
     LeagueSerializer,
+    LeagueUpdateSerializer,
     PersonalStatisticSerializer,
-    PositionSerializer,
-    SportSerializer,
+    PersonalStatisticUpdateSerializer,
     SportStatisticSerializer,
+    SportStatisticUpdateSerializer,
 )
 
 
+class ValidateSavedAccountQueryParams(serializers.Serializer):
+    sport = serializers.IntegerField(required=False, help_text="Only athletes playing this sport")
+    position = serializers.IntegerField(required=False, help_text="Only athletes playing this position")
+    grad_year = serializers.IntegerField(required=False, help_text="Only athletes graduating high school this year")
+
+
 class ValidateSearchQueryParams(serializers.Serializer):
     name = fields.RegexField("^[\u0621-\u064a\u0660-\u0669 a-zA-Z0-9]{1,30}$", required=False)
+    sport = serializers.IntegerField(required=False, help_text="Only athletes playing this sport")
+    position = serializers.IntegerField(required=False, help_text="Only athletes playing this position")
+    highschool = serializers.UUIDField(required=False, help_text="Only athletes from this high school")
+    university = serializers.UUIDField(required=False, help_text="Only athletes or coaches from this university")
+    grad_year = serializers.IntegerField(required=False, help_text="Only athletes graduating high school this year")
 
 
 class NotificationTokenSerializer(ModelSerializer):
@@ -63,13 +77,34 @@ class SavedAccountResponseSerializer(ModelSerializer):
         read_only_fields = ["id", "athlete", "coach", "saved_at"]
 
 
+BULK_SAVE_MAX_SIZE = 500
+BULK_SAVE_RESULTS = ["saved", "already_saved", "unsaved", "not_saved", "not_found"]
+
+
+class BulkSaveAccountSerializer(serializers.Serializer):
+    action = serializers.ChoiceField(choices=["save", "unsave"])
+    athletes = serializers.ListField(
+        child=serializers.UUIDField(), min_length=1, max_length=BULK_SAVE_MAX_SIZE, help_text="Athlete uuids"
+    )
+
+    def validate_athletes(self, athletes):
+        if len(athletes) != len(set(athletes)):
+            raise serializers.ValidationError("Each athlete can only be listed once.")
+        return athletes
+
+
+class BulkSaveAccountResultSerializer(serializers.Serializer):
+    athlete = serializers.UUIDField()
+    result = serializers.ChoiceField(choices=BULK_SAVE_RESULTS)
+
+
 class AthleteSerializer(ModelSerializer):
-    sport = SportSerializer(required=False)
-    position = PositionSerializer(required=False)
+    sport = ReferenceField("sports.Sport")
+    position = ReferenceField("sports.Position")
     clubs = ClubSerializer(many=True, required=False)
     leagues = LeagueSerializer(many=True, required=False)
-    highschool = HighschoolSerializer(required=False)
-    university = UniversitySerializer(required=False)
+    highschool = ReferenceField("academics.Highschool")
+    university = ReferenceField("academics.University")
     sport_statistics = SportStatisticSerializer(source="sportstatistic_set", many=True, required=False)
     personal_statistics = PersonalStatisticSerializer(source="personalstatistic_set", many=True, required=False)
     exams = AthleteExamSerializer(source="athleteexam_set", many=True, required=False)
@@ -108,8 +143,92 @@ class AthleteSerializer(ModelSerializer):
         return rep
 
 
+class AthleteUpdateSerializer(ModelSerializer):
+    """
+    Writable athlete profile. Single relations are referenced by id (schools by uuid). Each list that is sent
+    replaces the athlete's current one, see `accounts.profiles.update_athlete_profile`.
+    """
+
+    sport = serializers.PrimaryKeyRelatedField(queryset=Sport.objects.all(), required=False, allow_null=True)
+    position = serializers.PrimaryKeyRelatedField(queryset=Position.objects.all(), required=False, allow_null=True)
+    highschool = serializers.SlugRelatedField(
+        slug_field="uuid", queryset=Highschool.objects.all(), required=False, allow_null=True
+    )
+    university = serializers.SlugRelatedField(
+        slug_field="uuid", queryset=University.objects.all(), required=False, allow_null=True
+    )
+    clubs = ClubUpdateSerializer(many=True, required=False)
+    leagues = LeagueUpdateSerializer(many=True, required=False)
+    sport_statistics = SportStatisticUpdateSerializer(many=True, required=False)
+    personal_statistics = PersonalStatisticUpdateSerializer(many=True, required=False)
+    exams = AthleteExamUpdateSerializer(many=True, required=False)
+
+    class Meta:
+        model = Athlete
+        fields = [
+            "height",
+            "weight",
+            "sport",
+            "position",
+            "gpa",
+            "is_gpa_weighted",
+            "sat",
+            "act",
+            "budget",
+            "highschool_grad_year",
+            "highschool",
+            "university",
+            "clubs",
+            "leagues",
+            "sport_statistics",
+            "personal_statistics",
+            "exams",
+        ]
+
+
+class AthleteCardSerializer(ModelSerializer):
+    """
+    Compact athlete summary for lists shown to coaches. Expects `user` to be selected with the athlete, sport and
+    position come from the reference cache.
+    """
+
+    id = serializers.IntegerField(source="user.id", read_only=True, default=None)
+    first_name = serializers.CharField(source="user.first_name", read_only=True, default="")
+    last_name = serializers.CharField(source="user.last_name", read_only=True, default="")
+    avatar = serializers.FileField(source="user.avatar", read_only=True, default=None)
+    sport = ReferenceField("sports.Sport")
+    position = ReferenceField("sports.Position")
+
+    class Meta:
+        model = Athlete
+        fields = [
+            "id",
+            "uuid",
+            "first_name",
+            "last_name",
+            "avatar",
+            "sport",
+            "position",
+            "highschool_grad_year",
+            "gpa",
+            "sat",
+            "act",
+        ]
+
+
+ATHLETE_CARD_RELATIONS = ["user"]
+
+
+class SavedAthleteSerializer(ModelSerializer):
+    athlete = AthleteCardSerializer(read_only=True)
+
+    class Meta:
+        model = SavedAccount
+        fields = ["id", "saved_at", "athlete"]
+
+
 class CoachSerializer(ModelSerializer):
-    university = UniversitySerializer(required=False)
+    university = ReferenceField("academics.University")
 
     class Meta:
         model = Coach
@@ -120,8 +239,57 @@ class CoachSerializer(ModelSerializer):
         ]
 
 
+class AccountSearchHitSerializer(ModelSerializer):
+    """
+    Flat search result. Expects the relations in `accounts.search.SEARCH_HIT_RELATIONS` to be selected.
+    """
+
+    account_type = serializers.SerializerMethodField()
+    uuid = serializers.SerializerMethodField()
+    sport = serializers.CharField(source="athlete.sport.name", read_only=True, default=None)
+    position = serializers.CharField(source="athlete.position.name", read_only=True, default=None)
+    grad_year = serializers.IntegerField(source="athlete.highschool_grad_year", read_only=True, default=None)
+    highschool = serializers.CharField(source="athlete.highschool.name", read_only=True, default=None)
+    university = serializers.SerializerMethodField()
+
+    class Meta:
+        model = get_user_model()
+        fields = [
+            "id",
+            "first_name",
+            "last_name",
+            "avatar",
+            "account_type",
+            "uuid",
+            "sport",
+            "position",
+            "grad_year",
+            "highschool",
+            "university",
+        ]
+
+    def get_profile(self, account):
+        for account_type in ["athlete", "coach"]:
+            profile = getattr(account, account_type, None)
+            if profile is not None:
+                return account_type, profile
+        return None, None
+
+    def get_account_type(self, account) -> str:
+        return self.get_profile(account)[0]
+
+    def get_uuid(self, account) -> str:
+        profile = self.get_profile(account)[1]
+        return str(profile.uuid) if profile else None
+
+    def get_university(self, account) -> str:
+        profile = self.get_profile(account)[1]
+        return profile.university.name if profile and profile.university else None
+
+
 excluded_fields = [
     "last_login",
+    "request_count",
     "is_superuser",
     "is_staff",
     "is_active",
@@ -154,7 +322,7 @@ class AccountUpdateSerializer(ModelSerializer):
     background_image = serializers.FileField(required=False, allow_null=True)
     first_name = serializers.CharField(required=False, allow_blank=True)
     last_name = serializers.CharField(required=False, allow_blank=True)
-    athlete = AthleteSerializer(required=False)
+    athlete = AthleteUpdateSerializer(required=False)
     coach = CoachSerializer(required=False)
 
     class Meta:
@@ -177,6 +345,7 @@ class AccountUpdateSerializer(ModelSerializer):
         ]
         read_only_fields = ["id", "email"]
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         athlete_data = validated_data.pop("athlete", None)
         coach_data = validated_data.pop("coach", None)
@@ -184,29 +353,7 @@ class AccountUpdateSerializer(ModelSerializer):
             setattr(instance, attr, value)
         instance.save()
         if athlete_data:
-            clubs = athlete_data.pop("clubs", None)
-            leagues = athlete_data.pop("leagues", None)
-            athlete, _ = Athlete.objects.update_or_create(user=instance, defaults=athlete_data)
-            sport_id = athlete.sport.id if athlete.sport else None
-            if clubs is not None:
-                if not sport_id:
-                    raise serializers.ValidationError("Sport must be specified when updating clubs.")
-                # Get or create clubs before setting them
-                club_instances = []
-                for club in clubs:
-                    club["sport_id"] = sport_id
-                    club_instance, _ = athlete.clubs.model.objects.get_or_create(**club)
-                    club_instances.append(club_instance)
-                athlete.clubs.set(club_instances)
-            if leagues is not None:
-                if not sport_id:
-                    raise serializers.ValidationError("Sport must be specified when updating leagues.")
-                league_instances = []
-                for league in leagues:
-                    league["sport_id"] = sport_id
-                    league_instance, _ = athlete.leagues.model.objects.get_or_create(**league)
-                    league_instances.append(league_instance)
-                athlete.leagues.set(league_instances)
+            update_athlete_profile(instance, athlete_data)
         if coach_data:
             Coach.objects.update_or_create(user=instance, defaults=coach_data)
         return instance
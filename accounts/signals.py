@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from academics.models import AthleteExam
+from sports.models import Club, League, PersonalStatistic, SportStatistic
+
+from . import documents, entitlements
+from .models import Athlete, Coach, Payment
+
+
+@receiver(pre_save, sender=Payment)
+def remember_payment_owner(sender, instance, raw=False, **kwargs):
+    # A payment moved to another university or coach has to invalidate the previous owner as well
+    instance._previous_owner = None
+    if instance.pk is not None and not raw:
+        instance._previous_owner = (
+            Payment.objects.filter(pk=instance.pk).values_list("university_id", "coach_id").first()
+        )
+
+
+@receiver(post_save, sender=Payment)
+@receiver(post_delete, sender=Payment)
+def invalidate_entitlements(sender, instance, **kwargs):
+    owners = [(instance.university_id, instance.coach_id)]
+    if getattr(instance, "_previous_owner", None):
+        owners.append(instance._previous_owner)
+
+    def invalidate():
+        for university_id, coach_id in owners:
+            entitlements.invalidate(university_id, coach_id)
+
+    # Now for reads later in this transaction, and again on commit in case another request cached the old state
+    invalidate()
+    transaction.on_commit(invalidate)
+
+
+@receiver(post_save, sender=get_user_model())
+def invalidate_account_document(sender, instance, created=False, raw=False, **kwargs):
+    if not raw and not created:
+        documents.invalidate(accounts=[instance.pk])
+
+
+@receiver(post_save, sender=Athlete)
+@receiver(post_delete, sender=Athlete)
+def invalidate_athlete_document(sender, instance, raw=False, **kwargs):
+    if not raw:
+        documents.invalidate_athlete(instance)
+
+
+@receiver(post_save, sender=Coach)
+@receiver(post_delete, sender=Coach)
+def invalidate_profile_document(sender, instance, raw=False, **kwargs):
+    if not raw:
+        documents.invalidate(accounts=[instance.user_id])
+
+
+@receiver(post_save, sender=SportStatistic)
+@receiver(post_delete, sender=SportStatistic)
+@receiver(post_save, sender=PersonalStatistic)
+@receiver(post_delete, sender=PersonalStatistic)
+@receiver(post_save, sender=AthleteExam)
+@receiver(post_delete, sender=AthleteExam)
+def invalidate_athlete_row_document(sender, instance, raw=False, **kwargs):
+    if not raw:
+        documents.invalidate(athletes=[instance.athlete_id])
+
+
+@receiver(m2m_changed, sender=Athlete.clubs.through)
+@receiver(m2m_changed, sender=Athlete.leagues.through)
+def invalidate_athlete_membership_document(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    # Clearing a club's athletes (reverse, post_clear) does not say which athletes were affected, it is not done
+    # anywhere in the app and a rebuild on first read repairs the documents once they are dropped
+    if reverse:
+        documents.invalidate(athletes=pk_set or [])
+    else:
+        documents.invalidate_athlete(instance)
+
+
+@receiver(post_save, sender=Club)
+@receiver(post_save, sender=League)
+@receiver(pre_delete, sender=Club)
+@receiver(pre_delete, sender=League)
+def invalidate_member_documents(sender, instance, created=False, raw=False, **kwargs):
+    # Clubs and leagues are rendered inside the profiles of their members, and clubs inside sport statistics. On
+    # delete the members are looked up before the cascade removes the memberships.
+    if raw or created:
+        return
+    members = Q(**{f"{sender._meta.model_name}s": instance})
+    if sender is Club:
+        members |= Q(sportstatistic__club=instance)
+    documents.invalidate(athletes=Athlete.objects.filter(members).values_list("pk", flat=True).distinct())
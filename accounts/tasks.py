@@ -0,0 +1,7 @@
+from accounts import documents
+from jobs.queue import task
+
+
+@task(queue="documents")
+def rebuild_profile_documents(accounts=(), athletes=()):
+    documents.rebuild(accounts, athletes)
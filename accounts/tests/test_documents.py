@@ -0,0 +1,114 @@
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from academics.models import AthleteExam, Exam
+from accounts import documents
+from accounts.models import ProfileDocument
+from jobs.worker import run_pending
+from sports.models import Club, PersonalStatistic, Sport
+
+
+@pytest.fixture
+def sport():
+    return Sport.objects.create(name="Soccer", gender="female")
+
+
+@pytest.fixture
+def athlete(create_athlete, sport, django_capture_on_commit_callbacks):
+    # Run the rebuild queued by the setup, later changes would otherwise join it instead of queueing their own
+    with django_capture_on_commit_callbacks(execute=True):
+        athlete = create_athlete(email="athlete@example.com", password="pass", sport=sport, gpa=3.6)
+        athlete.clubs.add(Club.objects.create(name="Club", sport=sport))
+    return athlete
+
+
+def stored(athlete):
+    return ProfileDocument.objects.filter(account=athlete.user).values_list("data", flat=True).first()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestProfileDocuments:
+    def test_built_on_first_read_with_reference_markers(self, athlete, sport):
+        ProfileDocument.objects.all().delete()
+        document = documents.get_document(athlete.user.pk)
+        assert document["athlete"]["sport"] == {"id": sport.id, "name": "Soccer", "gender": "female"}
+        assert document["athlete"]["gpa"] == 3.6
+        assert stored(athlete)["athlete"]["sport"] == {"$ref": "sports.Sport", "id": sport.id}
+        with CaptureQueriesContext(connection) as queries:
+            assert documents.get_document(athlete.user.pk) == document
+        assert len(queries) == 1
+
+    def test_unknown_account(self):
+        assert documents.get_document(0) is None
+
+    def test_reference_changes_need_no_rebuild(self, athlete, sport):
+        documents.get_document(athlete.user.pk)
+        sport.name = "Football"
+        sport.save()
+        assert stored(athlete) is not None
+        assert documents.get_document(athlete.user.pk)["athlete"]["sport"]["name"] == "Football"
+
+    def test_changes_rebuild_once_per_transaction(self, athlete, django_capture_on_commit_callbacks):
+        documents.get_document(athlete.user.pk)
+        with mock.patch("accounts.documents.rebuild", wraps=documents.rebuild) as rebuild:
+            with django_capture_on_commit_callbacks(execute=True):
+                athlete.gpa = 3.9
+                athlete.save()
+                PersonalStatistic.objects.create(athlete=athlete, name="Sprint", value="11s")
+                AthleteExam.objects.create(athlete=athlete, exam=Exam.objects.create(name="Calc", exam_type="AP"))
+                athlete.clubs.clear()
+                # Dropped at once, so reads in the same transaction are never stale
+                assert stored(athlete) is None
+        rebuild.assert_called_once()
+        data = stored(athlete)["athlete"]
+        assert data["gpa"] == 3.9
+        assert data["clubs"] == []
+        assert [stat["name"] for stat in data["personal_statistics"]] == ["Sprint"]
+        assert len(data["exams"]) == 1
+
+    def test_club_changes_reach_members(self, athlete, django_capture_on_commit_callbacks):
+        club = athlete.clubs.get()
+        documents.get_document(athlete.user.pk)
+        with django_capture_on_commit_callbacks(execute=True):
+            club.name = "Renamed"
+            club.save()
+        assert stored(athlete)["athlete"]["clubs"][0]["name"] == "Renamed"
+        with django_capture_on_commit_callbacks(execute=True):
+            club.delete()
+        assert stored(athlete)["athlete"]["clubs"] == []
+
+    def test_large_rebuilds_are_queued(self, athlete, monkeypatch, django_capture_on_commit_callbacks):
+        monkeypatch.setattr(documents, "INLINE_REBUILD_LIMIT", 0)
+        club = athlete.clubs.get()
+        with django_capture_on_commit_callbacks(execute=True):
+            club.name = "Renamed"
+            club.save()
+        assert stored(athlete) is None
+        assert run_pending(["documents"]) == 1
+        assert stored(athlete)["athlete"]["clubs"][0]["name"] == "Renamed"
+
+    def test_account_changes(self, athlete, django_capture_on_commit_callbacks):
+        documents.get_document(athlete.user.pk)
+        with django_capture_on_commit_callbacks(execute=True):
+            athlete.user.first_name = "Jane"
+            athlete.user.save()
+        assert stored(athlete)["first_name"] == "Jane"
+
+    def test_rebuild_locks_the_accounts(self, athlete):
+        with CaptureQueriesContext(connection) as queries:
+            documents.rebuild(athletes=[athlete.pk])
+        lock = next(query["sql"] for query in queries if "FOR UPDATE" in query["sql"])
+        assert queries[-1]["sql"].startswith("RELEASE SAVEPOINT")
+        assert "INSERT INTO" in queries[-2]["sql"]
+        assert 'OF "accounts_account"' in lock
+
+    def test_rebuild_all(self, athlete, create_coach):
+        coach = create_coach(email="coach@example.com", password="pass")
+        ProfileDocument.objects.all().delete()
+        assert documents.rebuild_all() == 2
+        assert stored(athlete)["athlete"]["gpa"] == 3.6
+        assert ProfileDocument.objects.get(account=coach.user).data["coach"]["uuid"] == str(coach.uuid)
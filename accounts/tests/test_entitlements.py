@@ -0,0 +1,87 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from academics.models import University
+from accounts.entitlements import get_entitlement, resolve_entitlements
+from accounts.models import Coach, Payment
+
+
+def pay(days=30, **kwargs):
+    return Payment.objects.create(
+        stripe_customer_id="cus",
+        stripe_subscription_id="sub",
+        current_period_end=timezone.now() + timedelta(days=days),
+        **kwargs,
+    )
+
+
+@pytest.fixture
+def university():
+    return University.objects.create(name="Test U")
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestEntitlements:
+    def test_university_plan_covers_its_coaches(self, create_coach, university):
+        coach = create_coach(email="coach@example.com", password="pass", university=university)
+        assert coach.is_paid is False
+        pay(plan="university", university=university)
+        assert Coach.objects.get(pk=coach.pk).entitlement.plan == "university"
+
+    def test_coach_plan_and_period_end(self, create_coach, university):
+        coach = create_coach(email="coach@example.com", password="pass", university=university)
+        payment = pay(plan="coach", coach=coach, days=-1)
+        assert get_entitlement(coach).is_paid is False
+
+        payment.current_period_end = timezone.now() + timedelta(days=1)
+        payment.save()
+        assert get_entitlement(coach).plan == "coach"
+
+        payment.active = False
+        payment.save()
+        assert get_entitlement(coach).is_paid is False
+
+    def test_cached_until_a_payment_changes(self, create_coach, university):
+        coach = create_coach(email="coach@example.com", password="pass", university=university)
+        payment = pay(plan="university", university=university)
+        assert get_entitlement(coach).is_paid
+        with CaptureQueriesContext(connection) as queries:
+            assert Coach.objects.get(pk=coach.pk).is_paid
+        assert len(queries) == 1
+
+        payment.delete()
+        assert get_entitlement(coach).is_paid is False
+
+    def test_moving_a_payment_invalidates_the_previous_university(self, create_coach, university):
+        coach = create_coach(email="coach@example.com", password="pass", university=university)
+        payment = pay(plan="university", university=university)
+        assert get_entitlement(coach).is_paid
+        payment.university = University.objects.create(name="Other U")
+        payment.save()
+        assert get_entitlement(coach).is_paid is False
+
+    def test_resolve_many_in_one_query(self, create_coach, university):
+        other = University.objects.create(name="Other U")
+        coaches = [
+            create_coach(email=f"coach{i}@example.com", password="pass", university=[university, other][i % 2])
+            for i in range(6)
+        ]
+        pay(plan="university", university=university)
+        pay(plan="coach", coach=coaches[1])
+
+        coaches = list(Coach.objects.all())
+        with CaptureQueriesContext(connection) as queries:
+            resolved = resolve_entitlements(coaches)
+            paid = [coach.is_paid for coach in coaches]
+        assert len(queries) == 1
+        assert paid == [True, True, True, False, True, False]
+        assert resolved[coaches[1].pk].plan == "coach"
+
+        with CaptureQueriesContext(connection) as queries:
+            resolve_entitlements(Coach.objects.all())
+        assert len(queries) == 1  # only the coaches themselves
@@ -1,8 +1,11 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
 from academics.models import AthleteExam, Exam
+from core.reference import TABLES, reference
 from sports.models import Club, League, PersonalStatistic, Sport, SportStatistic
 
 
@@ -66,3 +69,101 @@ class TestAccountProfileView:
         response = api_client.delete(url)
         assert response.status_code == status.HTTP_204_NO_CONTENT
         assert not SportStatistic.objects.filter(pk=stat.pk).exists()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestAthleteProfileUpdate:
+    url = reverse("account-update")
+
+    def payload(self, sport, exam, size, **athlete):
+        return {
+            "athlete": {
+                "sport": sport.id,
+                "gpa": 3.7,
+                "clubs": [{"name": f"Club {i}"} for i in range(size)],
+                "leagues": [{"name": f"League {i}", "level": "club"} for i in range(size)],
+                "sport_statistics": [
+                    {"name": f"Goals {i}", "year": 2025, "season": "fall", "value": str(i)} for i in range(size)
+                ],
+                "personal_statistics": [{"name": f"Sprint {i}", "value": "12s"} for i in range(size)],
+                "exams": [{"exam": str(exam.uuid), "score": 4} for _ in range(size)],
+                **athlete,
+            }
+        }
+
+    def test_writes_every_list_with_constant_queries(self, api_client, create_athlete):
+        sport = Sport.objects.create(name="Soccer", gender="female")
+        exam = Exam.objects.create(name="Calc", exam_type="AP")
+        Club.objects.create(name="Club 0", sport=sport)
+        query_counts = []
+        for table in TABLES:
+            reference.fragments(table)
+        for i, size in enumerate([2, 20]):
+            athlete = create_athlete(email=f"athlete{i}@example.com", password="pass")
+            api_client.force_authenticate(user=athlete.user)
+            with CaptureQueriesContext(connection) as queries:
+                response = api_client.put(self.url, self.payload(sport, exam, size), format="json")
+            assert response.status_code == status.HTTP_200_OK, response.data
+            query_counts.append(len(queries))
+
+            data = response.data["athlete"]
+            assert data["gpa"] == 3.7
+            assert data["sport"]["id"] == sport.id
+            assert len(data["clubs"]) == len(data["leagues"]) == size
+            assert len(data["sport_statistics"]) == len(data["personal_statistics"]) == len(data["exams"]) == size
+        assert query_counts[0] == query_counts[1]
+        assert Club.objects.filter(name="Club 0").count() == 1
+        assert League.objects.count() == 20
+
+    def test_lists_replace_current_rows(self, api_client, create_athlete):
+        sport = Sport.objects.create(name="Soccer", gender="female")
+        exam = Exam.objects.create(name="Calc", exam_type="AP")
+        athlete = create_athlete(email="athlete@example.com", password="pass")
+        api_client.force_authenticate(user=athlete.user)
+        response = api_client.put(self.url, self.payload(sport, exam, 2), format="json")
+        kept, dropped = response.data["athlete"]["personal_statistics"]
+
+        payload = {
+            "athlete": {
+                "personal_statistics": [
+                    {"id": kept["id"], "name": "Sprint", "value": "11s"},
+                    {"name": "Jump", "value": "2m"},
+                ],
+                "clubs": [],
+            }
+        }
+        response = api_client.put(self.url, payload, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        stats = {stat.name: stat for stat in PersonalStatistic.objects.filter(athlete=athlete)}
+        assert set(stats) == {"Sprint", "Jump"}
+        assert stats["Sprint"].id == kept["id"] and stats["Sprint"].value == "11s"
+        assert not PersonalStatistic.objects.filter(id=dropped["id"]).exists()
+        assert not athlete.clubs.exists()
+        assert athlete.leagues.count() == 2
+        assert SportStatistic.objects.filter(athlete=athlete).count() == 2
+
+    def test_foreign_rows_and_unknown_references_are_rejected(self, api_client, create_athlete):
+        sport = Sport.objects.create(name="Soccer", gender="female")
+        other = create_athlete(email="other@example.com", password="pass")
+        foreign = PersonalStatistic.objects.create(athlete=other, name="Sprint", value="10s")
+        athlete = create_athlete(email="athlete@example.com", password="pass")
+        api_client.force_authenticate(user=athlete.user)
+
+        payload = {"athlete": {"gpa": 2.0, "personal_statistics": [{"id": foreign.id, "name": "x", "value": "y"}]}}
+        response = api_client.put(self.url, payload, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert PersonalStatistic.objects.get(id=foreign.id).value == "10s"
+        athlete.refresh_from_db()
+        assert athlete.gpa is None  # the whole update was rolled back
+
+        payload = {"athlete": {"sport": sport.id, "sport_statistics": [self.stat(club=999)]}}
+        response = api_client.put(self.url, payload, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+        response = api_client.put(self.url, {"athlete": {"clubs": [{"name": "Club"}]}}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @staticmethod
+    def stat(**kwargs):
+        return {"name": "Goals", "year": 2025, "season": "fall", "value": "3", **kwargs}
@@ -1,8 +1,13 @@
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework import status
 
-from accounts.models import Account
+from academics.models import AthleteExam, Exam, Highschool, University
+from accounts.models import Account, Athlete, ProfileDocument
+from core.models import Address, Country, State
+from sports.models import Club, League, PersonalStatistic, Position, Sport, SportStatistic
 
 
 @pytest.mark.unit
@@ -31,3 +36,74 @@ class TestAccountProfileView:
         assert response.data["athlete"] is None
         assert response.data["email"] == "user@example.com"
         assert response.data["coach"]["uuid"] == str(coach.uuid)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestAccountRetrieveQueryCount:
+    def create_profile(self, email, size):
+        country = Country.objects.create(name=f"Country {email}", code="US")
+        state = State.objects.create(name="California", code="CA", country=country)
+        address = Address.objects.create(address_one="1 Main St", state=state, country=country)
+        sport = Sport.objects.create(name="Soccer", gender="male")
+        highschool = Highschool.objects.create(name="High", address=address)
+        athlete = Athlete.objects.create(
+            user=Account.objects.create_user(email=email, password="pass"),
+            sport=sport,
+            position=Position.objects.create(sport=sport, abbreviation="GK", name="Goalkeeper"),
+            highschool=highschool,
+            university=University.objects.create(name="Uni", address=address),
+        )
+        exam = Exam.objects.create(name="Calculus", exam_type="AP")
+        for i in range(size):
+            club = Club.objects.create(name=f"Club {i}", sport=sport)
+            athlete.clubs.add(club)
+            athlete.leagues.add(League.objects.create(name=f"League {i}", sport=sport))
+            SportStatistic.objects.create(
+                athlete=athlete,
+                sport=sport,
+                club=club,
+                highschool=highschool,
+                name=f"Goals {i}",
+                year=2024,
+                season="fall",
+                value=str(i),
+            )
+            PersonalStatistic.objects.create(athlete=athlete, name=f"Sprint {i}", value="5s")
+            AthleteExam.objects.create(athlete=athlete, exam=exam, score=5)
+        return athlete
+
+    def count_queries(self, api_client, athlete, cold=True):
+        url = reverse("account-detail", kwargs={"pk": athlete.user.pk})
+        if cold:
+            # Building the profile document is the expensive path
+            ProfileDocument.objects.filter(account=athlete.user).delete()
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["athlete"]["sport_statistics"]) == athlete.sportstatistic_set.count()
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_profile_size(self, api_client, create_coach):
+        viewer = create_coach(email="viewer@example.com", password="pass")
+        api_client.force_authenticate(user=viewer.user)
+        small = self.create_profile("small@example.com", size=1)
+        large = self.create_profile("large@example.com", size=6)
+        self.count_queries(api_client, small)  # fills the reference cache
+        assert self.count_queries(api_client, large) == self.count_queries(api_client, small)
+
+    def test_stored_document_is_served_with_one_query(self, api_client, create_coach):
+        viewer = create_coach(email="viewer@example.com", password="pass")
+        api_client.force_authenticate(user=viewer.user)
+        athlete = self.create_profile("athlete@example.com", size=3)
+        self.count_queries(api_client, athlete)
+        assert ProfileDocument.objects.filter(account=athlete.user).exists()
+        assert self.count_queries(api_client, athlete, cold=False) == 1
+
+    def test_hides_sensitive_fields_from_other_athletes(self, api_client, create_athlete):
+        viewer = create_athlete(email="viewer@example.com", password="pass")
+        api_client.force_authenticate(user=viewer.user)
+        athlete = self.create_profile("target@example.com", size=1)
+        response = api_client.get(reverse("account-detail", kwargs={"pk": athlete.user.pk}))
+        assert "gpa" not in response.data["athlete"]
+        assert "sport_statistics" in response.data["athlete"]
@@ -0,0 +1,70 @@
+import uuid
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from accounts.models import SavedAccount
+
+
+@pytest.fixture
+def coach(create_coach):
+    return create_coach(email="coach@example.com", password="pass")
+
+
+@pytest.fixture
+def athletes(create_athlete):
+    return [create_athlete(email=f"athlete{i}@example.com", password="pass") for i in range(3)]
+
+
+def saved_ids(coach):
+    return set(SavedAccount.objects.filter(coach=coach).values_list("athlete_id", flat=True))
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSaveAccountBulk:
+    url = reverse("account-save-bulk")
+
+    def post(self, api_client, action, uuids):
+        return api_client.post(self.url, {"action": action, "athletes": [str(u) for u in uuids]}, format="json")
+
+    def test_save(self, api_client, coach, athletes):
+        SavedAccount.objects.create(coach=coach, athlete=athletes[0])
+        unknown = uuid.uuid4()
+        api_client.force_authenticate(user=coach.user)
+        response = self.post(api_client, "save", [athletes[1].uuid, unknown, athletes[0].uuid])
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["result"] for item in response.data] == ["saved", "not_found", "already_saved"]
+        assert response.data[1]["athlete"] == str(unknown)
+        assert saved_ids(coach) == {athletes[0].id, athletes[1].id}
+
+    def test_unsave(self, api_client, coach, athletes):
+        for athlete in athletes[:2]:
+            SavedAccount.objects.create(coach=coach, athlete=athlete)
+        api_client.force_authenticate(user=coach.user)
+        response = self.post(api_client, "unsave", [athletes[0].uuid, athletes[2].uuid])
+        assert [item["result"] for item in response.data] == ["unsaved", "not_saved"]
+        assert saved_ids(coach) == {athletes[1].id}
+
+    def test_query_count_does_not_grow_with_batch_size(self, api_client, coach, athletes, create_athlete):
+        api_client.force_authenticate(user=coach.user)
+        with CaptureQueriesContext(connection) as small:
+            self.post(api_client, "save", [athletes[0].uuid])
+        more = [create_athlete(email=f"more{i}@example.com", password="pass") for i in range(5)]
+        with CaptureQueriesContext(connection) as large:
+            self.post(api_client, "save", [athlete.uuid for athlete in athletes[1:] + more])
+        assert len(large) == len(small)
+        assert len(saved_ids(coach)) == 8
+
+    def test_rejects_duplicates(self, api_client, coach, athletes):
+        api_client.force_authenticate(user=coach.user)
+        response = self.post(api_client, "save", [athletes[0].uuid, athletes[0].uuid])
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_coaches_only(self, api_client, athletes):
+        api_client.force_authenticate(user=athletes[0].user)
+        response = self.post(api_client, "save", [athletes[1].uuid])
+        assert response.status_code == status.HTTP_403_FORBIDDEN
@@ -0,0 +1,83 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from accounts.models import SavedAccount
+from sports.models import Position, Sport
+
+
+@pytest.fixture
+def sport():
+    return Sport.objects.create(name="Soccer", gender="female")
+
+
+@pytest.fixture
+def coach(create_coach):
+    return create_coach(email="coach@example.com", password="pass")
+
+
+def save(create_athlete, coach, sport, count, start=0, **kwargs):
+    position, _ = Position.objects.get_or_create(sport=sport, abbreviation="GK", defaults={"name": "Goalkeeper"})
+    return [
+        SavedAccount.objects.create(
+            coach=coach,
+            athlete=create_athlete(
+                email=f"athlete{i}@example.com", password="pass", sport=sport, position=position, **kwargs
+            ),
+        )
+        for i in range(start, start + count)
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSavedAccountList:
+    url = reverse("account-saved-list")
+
+    def test_lists_most_recent_first_with_constant_queries(self, api_client, coach, sport, create_athlete):
+        api_client.force_authenticate(user=coach.user)
+        saved = save(create_athlete, coach, sport, 1)
+        api_client.get(self.url)  # fills the reference cache
+        with CaptureQueriesContext(connection) as small:
+            api_client.get(self.url)
+        saved += save(create_athlete, coach, sport, 4, start=1)
+        with CaptureQueriesContext(connection) as large:
+            response = api_client.get(self.url, {"page_size": 3})
+        assert response.status_code == status.HTTP_200_OK
+        assert [s["id"] for s in response.data["results"]] == [s.id for s in saved[::-1][:3]]
+        card = response.data["results"][0]["athlete"]
+        assert card["id"] == saved[-1].athlete.user.id
+        assert card["position"]["abbreviation"] == "GK"
+        assert len(large) == len(small)
+
+        response = api_client.get(response.data["next"])
+        assert [s["id"] for s in response.data["results"]] == [saved[1].id, saved[0].id]
+
+    def test_filters(self, api_client, coach, sport, create_athlete):
+        saved = save(create_athlete, coach, sport, 2, highschool_grad_year=2026)
+        saved += save(create_athlete, coach, sport, 1, start=2, highschool_grad_year=2027)
+        striker = Position.objects.create(sport=sport, abbreviation="ST", name="Striker")
+        saved[0].athlete.position = striker
+        saved[0].athlete.save()
+        other = Sport.objects.create(name="Tennis", gender="female")
+        saved[1].athlete.sport = other
+        saved[1].athlete.save()
+        api_client.force_authenticate(user=coach.user)
+
+        def ids(**filters):
+            return [s["id"] for s in api_client.get(self.url, filters).data["results"]]
+
+        assert ids(sport=other.id) == [saved[1].id]
+        assert ids(position=striker.id) == [saved[0].id]
+        assert ids(grad_year=2027) == [saved[2].id]
+        assert ids(sport=sport.id, grad_year=2026) == [saved[0].id]
+
+    def test_only_lists_own_saved_accounts(self, api_client, coach, sport, create_athlete, create_coach):
+        save(create_athlete, coach, sport, 1)
+        other = create_coach(email="other@example.com", password="pass")
+        api_client.force_authenticate(user=other.user)
+        response = api_client.get(self.url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"] == []
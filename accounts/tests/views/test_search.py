@@ -0,0 +1,78 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from academics.models import Highschool, University
+from accounts.models import Account
+from sports.models import Position, Sport
+
+
+@pytest.fixture
+def sport():
+    return Sport.objects.create(name="Soccer", gender="female")
+
+
+@pytest.fixture
+def athletes(create_athlete, sport):
+    highschool = Highschool.objects.create(name="Lincoln High")
+    position = Position.objects.create(sport=sport, abbreviation="GK", name="Goalkeeper")
+
+    def athlete(email, first_name, last_name, **kwargs):
+        user = Account.objects.create_user(email=email, password="pass", first_name=first_name, last_name=last_name)
+        return create_athlete(user=user, sport=sport, highschool=highschool, **kwargs)
+
+    return {
+        "anna": athlete("anna@example.com", "Anna", "Smith", position=position, highschool_grad_year=2026),
+        "annabel": athlete("annabel@example.com", "Annabel", "Jones", highschool_grad_year=2027),
+        "joanna": athlete("joanna@example.com", "Joanna", "Smithson", highschool_grad_year=2026),
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestSearchAccounts:
+    url = reverse("account-search")
+
+    def search(self, api_client, athletes, **params):
+        api_client.force_authenticate(user=athletes["anna"].user)
+        response = api_client.get(self.url, params)
+        assert response.status_code == status.HTTP_200_OK
+        return [hit["first_name"] for hit in response.data["results"]]
+
+    def test_ranks_exact_and_prefix_matches_first(self, api_client, athletes):
+        assert self.search(api_client, athletes, name="anna") == ["Anna", "Annabel", "Joanna"]
+
+    def test_every_term_must_match(self, api_client, athletes):
+        assert self.search(api_client, athletes, name="anna smith") == ["Anna", "Joanna"]
+
+    def test_repeated_spaces_do_not_crash(self, api_client, athletes):
+        assert self.search(api_client, athletes, name="anna  smith  lincoln") == ["Anna", "Joanna"]
+
+    def test_matches_related_fields(self, api_client, athletes):
+        assert self.search(api_client, athletes, name="goalkeeper") == ["Anna"]
+        assert self.search(api_client, athletes, name="lincoln 2027") == ["Annabel"]
+
+    def test_filters(self, api_client, athletes, sport):
+        assert self.search(api_client, athletes, name="anna", grad_year=2026) == ["Anna", "Joanna"]
+        assert self.search(api_client, athletes, sport=sport.id, grad_year=2027) == ["Annabel"]
+        university = University.objects.create(name="State")
+        assert self.search(api_client, athletes, university=str(university.uuid)) == []
+
+    def test_returns_lightweight_hits(self, api_client, athletes):
+        api_client.force_authenticate(user=athletes["anna"].user)
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(self.url, {"name": "anna", "page_size": 2})
+        hit = response.data["results"][0]
+        assert hit["account_type"] == "athlete"
+        assert hit["uuid"] == str(athletes["anna"].uuid)
+        assert hit["sport"] == "Soccer"
+        assert hit["highschool"] == "Lincoln High"
+        assert "athlete" not in hit
+        assert response.data["count"] == 3
+        assert response.data["next"] is not None
+        assert len(queries) == 2
+
+    def test_empty_query_returns_no_results(self, api_client, athletes):
+        assert self.search(api_client, athletes) == []
@@ -6,6 +6,7 @@ from .views import (
     DeleteAthleteDataView,
     NotificationAddTokenView,
     NotificationDeleteTokenView,
+    SaveAccountBulkView,
     SaveAccountCreateDeleteView,
     SaveAccountListView,
     SearchAccountsView,
@@ -16,6 +17,7 @@ urlpatterns = [
     path("notification-token/<str:token>/", NotificationDeleteTokenView.as_view(), name="account-notification-token"),
     path("<str:object>/<int:pk>", DeleteAthleteDataView.as_view(), name="account-delete-data"),
     path("<int:pk>/", AccountRetrieve.as_view(), name="account-detail"),
+    path("save/bulk/", SaveAccountBulkView.as_view(), name="account-save-bulk"),
     path("save/<str:athlete_uuid>/", SaveAccountCreateDeleteView.as_view(), name="account-save"),
     path("save/", SaveAccountListView.as_view(), name="account-saved-list"),
     path("search/", SearchAccountsView.as_view(), name="account-search"),
@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import OpenApiParameter, OpenApiResponse, extend_schema
 from rest_framework import status
@@ -7,16 +8,26 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from accounts.models import Account, Athlete, Coach, NotificationToken, SavedAccount
+from accounts.documents import get_document
+from accounts.models import Athlete, Coach, NotificationToken, SavedAccount
+from accounts.pagination import SavedAccountPagination
+from accounts.profiles import profile_queryset
+from accounts.search import search_accounts
 from accounts.serializers import (
+    ATHLETE_CARD_RELATIONS,
     AccountResponseSerializer,
+    AccountSearchHitSerializer,
     AccountUpdateSerializer,
     AthleteSerializer,
-    CoachSerializer,
+    BulkSaveAccountResultSerializer,
+    BulkSaveAccountSerializer,
     NotificationTokenSerializer,
     SavedAccountResponseSerializer,
+    SavedAthleteSerializer,
+    ValidateSavedAccountQueryParams,
     ValidateSearchQueryParams,
 )
+from api.pagination import RankedPagination
 from user_auth.permissions import AllowCoach, AllowSelf
 
 
@@ -68,7 +79,8 @@ class AccountUpdateView(APIView):
         serializer = AccountUpdateSerializer(user, data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
-        return Response(AccountResponseSerializer(user).data, status=status.HTTP_200_OK)
+        profile = profile_queryset().get(pk=user.pk)
+        return Response(AccountResponseSerializer(profile).data, status=status.HTTP_200_OK)
 
 
 class SaveAccountCreateDeleteView(APIView):
@@ -104,22 +116,85 @@ class SaveAccountCreateDeleteView(APIView):
         return Response({"detail": "Account unsaved successfully"}, status=status.HTTP_204_NO_CONTENT)
 
 
+class SaveAccountBulkView(APIView):
+    permission_classes = [IsAuthenticated, AllowSelf, AllowCoach]
+
+    @extend_schema(
+        request=BulkSaveAccountSerializer,
+        responses={
+            status.HTTP_200_OK: OpenApiResponse(
+                response=BulkSaveAccountResultSerializer(many=True),
+                description="The outcome for each athlete, in the order sent",
+            ),
+            status.HTTP_400_BAD_REQUEST: OpenApiResponse(description="Invalid data"),
+        },
+        summary="Save or unsave many athletes at once",
+    )
+    def post(self, request, *args, **kwargs):
+        serializer = BulkSaveAccountSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        action = serializer.validated_data["action"]
+        uuids = serializer.validated_data["athletes"]
+        coach = request.user.coach
+
+        athlete_ids = dict(Athlete.objects.filter(uuid__in=uuids).values_list("uuid", "id"))
+        with transaction.atomic():
+            saved = SavedAccount.objects.filter(coach=coach, athlete_id__in=athlete_ids.values())
+            already_saved = set(saved.values_list("athlete_id", flat=True))
+            if action == "save":
+                SavedAccount.objects.bulk_create(
+                    [
+                        SavedAccount(coach=coach, athlete_id=pk)
+                        for pk in athlete_ids.values()
+                        if pk not in already_saved
+                    ],
+                    ignore_conflicts=True,
+                )
+                outcomes = {True: "already_saved", False: "saved"}
+            else:
+                if already_saved:
+                    SavedAccount.objects.filter(coach=coach, athlete_id__in=already_saved).delete()
+                outcomes = {True: "unsaved", False: "not_saved"}
+
+        results = [
+            {
+                "athlete": uuid,
+                "result": outcomes[athlete_ids[uuid] in already_saved] if uuid in athlete_ids else "not_found",
+            }
+            for uuid in uuids
+        ]
+        return Response(BulkSaveAccountResultSerializer(results, many=True).data, status=status.HTTP_200_OK)
+
+
 class SaveAccountListView(APIView):
     permission_classes = [IsAuthenticated, AllowSelf, AllowCoach]
 
     @extend_schema(
+        parameters=[ValidateSavedAccountQueryParams],
         responses={
             status.HTTP_200_OK: OpenApiResponse(
-                response=AccountResponseSerializer(many=True),
+                response=SavedAthleteSerializer(many=True),
+                description="Page of the coach's saved athletes, most recently saved first",
             )
         },
     )
     def get(self, request, *args, **kwargs):
-        user = request.user
-        coach = get_object_or_404(Coach, user=user)
-        saved_accounts = SavedAccount.objects.filter(coach=coach).select_related("athlete__user")
-        athletes = [saved_account.athlete.user for saved_account in saved_accounts]
-        return Response(AccountResponseSerializer(athletes, many=True).data, status=status.HTTP_200_OK)
+        query_params = ValidateSavedAccountQueryParams(data=request.query_params)
+        query_params.is_valid(raise_exception=True)
+        filters = query_params.validated_data
+
+        saved_accounts = SavedAccount.objects.filter(coach__user=request.user).select_related(
+            *[f"athlete__{relation}" for relation in ATHLETE_CARD_RELATIONS]
+        )
+        if "sport" in filters:
+            saved_accounts = saved_accounts.filter(athlete__sport_id=filters["sport"])
+        if "position" in filters:
+            saved_accounts = saved_accounts.filter(athlete__position_id=filters["position"])
+        if "grad_year" in filters:
+            saved_accounts = saved_accounts.filter(athlete__highschool_grad_year=filters["grad_year"])
+        paginator = SavedAccountPagination()
+        page = paginator.paginate_queryset(saved_accounts, request, view=self)
+        return paginator.get_paginated_response(SavedAthleteSerializer(page, many=True).data)
 
 
 class DeleteAthleteDataView(APIView):
@@ -169,8 +244,10 @@ class AccountRetrieve(APIView):
         }
     )
     def get(self, request, *args, **kwargs):
-        user = get_object_or_404(get_user_model(), pk=kwargs["pk"])
-        response = AccountResponseSerializer(user).data
+        # The precomputed document, see `accounts.documents`
+        document = get_document(kwargs["pk"])
+        if document is None:
+            raise Http404
         viewer = request.user
         # Default to not hiding sensitive fields
         hide_sensitive = False
@@ -186,51 +263,34 @@ class AccountRetrieve(APIView):
             elif hasattr(viewer, "athlete") and viewer.athlete is not None:
                 account_type = "athlete"
         # Hide sensitive if viewer is athlete and not viewing self
-        if account_type == "athlete" and viewer != user:
+        if account_type == "athlete" and viewer.pk != document["id"]:
             hide_sensitive = True
-        try:
-            athlete = Athlete.objects.get(user=user)
-            response["athlete"] = AthleteSerializer(athlete, context={"hide_sensitive": hide_sensitive}).data
-        except Athlete.DoesNotExist:
-            pass
-        try:
-            coach = Coach.objects.get(user=user)
-            response["coach"] = CoachSerializer(coach).data
-        except Coach.DoesNotExist:
-            pass
-        return Response(response, status=status.HTTP_200_OK)
+        if hide_sensitive and document["athlete"] is not None:
+            for field in AthleteSerializer.sensitive_fields:
+                document["athlete"].pop(field, None)
+        return Response(document, status=status.HTTP_200_OK)
 
 
 class SearchAccountsView(APIView):
     permission_classes = [IsAuthenticated]
 
     @extend_schema(
-        parameters=[
-            OpenApiParameter(
-                name="name",
-                type=str,
-                description="Search query for account's first name or last name",
-            ),
-        ],
+        parameters=[ValidateSearchQueryParams],
         responses={
             200: OpenApiResponse(
-                response=AccountResponseSerializer(many=True),
+                response=AccountSearchHitSerializer(many=True),
             )
         },
     )
     def get(self, request, *args, **kwargs):
         query_params = ValidateSearchQueryParams(data=request.query_params)
         query_params.is_valid(raise_exception=True)
-        search_query = query_params.validated_data.get("name")
-        print(search_query)
-        if not search_query:
-            return Response([], status=status.HTTP_200_OK)
-        if " " in search_query:
-            first_name, last_name = search_query.split(" ")
-            search_result = Account.objects.filter(first_name__icontains=first_name, last_name__icontains=last_name)
+        filters = dict(query_params.validated_data)
+        search_query = filters.pop("name", "").strip()
+        if search_query or filters:
+            search_result = search_accounts(search_query, **filters)
         else:
-            # Search by first name OR last name when only one term
-            search_result = Account.objects.filter(
-                Q(first_name__icontains=search_query) | Q(last_name__icontains=search_query)
-            )
-        return Response(AccountResponseSerializer(search_result, many=True).data, status=status.HTTP_200_OK)
+            search_result = get_user_model().objects.none()
+        paginator = RankedPagination()
+        page = paginator.paginate_queryset(search_result, request, view=self)
+        return paginator.get_paginated_response(AccountSearchHitSerializer(page, many=True).data)
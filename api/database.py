@@ -0,0 +1,61 @@
+"""
+Database connection management, selected with `DB_CONNECTION_MODE`:
+
+    direct      a new connection for every request, closed when it ends (Django's default)
+    persistent  connections are kept open for `DB_CONN_MAX_AGE` seconds and checked before each request reuses one.
+                The default under gthread workers.
+    pool        psycopg's connection pool (needs `psycopg[pool]`), `DB_POOL_MIN_SIZE` to `DB_POOL_MAX_SIZE`
+                connections per process, waiting up to `DB_POOL_TIMEOUT` seconds for a free one. The default under
+                uvicorn workers: Django does not support persistent connections with ASGI.
+    pgbouncer   persistent connections to a pgbouncer running in transaction pooling mode. A client's statements
+                may run on a different server connection in every transaction, so server-side cursors (which
+                outlive a transaction during `.iterator()`) and prepared statements are disabled.
+
+`benchmarks.connections` times each mode against the docker-compose Postgres.
+
+Read replicas are listed in `POSTGRES_REPLICA_HOSTS` as comma separated `host[:port]` entries and become the aliases
+`replica_1`, `replica_2`, ... with the primary's credentials and connection mode, see `api.replicas` for the routing.
+"""
+
+from django.core.exceptions import ImproperlyConfigured
+
+CONNECTION_MODES = ["direct", "persistent", "pool", "pgbouncer"]
+
+
+def default_connection_mode(worker_class):
+    return "pool" if worker_class == "uvicorn" else "persistent"
+
+
+def connection_settings(mode, conn_max_age=60, pool_min_size=2, pool_max_size=10, pool_timeout=10):
+    """The connection entries of a `DATABASES` alias for `mode`."""
+    if mode not in CONNECTION_MODES:
+        raise ImproperlyConfigured(f"Unknown DB_CONNECTION_MODE {mode!r}, use one of {', '.join(CONNECTION_MODES)}")
+    if mode == "direct":
+        return {"CONN_MAX_AGE": 0}
+    if mode == "pool":
+        # The pool replaces persistent connections, Django refuses to combine them
+        return {
+            "CONN_MAX_AGE": 0,
+            "OPTIONS": {"pool": {"min_size": pool_min_size, "max_size": pool_max_size, "timeout": pool_timeout}},
+        }
+    settings = {"CONN_MAX_AGE": conn_max_age, "CONN_HEALTH_CHECKS": True}
+    if mode == "pgbouncer":
+        settings["DISABLE_SERVER_SIDE_CURSORS"] = True
+        # psycopg prepares a statement once it has run `prepare_threshold` times, None never does
+        settings["OPTIONS"] = {"prepare_threshold": None}
+    return settings
+
+
+def replica_databases(primary, hosts):
+    """The `DATABASES` aliases of the replicas at `hosts` ("host[:port]" entries), copies of the `primary` alias."""
+    databases = {}
+    for index, address in enumerate(filter(None, (host.strip() for host in hosts)), start=1):
+        host, _, port = address.partition(":")
+        databases[f"replica_{index}"] = {
+            **primary,
+            "HOST": host,
+            "PORT": port or primary.get("PORT", ""),
+            # Tests run against the primary's test database
+            "TEST": {"MIRROR": "default"},
+        }
+    return databases
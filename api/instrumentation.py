@@ -0,0 +1,173 @@
+"""
+Per-request query and latency instrumentation.
+
+`RequestInstrumentationMiddleware` wraps every database connection with `connection.execute_wrapper` for the
+duration of a request, counting queries and the time spent in them. DRF responses are rendered by
+`TimedJSONRenderer`, which adds the rendering time. Each response gets a `Server-Timing` header:
+
+    Server-Timing: db;dur=4.1;desc="6 queries", render;dur=0.8, app;dur=9.3, total;dur=14.2
+
+where `app` is everything else (view code, serializers building their data, middleware). The last
+`REQUEST_METRICS_WINDOW` requests of each endpoint are kept in `registry` for rolling percentiles.
+
+`QUERY_BUDGETS` maps url names to the most queries a request to that endpoint may run. Going over is logged, or
+raised as `QueryBudgetExceeded` when `QUERY_BUDGET_ENFORCE` is set, which the test suite does so a new N+1 fails CI.
+Queries run inside `cache_fill()`, which loads a process-wide cache once, are timed but kept out of the budget.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.renderers import JSONRenderer
+
+from api.stats import percentiles
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar("request_metrics", default=None)
+_filling_cache = ContextVar("filling_cache", default=False)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestMetrics:
+    def __init__(self, keep_sql=False):
+        self.queries = 0
+        self.cache_fill_queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.sql = [] if keep_sql else None
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            if _filling_cache.get():
+                self.cache_fill_queries += 1
+            else:
+                self.queries += 1
+            if self.sql is not None:
+                self.sql.append(sql)
+
+
+@contextmanager
+def cache_fill():
+    token = _filling_cache.set(True)
+    try:
+        yield
+    finally:
+        _filling_cache.reset(token)
+
+
+class MetricsRegistry:
+    """Rolling window of (total ms, db ms, queries) samples per endpoint."""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._samples = {}
+        self._counts = {}
+        self._over_budget = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, total, metrics, over_budget=False):
+        with self._lock:
+            samples = self._samples.get(endpoint)
+            if samples is None:
+                samples = self._samples[endpoint] = deque(maxlen=self.window)
+            samples.append((total * 1000, metrics.db_time * 1000, metrics.queries))
+            self._counts[endpoint] = self._counts.get(endpoint, 0) + 1
+            self._over_budget[endpoint] = self._over_budget.get(endpoint, 0) + over_budget
+
+    def summary(self):
+        with self._lock:
+            samples = {endpoint: list(values) for endpoint, values in self._samples.items()}
+            counts = dict(self._counts)
+            over_budget = dict(self._over_budget)
+        return {
+            endpoint: {
+                "count": counts[endpoint],
+                "over_budget": over_budget[endpoint],
+                "total_ms": percentiles([total for total, _, _ in values]),
+                "db_ms": percentiles([db for _, db, _ in values]),
+                "queries": percentiles([queries for _, _, queries in values]),
+            }
+            for endpoint, values in samples.items()
+        }
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+            self._over_budget.clear()
+
+
+registry = MetricsRegistry(window=getattr(settings, "REQUEST_METRICS_WINDOW", 1000))
+
+
+class TimedJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        started = time.perf_counter()
+        try:
+            return super().render(data, accepted_media_type, renderer_context)
+        finally:
+            metrics = _current.get()
+            if metrics is not None:
+                metrics.render_time += time.perf_counter() - started
+
+
+class RequestInstrumentationMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        enforce = getattr(settings, "QUERY_BUDGET_ENFORCE", False)
+        metrics = RequestMetrics(keep_sql=enforce)
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(metrics))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - started
+
+        endpoint = request.resolver_match.url_name if request.resolver_match else None
+        budget = getattr(settings, "QUERY_BUDGETS", {}).get(endpoint)
+        over_budget = budget is not None and metrics.queries > budget
+        if endpoint:
+            registry.record(endpoint, total, metrics, over_budget)
+        response["Server-Timing"] = server_timing(metrics, total)
+
+        if over_budget:
+            message = f"{request.method} {endpoint} ran {metrics.queries} queries, its budget is {budget}"
+            if enforce:
+                raise QueryBudgetExceeded("\n".join([message, *metrics.sql]))
+            logger.warning(message)
+        return response
+
+
+def server_timing(metrics, total):
+    app = max(total - metrics.db_time - metrics.render_time, 0.0)
+    queries = f"{metrics.queries} queries"
+    if metrics.cache_fill_queries:
+        queries += f", {metrics.cache_fill_queries} cache fill"
+    return ", ".join(
+        [
+            f'db;dur={metrics.db_time * 1000:.1f};desc="{queries}"',
+            f"render;dur={metrics.render_time * 1000:.1f}",
+            f"app;dur={app * 1000:.1f}",
+            f"total;dur={total * 1000:.1f}",
+        ]
+    )
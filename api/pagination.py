@@ -0,0 +1,22 @@
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination with a client-selectable page size. Subclasses set `ordering`, ending with a unique column
+    so the cursor position is stable.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+
+class RankedPagination(PageNumberPagination):
+    """
+    Page number pagination for results ordered by a computed rank, which a cursor cannot seek on.
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
@@ -0,0 +1,115 @@
+"""
+Read replicas.
+
+The aliases in `DATABASE_REPLICAS` (configured from `POSTGRES_REPLICA_HOSTS`, see api/database.py) receive the reads
+of safe requests, picked at random per query. Everything else reads from `default`:
+
+- requests with an unsafe method, management commands and any code running outside a request
+- reads inside a transaction, so a read-then-write sees the rows it is about to change
+- the rest of a request once it has written anything
+- every request of an account for `REPLICA_STICKY_SECONDS` after one of its requests wrote, so users read their own
+  writes while the replicas catch up. The marks are kept in the cache, so they only reach other processes through the
+  shared cache (`REDIS_URL`).
+
+The account is known once `identify` is called by the authentication class, early enough that the user lookup
+itself honours stickiness. Code that must not see replication lag can wrap its reads in `primary()`.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_routing = ContextVar("replica_routing", default=None)
+
+
+class Routing:
+    """How the current request reads."""
+
+    def __init__(self, use_replicas):
+        self.use_replicas = use_replicas
+        self.account_id = None
+        self.wrote = False
+
+
+def sticky_key(account_id):
+    return f"replicas:sticky:{account_id}"
+
+
+def identify(account_id):
+    """Record the account making the current request, sending its reads to the primary if it wrote recently."""
+    routing = _routing.get()
+    if routing is None:
+        return
+    routing.account_id = account_id
+    if routing.use_replicas and cache.get(sticky_key(account_id)):
+        routing.use_replicas = False
+
+
+@contextmanager
+def primary():
+    """Read from the primary inside the block."""
+    routing = _routing.get()
+    if routing is None:
+        yield
+        return
+    use_replicas = routing.use_replicas
+    routing.use_replicas = False
+    try:
+        yield
+    finally:
+        routing.use_replicas = use_replicas and not routing.wrote
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        routing = _routing.get()
+        replicas = settings.DATABASE_REPLICAS
+        if routing is None or not routing.use_replicas or not replicas:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        routing = _routing.get()
+        if routing is not None:
+            routing.wrote = True
+            routing.use_replicas = False
+        # Never None: Django would fall back to the database the instance was read from, which may be a replica
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db in settings.DATABASE_REPLICAS else None
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        routing = Routing(use_replicas=request.method in SAFE_METHODS)
+        token = _routing.set(routing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _routing.reset(token)
+
+        if routing.wrote:
+            account_id = routing.account_id
+            if account_id is None:
+                # Views that authenticate some other way (sessions, tests) still set request.user
+                user = getattr(request, "user", None)
+                account_id = user.pk if user is not None and user.is_authenticated else None
+            if account_id is not None:
+                cache.set(sticky_key(account_id), True, settings.REPLICA_STICKY_SECONDS)
+        return response
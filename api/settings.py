@@ -10,15 +10,15 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
-import json
 import os
 from pathlib import Path
-from urllib import request
 
 import django
 from django.utils.encoding import smart_str
 from django.utils.translation import gettext
 
+from api.database import connection_settings, default_connection_mode, replica_databases
+
 django.utils.translation.ugettext = gettext
 django.utils.encoding.smart_text = smart_str
 
@@ -51,6 +51,15 @@ CSRF_TRUSTED_ORIGINS = os.getenv("DJANGO_CSRF_TRUSTED_ORIGINS", "https://localho
 AWS_REGION = os.getenv("COGNITO_AWS_REGION", "us-east-1")
 USER_POOL_ID = os.getenv("COGNITO_USER_POOL", "us-east-1_mWSIzODLf")
 APP_CLIENT_ID = os.getenv("COGNITO_AUDIENCE", "gem7qkrrt94tc3ahk2ch836au")
+# "boto3" talks to the user pool, "fake" uses the in-memory `user_auth.fake_cognito` client (offline dev/benchmarks)
+COGNITO_BACKEND = os.getenv("COGNITO_BACKEND", "boto3")
+COGNITO_FAKE_LATENCY = float(os.getenv("COGNITO_FAKE_LATENCY", "0"))
+# Calls in flight to Cognito per process, shared by the gateway's thread pool and boto's connection pool
+COGNITO_MAX_CONNECTIONS = int(os.getenv("COGNITO_MAX_CONNECTIONS", "20"))
+COGNITO_CONNECT_TIMEOUT = float(os.getenv("COGNITO_CONNECT_TIMEOUT", "2"))
+COGNITO_READ_TIMEOUT = float(os.getenv("COGNITO_READ_TIMEOUT", "5"))
+# Including the first attempt, see botocore's "standard" retry mode
+COGNITO_MAX_ATTEMPTS = int(os.getenv("COGNITO_MAX_ATTEMPTS", "3"))
 
 # Application definition
 
@@ -69,11 +78,15 @@ INSTALLED_APPS = [
     "posts",
     "openings",
     "referrals",
+    "notifications",
+    "jobs",
     "user_auth",
     "drf_spectacular",
 ]
 
 MIDDLEWARE = [
+    "api.instrumentation.RequestInstrumentationMiddleware",  # Outermost, so its total covers all other middleware
+    "api.replicas.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",  # Must be below SecurityMiddleware
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -89,8 +102,48 @@ ROOT_URLCONF = "api.urls"
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PERMISSION_CLASSES": ("user_auth.permissions.DenyAny",),
-    "DEFAULT_AUTHENTICATION_CLASSES": ("rest_framework_jwt.authentication.JSONWebTokenAuthentication",),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("user_auth.authentication.CognitoJSONWebTokenAuthentication",),
+    "DEFAULT_RENDERER_CLASSES": (
+        "api.instrumentation.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+}
+
+# Request instrumentation, see `api.instrumentation`. Samples kept per endpoint for the rolling percentiles:
+REQUEST_METRICS_WINDOW = int(os.getenv("REQUEST_METRICS_WINDOW", "1000"))
+# Most SQL queries a request to each endpoint (by url name) may run, authentication included. Exceeding a budget is
+# logged, and raised when QUERY_BUDGET_ENFORCE is set (the test suite turns it on).
+QUERY_BUDGETS = {
+    # One query for the stored profile document, the rest covers creating the account on its first request
+    "account-detail": 8,
+    "account-search": 4,
+    "account-update": 32,
+    "account-saved-list": 2,
+    "account-save-bulk": 5,
+    "opening": 5,
+    # Deleting an opening also clears its applicants, eligibilities, positions and exam scores
+    "opening-detail": 12,
+    "opening-matches": 5,
+    "opening-athlete-matches": 4,
+    "opening-applicants": 7,
+    "user-register": 3,
+    "user-confirm": 2,
+    "user-resend": 2,
+    "user-login": 2,
+    "user-refresh-token": 2,
+    "user-forgot-password": 2,
+    "user-confirm-forgot-password": 2,
+    # Catalogs are served from the reference cache, whose fills are not counted
+    "sport-catalog": 0,
+    "position-catalog": 0,
+    "club-catalog": 0,
+    "league-catalog": 0,
+    "exam-catalog": 0,
+    "university-catalog": 0,
+    "state-catalog": 0,
+    "country-catalog": 0,
 }
+QUERY_BUDGET_ENFORCE = os.getenv("QUERY_BUDGET_ENFORCE", "False") == "True"
 
 SPECTACULAR_SETTINGS = {
     "TITLE": "ShowNxt API",
@@ -121,6 +174,11 @@ WSGI_APPLICATION = "api.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Connection handling, see api/database.py
+DB_CONNECTION_MODE = os.getenv("DB_CONNECTION_MODE") or default_connection_mode(
+    os.getenv("GUNICORN_WORKER_CLASS", "gthread").lower()
+)
+
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
@@ -129,9 +187,23 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", "shownxt_pass"),
         "HOST": os.getenv("POSTGRES_HOST", "db"),
         "PORT": os.getenv("POSTGRES_PORT", "5432"),
+        **connection_settings(
+            DB_CONNECTION_MODE,
+            conn_max_age=int(os.getenv("DB_CONN_MAX_AGE", "60")),
+            pool_min_size=int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            pool_max_size=int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        ),
     }
 }
 
+# Read replicas for safe requests, see api/replicas.py
+DATABASES.update(replica_databases(DATABASES["default"], os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",")))
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+DATABASE_ROUTERS = ["api.replicas.ReplicaRouter"]
+# After writing, an account reads from the primary for this many seconds, longer than the replicas usually lag.
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -192,21 +264,74 @@ COGNITO_USER_POOL = "us-east-1_mWSIzODLf"
 COGNITO_AUDIENCE = "gem7qkrrt94tc3ahk2ch836au"
 COGNITO_POOL_URL = None  # will be set few lines of code later, if configuration provided
 
-rsa_keys = {}
-# To avoid circular imports in future, we keep this logic here.
-# On django init we download jwks public keys which are used to validate jwt tokens.
-# For now there is no rotation of keys (and Cognito haven't still implemented it...)
+# Cognito signs tokens with the keys published at `COGNITO_JWKS_URL`. They are loaded lazily by
+# `user_auth.jwks.JWKSKeyStore` on the first authenticated request, not at import time. Point
+# `COGNITO_JWKS_FILE` at a local copy of the JWKS to start without any network call.
 if COGNITO_AWS_REGION and COGNITO_USER_POOL:
     COGNITO_POOL_URL = "https://cognito-idp.{}.amazonaws.com/{}".format(COGNITO_AWS_REGION, COGNITO_USER_POOL)
-    pool_jwks_url = COGNITO_POOL_URL + "/.well-known/jwks.json"
-    jwks = json.loads(request.urlopen(pool_jwks_url).read())
-    rsa_keys = {key["kid"]: json.dumps(key) for key in jwks["keys"]}
+COGNITO_JWKS_URL = os.getenv("COGNITO_JWKS_URL", COGNITO_POOL_URL and COGNITO_POOL_URL + "/.well-known/jwks.json")
+COGNITO_JWKS_FILE = os.getenv("COGNITO_JWKS_FILE") or None
+COGNITO_JWKS_TTL = int(os.getenv("COGNITO_JWKS_TTL", "3600"))
+COGNITO_JWKS_NEGATIVE_TTL = int(os.getenv("COGNITO_JWKS_NEGATIVE_TTL", "300"))
+COGNITO_JWKS_REFRESH_INTERVAL = int(os.getenv("COGNITO_JWKS_REFRESH_INTERVAL", "60"))
+COGNITO_JWKS_TIMEOUT = float(os.getenv("COGNITO_JWKS_TIMEOUT", "5"))
+
+# Invalidations (reference data versions, entitlements, read-your-writes marks) reach the other processes only
+# through a shared cache. Set REDIS_URL (docker-compose runs one), or CACHE_BACKEND/CACHE_LOCATION for another
+# backend. The per-process LocMemCache fallback is only fit for a single process, gunicorn.conf.py refuses to start
+# several workers on it.
+REDIS_URL = os.getenv("REDIS_URL") or None
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND",
+            "django.core.cache.backends.redis.RedisCache"
+            if REDIS_URL
+            else "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", REDIS_URL or ""),
+    }
+}
+shared_cache = not CACHES["default"]["BACKEND"].endswith(".LocMemCache")
+# Upper bound on how long a coach's cached payment state can be stale, see `accounts.entitlements`. Payment changes
+# made by another process (a job worker, a second server) only invalidate it through a shared cache, without one the
+# bound is kept short.
+ENTITLEMENT_CACHE_TIMEOUT = int(os.getenv("ENTITLEMENT_CACHE_TIMEOUT", "3600" if shared_cache else "30"))
+# How often each process checks whether another one changed reference data, and how long a loaded table may be
+# served at most before it is read again, see `core.reference`.
+REFERENCE_CACHE_CHECK_INTERVAL = float(os.getenv("REFERENCE_CACHE_CHECK_INTERVAL", "5"))
+REFERENCE_CACHE_TIMEOUT = int(os.getenv("REFERENCE_CACHE_TIMEOUT", "3600"))
+# How long browsers and CDNs may reuse a catalog (sports, positions, ...) before revalidating its ETag.
+CATALOG_CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "300"))
+
+# Verified tokens are cached in-process until they expire, see `user_auth.token_cache`.
+JWT_TOKEN_CACHE_SIZE = int(os.getenv("JWT_TOKEN_CACHE_SIZE", "10000"))
+# Push notifications, see notifications/dispatch.py. "expo" sends through Expo's push service, "fake" only records the
+# messages in memory and is the default only when DEBUG is on.
+NOTIFICATION_PROVIDER = os.getenv("NOTIFICATION_PROVIDER", "fake" if DEBUG else "expo")
+NOTIFICATION_WORKERS = int(os.getenv("NOTIFICATION_WORKERS", "4"))
+NOTIFICATION_TIMEOUT = float(os.getenv("NOTIFICATION_TIMEOUT", "10"))
+NOTIFICATION_FAKE_LATENCY = float(os.getenv("NOTIFICATION_FAKE_LATENCY", "0"))
+EXPO_ACCESS_TOKEN = os.getenv("EXPO_ACCESS_TOKEN") or None
+
+# Background jobs, see jobs/queue.py and jobs/worker.py. A failed job is retried after JOB_RETRY_BASE_DELAY seconds,
+# doubling per attempt up to JOB_RETRY_MAX_DELAY. A job still running after JOB_TIMEOUT seconds is assumed lost with
+# its worker and queued again.
+JOB_RETRY_BASE_DELAY = float(os.getenv("JOB_RETRY_BASE_DELAY", "10"))
+JOB_RETRY_MAX_DELAY = float(os.getenv("JOB_RETRY_MAX_DELAY", "3600"))
+JOB_TIMEOUT = int(os.getenv("JOB_TIMEOUT", "900"))
+JOB_RETENTION_DAYS = int(os.getenv("JOB_RETENTION_DAYS", "7"))
+# Finished jobs of the last this many seconds go into the run and wait times of /metrics/jobs/
+JOB_METRICS_WINDOW = int(os.getenv("JOB_METRICS_WINDOW", "3600"))
+
+# `last_login` and `request_count` are buffered in memory and written this often, see `user_auth.activity`.
+ACTIVITY_FLUSH_INTERVAL = int(os.getenv("ACTIVITY_FLUSH_INTERVAL", "60"))
+ACTIVITY_MAX_PENDING = int(os.getenv("ACTIVITY_MAX_PENDING", "10000"))
 
 
 JWT_AUTH = {
     "JWT_PAYLOAD_GET_USERNAME_HANDLER": "user_auth.jwt.get_username_from_payload_handler",
     "JWT_DECODE_HANDLER": "user_auth.jwt.cognito_jwt_decode_handler",
-    "JWT_PUBLIC_KEY": rsa_keys,
     "JWT_ALGORITHM": "RS256",
     "JWT_AUDIENCE": COGNITO_AUDIENCE,
     "JWT_ISSUER": COGNITO_POOL_URL,
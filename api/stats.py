@@ -0,0 +1,9 @@
+"""Statistics helpers without Django, shared by `api.instrumentation` and the benchmarks that run without settings."""
+
+
+def percentiles(values, fractions=(0.5, 0.95, 0.99)):
+    """{"p50": value, ...} of `values` for each of `fractions`, empty when there are no values."""
+    values = sorted(values)
+    if not values:
+        return {}
+    return {f"p{round(f * 100)}": values[min(len(values) - 1, int(f * len(values)))] for f in fractions}
@@ -0,0 +1,57 @@
+from unittest import mock
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.db import OperationalError
+
+from api.database import connection_settings, default_connection_mode, replica_databases
+
+
+@pytest.mark.unit
+class TestConnectionSettings:
+    def test_direct(self):
+        assert connection_settings("direct") == {"CONN_MAX_AGE": 0}
+
+    def test_persistent(self):
+        assert connection_settings("persistent", conn_max_age=30) == {"CONN_MAX_AGE": 30, "CONN_HEALTH_CHECKS": True}
+
+    def test_pool(self):
+        settings = connection_settings("pool", pool_min_size=1, pool_max_size=4, pool_timeout=2)
+        assert settings["CONN_MAX_AGE"] == 0
+        assert settings["OPTIONS"]["pool"] == {"min_size": 1, "max_size": 4, "timeout": 2}
+
+    def test_pgbouncer(self):
+        settings = connection_settings("pgbouncer")
+        assert settings["DISABLE_SERVER_SIDE_CURSORS"] is True
+        assert settings["OPTIONS"] == {"prepare_threshold": None}
+        assert settings["CONN_HEALTH_CHECKS"] is True
+
+    def test_unknown_mode(self):
+        with pytest.raises(ImproperlyConfigured, match="Unknown DB_CONNECTION_MODE"):
+            connection_settings("pooled")
+
+    def test_default_mode_follows_worker_class(self):
+        assert default_connection_mode("gthread") == "persistent"
+        assert default_connection_mode("uvicorn") == "pool"
+
+    def test_replicas(self):
+        primary = {"NAME": "shownxt", "HOST": "db", "PORT": "5432", "CONN_MAX_AGE": 60}
+        replicas = replica_databases(primary, ["replica-a", " replica-b:6543", ""])
+        assert list(replicas) == ["replica_1", "replica_2"]
+        assert replicas["replica_1"] == {**primary, "HOST": "replica-a", "TEST": {"MIRROR": "default"}}
+        assert replicas["replica_2"]["PORT"] == "6543"
+        assert replica_databases(primary, [""]) == {}
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestDatabaseHealthCheck:
+    def test_ok(self, api_client):
+        response = api_client.get("/health/db/")
+        assert response.status_code == 200
+        assert response.json() == {"status": "ok"}
+
+    def test_unavailable(self, api_client):
+        with mock.patch("api.views.connection.cursor", side_effect=OperationalError("down")):
+            response = api_client.get("/health/db/")
+        assert response.status_code == 503
@@ -0,0 +1,78 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from api.instrumentation import MetricsRegistry, QueryBudgetExceeded, RequestMetrics, registry
+from sports.models import Sport
+
+
+@pytest.mark.unit
+class TestMetricsRegistry:
+    def test_rolling_percentiles(self):
+        stats = MetricsRegistry(window=100)
+        for i in range(200):
+            metrics = RequestMetrics()
+            metrics.queries = i % 10
+            stats.record("endpoint", total=i / 1000, metrics=metrics, over_budget=i % 50 == 0)
+        summary = stats.summary()["endpoint"]
+        assert summary["count"] == 200
+        assert summary["over_budget"] == 4
+        # only the last 100 samples (100-199 ms) are kept
+        assert summary["total_ms"]["p50"] == pytest.approx(150)
+        assert summary["total_ms"]["p99"] == pytest.approx(199)
+        assert summary["queries"]["p95"] == 9
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestRequestInstrumentation:
+    def test_server_timing_header(self, api_client, create_user):
+        user = create_user(email="user@example.com", password="pass")
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse("account-detail", kwargs={"pk": user.pk}))
+        assert response.status_code == status.HTTP_200_OK
+        timing = response["Server-Timing"]
+        for metric in ["db;dur=", "render;dur=", "app;dur=", "total;dur="]:
+            assert metric in timing
+        queries = registry.summary()["account-detail"]["queries"]["p50"]
+        assert f'desc="{queries} queries' in timing
+
+    def test_cache_fills_are_reported_but_not_budgeted(self, api_client, create_athlete):
+        athlete = create_athlete(email="athlete@example.com", password="pass", sport=Sport.objects.create(name="Golf"))
+        api_client.force_authenticate(user=athlete.user)
+        url = reverse("account-detail", kwargs={"pk": athlete.user.pk})
+        cold = api_client.get(url)["Server-Timing"]
+        warm = api_client.get(url)["Server-Timing"]
+        # The profile document and the sports table are built on the first request
+        assert "cache fill" in cold
+        assert "cache fill" not in warm
+        queries = registry.summary()["account-detail"]["queries"]
+        assert queries["p50"] == queries["p99"]
+
+    def test_budget_exceeded_fails_when_enforced(self, api_client, create_user, settings):
+        settings.QUERY_BUDGETS = {"account-detail": 1}
+        user = create_user(email="user@example.com", password="pass")
+        api_client.force_authenticate(user=user)
+        with pytest.raises(QueryBudgetExceeded, match="account-detail ran .* queries, its budget is 1"):
+            api_client.get(reverse("account-detail", kwargs={"pk": user.pk}))
+
+    def test_budget_exceeded_is_logged_otherwise(self, api_client, create_user, settings, caplog):
+        settings.QUERY_BUDGETS = {"account-detail": 1}
+        settings.QUERY_BUDGET_ENFORCE = False
+        user = create_user(email="user@example.com", password="pass")
+        api_client.force_authenticate(user=user)
+        response = api_client.get(reverse("account-detail", kwargs={"pk": user.pk}))
+        assert response.status_code == status.HTTP_200_OK
+        assert "its budget is 1" in caplog.text
+        assert registry.summary()["account-detail"]["over_budget"] == 1
+
+    def test_metrics_endpoint_is_staff_only(self, api_client, create_user):
+        user = create_user(email="user@example.com", password="pass")
+        api_client.force_authenticate(user=user)
+        assert api_client.get(reverse("request-metrics")).status_code == status.HTTP_403_FORBIDDEN
+
+        staff = create_user(email="staff@example.com", password="pass", is_staff=True)
+        api_client.force_authenticate(user=staff)
+        response = api_client.get(reverse("request-metrics"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["request-metrics"]["count"] == 1
@@ -0,0 +1,91 @@
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory
+
+from accounts.models import Account
+from api.replicas import ReplicaRouter, ReplicaRoutingMiddleware, identify, primary, sticky_key
+
+router = ReplicaRouter()
+
+
+@pytest.fixture(autouse=True)
+def replicas(settings):
+    settings.DATABASE_REPLICAS = ["replica_1"]
+    settings.REPLICA_STICKY_SECONDS = 10
+    cache.clear()
+
+
+def serve(method, view=lambda request: None, user=None):
+    """Run `view` inside the middleware for a `method` request, returning where it read from."""
+    request = getattr(RequestFactory(), method.lower())("/")
+    request.user = user or AnonymousUser()
+    reads = []
+
+    def get_response(request):
+        view(request)
+        reads.append(router.db_for_read(Account))
+        return None
+
+    ReplicaRoutingMiddleware(get_response)(request)
+    return reads[0]
+
+
+def write(request):
+    router.db_for_write(Account)
+
+
+@pytest.mark.unit
+class TestReplicaRouter:
+    def test_safe_requests_read_from_replicas(self):
+        assert serve("GET") == "replica_1"
+        assert serve("HEAD") == "replica_1"
+
+    def test_unsafe_requests_read_from_primary(self):
+        assert serve("POST") is None
+        assert serve("PUT") is None
+
+    def test_outside_requests_read_from_primary(self):
+        assert router.db_for_read(Account) is None
+
+    def test_without_replicas(self, settings):
+        settings.DATABASE_REPLICAS = []
+        assert serve("GET") is None
+
+    def test_request_reads_from_primary_after_writing(self):
+        assert serve("GET", view=write) is None
+
+    def test_primary_block(self):
+        def view(request):
+            with primary():
+                assert router.db_for_read(Account) is None
+
+        assert serve("GET", view=view) == "replica_1"
+
+    def test_writes_are_sticky(self):
+        user = SimpleNamespace(pk=7, is_authenticated=True)
+        serve("PUT", view=write, user=user)
+        assert cache.get(sticky_key(7)) is True
+
+        assert serve("GET", view=lambda request: identify(7)) is None
+        assert serve("GET", view=lambda request: identify(8)) == "replica_1"
+
+    @pytest.mark.django_db
+    def test_reads_in_transactions_use_primary(self):
+        # The test runs inside a transaction
+        assert serve("GET") is None
+
+    def test_requests_without_writes_are_not_sticky(self):
+        serve("POST", view=lambda request: identify(7))
+        assert cache.get(sticky_key(7)) is None
+
+    def test_writes_go_to_primary(self):
+        replica_row = Account(pk=1)
+        replica_row._state.db = "replica_1"
+        assert router.db_for_write(Account, instance=replica_row) == "default"
+
+    def test_replicas_are_not_migrated(self):
+        assert router.allow_migrate("replica_1", "accounts") is False
+        assert router.allow_migrate("default", "accounts") is None
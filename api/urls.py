@@ -23,7 +23,8 @@ from drf_spectacular.views import (
     SpectacularSwaggerView,
 )
 
-from api.views import health_check
+from api.views import RequestMetricsView, database_health_check, health_check
+from jobs.views import JobMetricsView
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -33,5 +34,11 @@ urlpatterns = [
     path("accounts/", include("accounts.urls")),
     path("openings/", include("openings.urls")),
     path("auth/", include("user_auth.urls")),
+    path("sports/", include("sports.urls")),
+    path("academics/", include("academics.urls")),
+    path("locations/", include("core.urls")),
     path("health/", health_check),
+    path("health/db/", database_health_check, name="health-db"),
+    path("metrics/", RequestMetricsView.as_view(), name="request-metrics"),
+    path("metrics/jobs/", JobMetricsView.as_view(), name="job-metrics"),
 ]
@@ -1,5 +1,73 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import DatabaseError, connection
 from django.http import JsonResponse
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.instrumentation import registry
 
 
 def health_check(request):
     return JsonResponse({"status": "ok"})
+
+
+def database_health_check(request):
+    """One round trip to the database, for readiness probes and for timing the connection modes."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except DatabaseError:
+        return JsonResponse({"status": "unavailable"}, status=503)
+    return JsonResponse({"status": "ok"})
+
+
+class AsyncAPIView(APIView):
+    """
+    APIView whose handlers are coroutines.
+
+    DRF's dispatch is synchronous, so this reimplements it as a coroutine: authentication, permission and throttle
+    checks (which may hit the database) run through `sync_to_async`, then the handler is awaited. Django serves the
+    view natively under ASGI and through `async_to_sync` under WSGI.
+
+    Under the default gthread worker the request still holds its worker thread while the handler awaits Cognito, so
+    only the uvicorn worker frees it. Even there, the sync-only middleware (`RequestInstrumentationMiddleware`,
+    `ReplicaRoutingMiddleware`) makes Django hop to a thread and back once per request.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class RequestMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        responses={
+            200: OpenApiResponse(description="Rolling latency, DB time and query count percentiles per endpoint")
+        }
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(registry.summary())
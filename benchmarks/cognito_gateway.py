@@ -0,0 +1,84 @@
+"""
+Offline benchmark of Cognito calls, blocking worker threads vs the async gateway.
+
+    python -m benchmarks.cognito_gateway --requests 200 --latency 0.1 --threads 2 --pool 20
+
+"blocking" reproduces the previous setup, where every login held one of the server's `--threads` for the whole
+round trip. "gateway" sends the same logins through `user_auth.cognito.CognitoGateway`, which keeps up to `--pool`
+calls in flight from a single event loop. Both run against `FakeCognitoClient` with `--latency` seconds per call.
+"""
+
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from api.stats import percentiles
+from user_auth.cognito import CognitoGateway
+from user_auth.fake_cognito import FakeCognitoClient
+
+EMAIL = "bench@example.com"
+PASSWORD = "password"
+
+
+def fake_client(latency):
+    client = FakeCognitoClient(latency=latency)
+    client.users[EMAIL] = {"password": PASSWORD, "attributes": {}, "confirmed": True}
+    return client
+
+
+def run_blocking(requests, latency, threads):
+    client = fake_client(latency)
+
+    def login():
+        client.initiate_auth(
+            ClientId="bench", AuthFlow="USER_PASSWORD_AUTH", AuthParameters={"USERNAME": EMAIL, "PASSWORD": PASSWORD}
+        )
+        return time.perf_counter()
+
+    # All requests arrive at once, latency runs until each one is answered so queueing for a thread counts.
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        finished = [future.result() for future in [pool.submit(login) for _ in range(requests)]]
+    return time.perf_counter() - started, [at - started for at in finished]
+
+
+def run_gateway(requests, latency, pool):
+    gateway = CognitoGateway(fake_client(latency), client_id="bench", max_workers=pool)
+
+    async def login():
+        await gateway.login(EMAIL, PASSWORD)
+        return time.perf_counter()
+
+    async def run():
+        return await asyncio.gather(*[login() for _ in range(requests)])
+
+    started = time.perf_counter()
+    finished = asyncio.run(run())
+    elapsed = time.perf_counter() - started
+    gateway.shutdown()
+    return elapsed, [at - started for at in finished]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.1, help="simulated Cognito round trip in seconds")
+    parser.add_argument("--threads", type=int, default=2, help="worker threads in the blocking setup")
+    parser.add_argument("--pool", type=int, default=20, help="gateway pool size")
+    args = parser.parse_args(argv)
+
+    print(f"{'mode':<10} {'seconds':>8} {'calls/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, (elapsed, latencies) in [
+        ("blocking", run_blocking(args.requests, args.latency, args.threads)),
+        ("gateway", run_gateway(args.requests, args.latency, args.pool)),
+    ]:
+        summary = percentiles(latencies, (0.5, 0.99))
+        print(
+            f"{name:<10} {elapsed:>8.2f} {len(latencies) / elapsed:>9.1f} "
+            f"{summary['p50'] * 1000:>8.1f} {summary['p99'] * 1000:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare two `benchmarks.run` result files and exit non-zero if the second one regressed.
+
+    python -m benchmarks.compare benchmarks/results/base.json benchmarks/results/head.json --threshold 0.2
+
+A benchmark regresses when its p50 grows by more than `--threshold` (a fraction) or it runs more queries.
+"""
+
+import argparse
+import json
+import sys
+
+
+def compare(base, head, threshold):
+    rows, regressions = [], []
+    for name, after in head["results"].items():
+        before = base["results"].get(name)
+        if before is None:
+            rows.append((name, None, after["p50_ms"], None, None, after["queries"], ""))
+            continue
+        change = (after["p50_ms"] - before["p50_ms"]) / before["p50_ms"] if before["p50_ms"] else 0.0
+        regressed = change > threshold or after["queries"] > before["queries"]
+        if regressed:
+            regressions.append(name)
+        rows.append(
+            (
+                name,
+                before["p50_ms"],
+                after["p50_ms"],
+                change,
+                before["queries"],
+                after["queries"],
+                "REGRESSED" * regressed,
+            )
+        )
+    return rows, regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args(argv)
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.head) as f:
+        head = json.load(f)
+
+    rows, regressions = compare(base, head, args.threshold)
+    print(
+        f"{base['meta']['commit']} -> {head['meta']['commit']} ({head['meta']['database']}, scale {head['meta']['scale']})"
+    )
+    print(f"{'benchmark':<20} {'base p50':>10} {'head p50':>10} {'change':>8} {'queries':>9}")
+    for name, before, after, change, queries_before, queries_after, flag in rows:
+        before_text = f"{before:.2f}" if before is not None else "-"
+        change_text = f"{change:+.0%}" if change is not None else "new"
+        queries_text = f"{queries_before}->{queries_after}" if queries_before is not None else str(queries_after)
+        print(f"{name:<20} {before_text:>10} {after:>10.2f} {change_text:>8} {queries_text:>9} {flag}")
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
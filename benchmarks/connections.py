@@ -0,0 +1,47 @@
+"""
+Per-request latency of each database connection mode (see api/database.py) against the docker-compose Postgres.
+
+    docker compose --profile pgbouncer up -d
+    docker compose exec web python -m benchmarks.connections -c 16 -d 15
+
+Every mode gets its own gunicorn, loaded at `/health/db/`: one `SELECT 1` per request, so the difference between the
+modes is what getting a connection costs. Pass --path (and -H for the Authorization header) to load a real endpoint
+instead, and --modes to leave out pgbouncer when it is not running.
+"""
+
+import argparse
+
+from api.database import CONNECTION_MODES
+from benchmarks.loadtest import parse_headers, print_results, run_profile
+
+
+def mode_profiles(worker_class, pgbouncer_host, pgbouncer_port):
+    profiles = {mode: {"GUNICORN_WORKER_CLASS": worker_class, "DB_CONNECTION_MODE": mode} for mode in CONNECTION_MODES}
+    profiles["pgbouncer"].update(POSTGRES_HOST=pgbouncer_host, POSTGRES_PORT=str(pgbouncer_port))
+    return profiles
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("-d", "--duration", type=float, default=15, help="seconds per mode")
+    parser.add_argument("-H", "--header", action="append", default=[], help="extra request header, 'Name: value'")
+    parser.add_argument("--modes", nargs="+", default=CONNECTION_MODES, choices=CONNECTION_MODES)
+    parser.add_argument("--path", default="/health/db/")
+    parser.add_argument("--port", type=int, default=8765, help="port gunicorn binds")
+    parser.add_argument("--worker-class", default="gthread", choices=["gthread", "uvicorn"])
+    parser.add_argument("--pgbouncer-host", default="pgbouncer")
+    parser.add_argument("--pgbouncer-port", type=int, default=5432)
+    args = parser.parse_args(argv)
+
+    profiles = mode_profiles(args.worker_class, args.pgbouncer_host, args.pgbouncer_port)
+    headers = parse_headers(args.header)
+    rows = [
+        (mode, run_profile(mode, args.port, args.path, args.concurrency, args.duration, headers, profiles))
+        for mode in args.modes
+    ]
+    print_results(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+Benchmark dataset: the `core.datagen` graph under its own email domain, so the benchmarks can tell whether the
+database already holds it at the requested scale.
+"""
+
+from accounts.models import Athlete
+from core.datagen import Generator, sizes_for
+
+EMAIL_DOMAIN = "bench.example"
+
+
+def is_seeded(scale):
+    return Athlete.objects.filter(user__email__endswith=f"@{EMAIL_DOMAIN}").count() == sizes_for(scale)["athletes"]
+
+
+def seed(scale=1.0, seed=42, batch_size=5000, log=print):
+    """Create the dataset at `scale` and return the number of rows written per model."""
+    return Generator(scale=scale, seed=seed, batch_size=batch_size, email_domain=EMAIL_DOMAIN, log=log).run()
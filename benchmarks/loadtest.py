@@ -0,0 +1,170 @@
+"""
+Small closed-loop load generator for comparing server profiles locally.
+
+Hit a running server:
+
+    python -m benchmarks.loadtest --url http://localhost:8000/health/ -c 32 -d 20
+
+Or start gunicorn once per profile in gunicorn.conf.py and compare them side by side:
+
+    python -m benchmarks.loadtest --compare --path /accounts/search/?name=smith -H "Authorization: Bearer ..."
+
+The multi-worker profiles need the shared cache, run them where `REDIS_URL` is set (the docker-compose web service).
+
+Each of the `-c` clients keeps one keep-alive connection open and sends its next request as soon as the previous
+response has been read, so the reported throughput is what the server sustains at that concurrency.
+"""
+
+import argparse
+import http.client
+import os
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from api.stats import percentiles
+
+PROFILES = {
+    # What Dockerfile.cloud ran before gunicorn.conf.py existed
+    "baseline": {"GUNICORN_WORKER_CLASS": "gthread", "GUNICORN_WORKERS": "1", "GUNICORN_THREADS": "2"},
+    "gthread": {"GUNICORN_WORKER_CLASS": "gthread"},
+    "uvicorn": {"GUNICORN_WORKER_CLASS": "uvicorn"},
+}
+
+
+class Client(threading.Thread):
+    def __init__(self, url, headers, deadline):
+        super().__init__(daemon=True)
+        parts = urlsplit(url)
+        self.connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        self.netloc = parts.netloc
+        self.path = parts.path + (f"?{parts.query}" if parts.query else "") or "/"
+        self.headers = headers
+        self.deadline = deadline
+        self.latencies = []
+        self.errors = 0
+
+    def run(self):
+        connection = None
+        while time.monotonic() < self.deadline:
+            if connection is None:
+                connection = self.connection_class(self.netloc, timeout=30)
+            started = time.perf_counter()
+            try:
+                connection.request("GET", self.path, headers=self.headers)
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                self.errors += 1
+                connection.close()
+                connection = None
+                continue
+            if response.status >= 400:
+                self.errors += 1
+            else:
+                self.latencies.append(time.perf_counter() - started)
+            if response.will_close:
+                connection.close()
+                connection = None
+        if connection is not None:
+            connection.close()
+
+
+def run_load(url, concurrency, duration, headers):
+    """Run `concurrency` clients against `url` for `duration` seconds and summarise the results."""
+    deadline = time.monotonic() + duration
+    clients = [Client(url, headers, deadline) for _ in range(concurrency)]
+    started = time.monotonic()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.monotonic() - started
+
+    latencies = [latency for client in clients for latency in client.latencies]
+    summary = percentiles(latencies)
+    return {
+        "requests": len(latencies),
+        "errors": sum(client.errors for client in clients),
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        **{f"{name}_ms": summary.get(name, 0.0) * 1000 for name in ["p50", "p95", "p99"]},
+    }
+
+
+def wait_until_up(url, timeout=30):
+    parts = urlsplit(url)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        connection = http.client.HTTPConnection(parts.netloc, timeout=1)
+        try:
+            connection.request("GET", "/health/")
+            connection.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.25)
+        finally:
+            connection.close()
+    raise RuntimeError(f"Server at {parts.netloc} did not come up within {timeout}s")
+
+
+def run_profile(name, port, path, concurrency, duration, headers, profiles=PROFILES):
+    env = {**os.environ, **profiles[name], "PORT": str(port)}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "--access-logfile", "/dev/null"],
+        env=env,
+    )
+    url = f"http://127.0.0.1:{port}{path}"
+    try:
+        wait_until_up(url)
+        # One short warm-up round so lazy imports and connections don't count against the profile
+        run_load(url, concurrency, 1, headers)
+        return run_load(url, concurrency, duration, headers)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def print_results(rows):
+    print(f"{'profile':<12} {'requests':>9} {'errors':>7} {'rps':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for name, result in rows:
+        print(
+            f"{name:<12} {result['requests']:>9} {result['errors']:>7} {result['rps']:>9.1f} "
+            f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['p99_ms']:>8.1f}"
+        )
+
+
+def parse_headers(values):
+    headers = {}
+    for value in values:
+        name, _, header = value.partition(":")
+        headers[name.strip()] = header.strip()
+    return headers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://127.0.0.1:8000/health/", help="URL to load when not comparing")
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("-d", "--duration", type=float, default=15, help="seconds per run")
+    parser.add_argument("-H", "--header", action="append", default=[], help="extra request header, 'Name: value'")
+    parser.add_argument("--compare", action="store_true", help="start gunicorn once per profile and compare them")
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    parser.add_argument("--path", default="/health/", help="path to load in --compare mode")
+    parser.add_argument("--port", type=int, default=8765, help="port gunicorn binds in --compare mode")
+    args = parser.parse_args(argv)
+    headers = parse_headers(args.header)
+
+    if args.compare:
+        rows = [
+            (name, run_profile(name, args.port, args.path, args.concurrency, args.duration, headers))
+            for name in args.profiles
+        ]
+    else:
+        rows = [("server", run_load(args.url, args.concurrency, args.duration, headers))]
+    print_results(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Seed the benchmark dataset if needed, time the key endpoints and the JWT decode path, and write the results as
+JSON. Against the docker-compose Postgres:
+
+    docker compose exec web python -m benchmarks.run --scale 1
+
+or against a local SQLite file, with no other setup:
+
+    python -m benchmarks.run --settings benchmarks.sqlite_settings --scale 0.05
+
+Compare two result files with `python -m benchmarks.compare`.
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--settings", default=os.getenv("DJANGO_SETTINGS_MODULE", "api.settings"))
+    parser.add_argument("--scale", type=float, default=1.0, help="dataset size, 1 = 100k athletes")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--only", nargs="+", help="benchmarks to run, all by default")
+    parser.add_argument("--reseed", action="store_true", help="flush the database and seed it again")
+    parser.add_argument("--output", type=Path, help="result file, default benchmarks/results/<commit>-<db>.json")
+    args = parser.parse_args(argv)
+
+    os.environ["DJANGO_SETTINGS_MODULE"] = args.settings
+    import django
+
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    from accounts.models import Athlete
+    from benchmarks import dataset
+    from benchmarks.suite import run_benchmarks
+
+    setup_test_environment()
+    call_command("migrate", interactive=False, verbosity=0)
+    if args.reseed:
+        call_command("flush", interactive=False, verbosity=0)
+        call_command("migrate", interactive=False, verbosity=0)
+    if not dataset.is_seeded(args.scale):
+        if Athlete.objects.exists():
+            sys.exit(
+                "The database already holds other data, rerun with --reseed to flush it and seed the benchmark set"
+            )
+        dataset.seed(scale=args.scale, seed=args.seed)
+
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "database": connection.vendor,
+            "scale": args.scale,
+            "seed": args.seed,
+            "python": platform.python_version(),
+        },
+        "results": run_benchmarks(args.only, iterations=args.iterations, warmup=args.warmup, seed=args.seed),
+    }
+    output = args.output or RESULTS_DIR / f"{results['meta']['commit']}-{connection.vendor}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""Settings for running the benchmarks against a local SQLite file instead of Postgres."""
+
+from api.settings import *  # noqa: F403
+from api.settings import BASE_DIR
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "benchmarks" / "bench.sqlite3",
+    }
+}
+# A second alias onto the same file stands in for a read replica, see api/replicas.py
+DATABASES["replica_1"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+DATABASE_REPLICAS = ["replica_1"]
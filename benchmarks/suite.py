@@ -0,0 +1,193 @@
+"""
+Endpoint and JWT benchmarks over the `benchmarks.dataset` data. Requests go through DRF's test client in process,
+so the timings cover URL routing, middleware, the view, serialization and the database, but not the network.
+"""
+
+import json
+import random
+import statistics
+import time
+
+import jwt
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from jwt.algorithms import RSAAlgorithm
+from rest_framework.test import APIClient
+
+from accounts.models import Athlete, Coach, Payment
+from api.stats import percentiles
+from benchmarks.dataset import EMAIL_DOMAIN
+from openings.models import Applicant, Opening
+from user_auth.jwks import get_key_store
+from user_auth.jwt import cognito_jwt_decode_handler
+from user_auth.token_cache import token_cache
+
+BENCHMARKS = {}
+SAMPLE_SIZE = 200
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+class Context:
+    """Accounts and ids the benchmarks draw from, picked once and deterministically."""
+
+    def __init__(self, seed=42):
+        self.rng = random.Random(seed)
+        coaches = Coach.objects.filter(user__email__endswith=f"@{EMAIL_DOMAIN}").select_related("user")
+        # A coach whose university pays, so the endpoints answer with full profiles
+        paying = Payment.objects.filter(plan="university").values("university_id")
+        self.coach = coaches.filter(university_id__in=paying).order_by("id").first()
+        athletes = Athlete.objects.filter(user__email__endswith=f"@{EMAIL_DOMAIN}")
+        self.athlete = athletes.select_related("user").order_by("id").first()
+        athlete_ids = list(athletes.values_list("id", flat=True))
+        self.athlete_ids = self.rng.sample(athlete_ids, min(SAMPLE_SIZE, len(athlete_ids)))
+        self.athlete_user_ids = list(
+            Athlete.objects.filter(id__in=self.athlete_ids).order_by("id").values_list("user_id", flat=True)
+        )
+        self.opening_ids = list(Opening.objects.order_by("-id").values_list("id", flat=True)[: SAMPLE_SIZE * 2])
+        self.sport_ids = list(Opening.objects.order_by().values_list("sport_id", flat=True).distinct())
+
+    def client(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        return client
+
+
+@benchmark("account_retrieve")
+def account_retrieve(ctx):
+    client = ctx.client(ctx.coach.user)
+    urls = [reverse("account-detail", kwargs={"pk": pk}) for pk in ctx.athlete_user_ids]
+    return lambda i: client.get(urls[i % len(urls)])
+
+
+@benchmark("account_search")
+def account_search(ctx):
+    client = ctx.client(ctx.coach.user)
+    url = reverse("account-search")
+    queries = [{"name": "Smi"}, {"name": "Garcia"}, {"name": "Lee King"}, {"name": "ava 2027"}]
+    return lambda i: client.get(url, queries[i % len(queries)])
+
+
+@benchmark("openings_list")
+def openings_list(ctx):
+    client = ctx.client(ctx.athlete.user)
+    url = reverse("opening")
+    filters = [{}, {"sport": ctx.sport_ids[0]}, {"gpa": 3.2, "sat": 1250}, {"grad_year": 2027, "min_budget": 20000}]
+    return lambda i: client.get(url, filters[i % len(filters)])
+
+
+@benchmark("saved_accounts")
+def saved_accounts(ctx):
+    client = ctx.client(ctx.coach.user)
+    url = reverse("account-saved-list")
+    return lambda i: client.get(url)
+
+
+@benchmark("apply")
+def apply(ctx):
+    athlete_ids = ctx.athlete_ids[:20]
+    applied = set(
+        Applicant.objects.filter(athlete_id__in=athlete_ids, opening_id__in=ctx.opening_ids).values_list(
+            "athlete_id", "opening_id"
+        )
+    )
+    pairs = [(a, o) for a in athlete_ids for o in ctx.opening_ids[:20] if (a, o) not in applied]
+    users = {athlete.id: athlete.user for athlete in Athlete.objects.filter(id__in=athlete_ids).select_related("user")}
+    clients = {athlete_id: ctx.client(user) for athlete_id, user in users.items()}
+
+    def run(i):
+        athlete_id, opening_id = pairs[i % len(pairs)]
+        # Rolled back so every round applies to an opening the athlete has not applied to yet
+        with transaction.atomic():
+            response = clients[athlete_id].post(reverse("opening-detail", kwargs={"id": opening_id}))
+            transaction.set_rollback(True)
+        return response
+
+    return run
+
+
+def signed_tokens(users):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = RSAAlgorithm.to_jwk(private_key.public_key())
+    get_key_store().set_jwks({"keys": [{**json.loads(jwk), "kid": "bench-key", "alg": "RS256"}]})
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+    now = int(time.time())
+    return [
+        jwt.encode(
+            {
+                "email": user.email,
+                "custom:account_type": "athlete",
+                "aud": settings.COGNITO_AUDIENCE,
+                "iss": settings.COGNITO_POOL_URL,
+                "iat": now,
+                "exp": now + 3600,
+            },
+            pem,
+            algorithm="RS256",
+            headers={"kid": "bench-key"},
+        ).decode()
+        for user in users
+    ]
+
+
+@benchmark("jwt_decode_cold")
+def jwt_decode_cold(ctx):
+    tokens = signed_tokens(get_user_model().objects.filter(id__in=ctx.athlete_user_ids[:50]))
+
+    def run(i):
+        token_cache.clear()
+        return cognito_jwt_decode_handler(tokens[i % len(tokens)])
+
+    return run
+
+
+@benchmark("jwt_decode_warm")
+def jwt_decode_warm(ctx):
+    tokens = signed_tokens(get_user_model().objects.filter(id__in=ctx.athlete_user_ids[:50]))
+    for token in tokens:
+        cognito_jwt_decode_handler(token)
+    return lambda i: cognito_jwt_decode_handler(tokens[i % len(tokens)])
+
+
+def run_benchmarks(names=None, iterations=50, warmup=5, seed=42, log=print):
+    """Run the named benchmarks (all by default) and return {name: timing summary}."""
+    ctx = Context(seed=seed)
+    results = {}
+    for name in names or BENCHMARKS:
+        run = BENCHMARKS[name](ctx)
+        for i in range(warmup):
+            run(i)
+        timings, queries = [], []
+        for i in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = run(i)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured))
+            status_code = getattr(response, "status_code", 200)
+            if status_code >= 400:
+                raise RuntimeError(f"{name} answered {status_code}: {getattr(response, 'data', '')}")
+        summary = percentiles(timings)
+        results[name] = {
+            "iterations": iterations,
+            "mean_ms": round(statistics.fmean(timings), 3),
+            "p50_ms": round(summary["p50"], 3),
+            "p95_ms": round(summary["p95"], 3),
+            "p99_ms": round(summary["p99"], 3),
+            "queries": round(statistics.median(queries)),
+        }
+        log(f"{name:<20} p50 {results[name]['p50_ms']:>9.2f} ms  queries {results[name]['queries']}")
+    return results
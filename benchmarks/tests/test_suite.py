@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from benchmarks import dataset
+from benchmarks.compare import compare
+from benchmarks.suite import BENCHMARKS, run_benchmarks
+from core.datagen import sizes_for
+
+SCALE = 0.0005
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestBenchmarkSuite:
+    def test_every_benchmark_runs_on_a_tiny_dataset(self):
+        counts = dataset.seed(scale=SCALE, log=lambda message: None)
+
+        assert dataset.is_seeded(SCALE)
+        assert counts["Athlete"] == sizes_for(SCALE)["athletes"]
+
+        results = run_benchmarks(iterations=3, warmup=1, log=lambda message: None)
+
+        assert set(results) == set(BENCHMARKS)
+        for result in results.values():
+            assert result["iterations"] == 3
+            assert 0 < result["p50_ms"] <= result["p99_ms"]
+        assert results["jwt_decode_warm"]["queries"] <= 1
+        json.dumps(results)
+
+
+@pytest.mark.unit
+class TestCompare:
+    def result(self, p50_ms, queries):
+        return {"p50_ms": p50_ms, "queries": queries}
+
+    def test_flags_slower_and_chattier_benchmarks(self):
+        base = {"results": {"a": self.result(10, 3), "b": self.result(10, 3), "c": self.result(10, 3)}}
+        head = {"results": {"a": self.result(11, 3), "b": self.result(13, 3), "c": self.result(9, 4)}}
+
+        rows, regressions = compare(base, head, threshold=0.2)
+
+        assert regressions == ["b", "c"]
+        assert [row[0] for row in rows] == ["a", "b", "c"]
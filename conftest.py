@@ -1,12 +1,60 @@
+import json
+import time
 from typing import Optional
 
+import jwt
 import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from jwt.algorithms import RSAAlgorithm
 from rest_framework.test import APIClient
 
 User = get_user_model()
 
 
+@pytest.fixture(scope="session")
+def django_db_setup(django_db_setup, django_db_blocker):
+    """
+    Install `pg_trgm`, which `--nomigrations` skips along with the migration creating it. A server without the contrib
+    extensions keeps working, search just ranks without trigram similarity there.
+    """
+    from django.db import DatabaseError, connection
+
+    with django_db_blocker.unblock(), connection.cursor() as cursor:
+        try:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        except DatabaseError:
+            pass
+
+
+@pytest.fixture(autouse=True)
+def clear_process_caches():
+    """In-process caches outlive the per-test database rollback, start every test with them empty."""
+    from django.core.cache import cache
+
+    from api.instrumentation import registry
+    from core.reference import reference
+    from user_auth.activity import tracker
+    from user_auth.token_cache import token_cache
+
+    cache.clear()
+    registry.clear()
+    reference.clear()
+    token_cache.clear()
+    tracker.clear()
+    yield
+    # Activity recorded by the test would otherwise be flushed when the process exits, after the test database is gone
+    tracker.clear()
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    """Fail any request that runs more queries than its endpoint's `QUERY_BUDGETS` entry allows."""
+    settings.QUERY_BUDGET_ENFORCE = True
+
+
 @pytest.fixture
 def api_client():
     """API client for testing."""
@@ -65,3 +113,61 @@ def create_coach(create_user):
         return coach
 
     return _create_coach
+
+
+@pytest.fixture(scope="session")
+def cognito_signing_key():
+    """RSA key pair standing in for the Cognito user pool, its public half is seeded into the JWKS key store."""
+    from user_auth.jwks import get_key_store
+
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": "test-key", "alg": "RS256", "use": "sig"})
+    get_key_store().set_jwks({"keys": [jwk]})
+    return private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()
+    )
+
+
+@pytest.fixture
+def cognito_token(cognito_signing_key):
+    def _cognito_token(email: str, account_type: str = "athlete", expires_in: int = 3600, **claims):
+        now = int(time.time())
+        payload = {
+            "email": email,
+            "custom:account_type": account_type,
+            "aud": settings.COGNITO_AUDIENCE,
+            "iss": settings.COGNITO_POOL_URL,
+            "iat": now,
+            "exp": now + expires_in,
+            **claims,
+        }
+        return jwt.encode(payload, cognito_signing_key, algorithm="RS256", headers={"kid": "test-key"}).decode()
+
+    return _cognito_token
+
+
+@pytest.fixture(autouse=True)
+def fake_push():
+    """Send notifications inline through a fake provider, returns the provider."""
+    from notifications.dispatch import Dispatcher, set_dispatcher
+    from notifications.providers import FakeProvider
+
+    provider = FakeProvider(max_batch_size=2)
+    previous = set_dispatcher(Dispatcher(provider, max_workers=0))
+    yield provider
+    set_dispatcher(previous)
+
+
+@pytest.fixture
+def fake_cognito():
+    """Route `user_auth` views to an in-memory Cognito for the duration of the test, returns the fake client."""
+    from user_auth.cognito import CognitoGateway, set_gateway
+    from user_auth.fake_cognito import FakeCognitoClient
+
+    client = FakeCognitoClient()
+    gateway = CognitoGateway(client, client_id="test-client", max_workers=4)
+    previous = set_gateway(gateway)
+    yield client
+    set_gateway(previous)
+    gateway.shutdown()
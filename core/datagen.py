@@ -0,0 +1,428 @@
+"""
+Synthetic data for load and scale testing.
+
+`Generator` builds a connected graph across every app (countries, states and addresses; high schools, universities
+and exams; sports, clubs and leagues; athletes with their statistics, exams, clubs and leagues; coaches, payments,
+saved accounts and notification tokens; openings with positions, exam requirements and applicants; posts and
+referral sign ups). At `scale=1` that is about 1.6 million rows, sized from `SIZES`.
+
+Rows are streamed through `RowWriter`: it hands out primary keys itself, so the generator only ever keeps id ranges
+and a few small lookup lists in memory, and writes each table in batches with COPY on Postgres and multi-row
+INSERTs elsewhere. Model signals do not fire: the reference data cache is invalidated once at the end, and
+`rebuild_eligibility` (or `generate_data --eligibility`) fills the match table afterwards. The same seed and
+scale on an empty database always produce the same rows, down to uuids and timestamps.
+"""
+
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import DateField, Max
+
+from academics.models import AthleteExam, Exam, Highschool, University, UniversityEmailDomain
+from accounts.models import Athlete, Coach, NotificationToken, Payment, SavedAccount
+from core.models import Address, Country, State
+from core.reference import TABLES, invalidate_on_commit
+from openings.models import Applicant, Opening, OpeningExamScore
+from posts.models import Post
+from referrals.models import SignUp
+from sports.models import Club, League, PersonalStatistic, Position, Sport, SportStatistic
+
+SIZES = {
+    "states": 50,
+    "universities": 500,
+    "highschools": 5000,
+    "clubs": 2000,
+    "leagues": 500,
+    "exams": 40,
+    "athletes": 100_000,
+    "coaches": 5000,
+    "openings": 20_000,
+    "signups": 20_000,
+}
+APPLICANTS_PER_OPENING = 5
+SAVED_PER_COACH = 20
+POSTS_PER_ATHLETE = 0.5
+COMMITTED_ATHLETES = 0.1
+PAYING_UNIVERSITIES = 0.25
+REFERRED_SIGNUPS = 0.6
+
+FIRST_NAMES = "Ava Liam Maya Noah Zoe Ethan Lena Omar Sofia Lucas Chloe Mateo Nora Elijah Aria Kai Isla Leo".split()
+LAST_NAMES = (
+    "Smith Johnson Garcia Brown Lee Martinez Davis Lopez Wilson Anderson Thomas Moore Jackson Martin Nguyen Perez "
+    "Clark Lewis Walker Hall Young King Wright Scott Green Baker Adams Nelson Hill Campbell Mitchell Roberts Carter"
+).split()
+SEASONS = ["spring", "summer", "fall", "winter"]
+LEAGUE_LEVELS = ["youth", "highschool", "club", "college"]
+DIVISIONS = ["NCAA Division I", "NCAA Division II", "NCAA Division III", "NAIA", "NJCAA"]
+APPLICANT_STATUSES = ["pending", "pending", "reviewed", "accepted", "rejected"]
+DEFAULT_POSITIONS = ["GK", "CB", "CM", "ST"]
+
+# Timestamps are spread over the year before this instant rather than around `now()`, to keep runs reproducible.
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc)
+# Paid plans run until long after it so they stay active whenever the data is used
+PERIOD_END = EPOCH + timedelta(days=100 * 365)
+
+
+def sizes_for(scale):
+    return {name: max(1, int(size * scale)) for name, size in SIZES.items()}
+
+
+class RowWriter:
+    """
+    Buffered writer assigning primary keys and flushing full batches per table.
+
+    Keys count up from each table's current maximum, so rows can reference each other before they are written.
+    Django creates foreign keys as deferred constraints, so within the surrounding transaction the tables may be
+    flushed in any order. `finish` flushes what is left and moves the Postgres sequences past the new keys.
+    """
+
+    def __init__(self, batch_size=5000, use_copy=None):
+        self.batch_size = batch_size
+        self.use_copy = connection.vendor == "postgresql" if use_copy is None else use_copy
+        self.counts = {}
+        self._next_pk = {}
+        self._buffers = {}
+
+    def allocate(self, model):
+        if model not in self._next_pk:
+            self._next_pk[model] = (model.objects.aggregate(pk=Max("pk"))["pk"] or 0) + 1
+        pk = self._next_pk[model]
+        self._next_pk[model] += 1
+        return pk
+
+    def add(self, obj):
+        model = type(obj)
+        if obj.pk is None:
+            obj.pk = self.allocate(model)
+        buffer = self._buffers.setdefault(model, [])
+        buffer.append(obj)
+        if len(buffer) >= self.batch_size:
+            self._flush(model)
+        return obj.pk
+
+    def write(self, objs):
+        """Add every object of `objs`, returning the range of keys they were given."""
+        first = last = None
+        for obj in objs:
+            last = self.add(obj)
+            first = last if first is None else first
+        return range(first, last + 1) if first is not None else range(0)
+
+    def finish(self):
+        for model in list(self._buffers):
+            self._flush(model)
+        statements = connection.ops.sequence_reset_sql(no_style(), list(self._next_pk))
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+        return self.counts
+
+    def _flush(self, model):
+        objs = self._buffers.pop(model, [])
+        if not objs:
+            return
+        fields = model._meta.concrete_fields
+        table = connection.ops.quote_name(model._meta.db_table)
+        columns = ", ".join(connection.ops.quote_name(field.column) for field in fields)
+        rows = ([self._value(field, obj) for field in fields] for obj in objs)
+        with connection.cursor() as cursor:
+            if self.use_copy:
+                with cursor.cursor.copy(f"COPY {table} ({columns}) FROM STDIN") as copy:
+                    for row in rows:
+                        copy.write_row(row)
+            else:
+                placeholders = ", ".join(["%s"] * len(fields))
+                cursor.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", list(rows))
+        name = model._meta.object_name
+        self.counts[name] = self.counts.get(name, 0) + len(objs)
+
+    @staticmethod
+    def _value(field, obj):
+        # Keep explicit values of auto_now(_add) fields, `pre_save` would overwrite them with the current time.
+        if isinstance(field, DateField) and (field.auto_now or field.auto_now_add):
+            value = getattr(obj, field.attname) or field.pre_save(obj, add=True)
+        else:
+            value = field.pre_save(obj, add=True)
+        return field.get_db_prep_save(value, connection)
+
+
+class Generator:
+    def __init__(self, scale=1.0, seed=42, batch_size=5000, email_domain="example.com", log=None):
+        self.sizes = sizes_for(scale)
+        self.rng = random.Random(seed)
+        self.email_domain = email_domain
+        self.log = log or (lambda message: None)
+        self.writer = RowWriter(batch_size=batch_size)
+
+    @transaction.atomic
+    def run(self):
+        """Generate the whole graph and return the number of rows written per model."""
+        self.core()
+        self.academics()
+        self.sports()
+        self.athletes()
+        self.coaches()
+        self.openings()
+        self.posts()
+        self.referrals()
+        counts = self.writer.finish()
+        invalidate_on_commit(*TABLES)
+        for name, count in counts.items():
+            self.log(f"{name}: {count}")
+        return counts
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def timestamp(self, days=365):
+        return EPOCH - timedelta(seconds=self.rng.randrange(days * 86400))
+
+    def email(self, kind, pk):
+        return f"{kind}{pk}@{self.email_domain}"
+
+    def sample(self, ids, k):
+        return self.rng.sample(ids, min(k, len(ids)))
+
+    def core(self):
+        # Missing rows go through the writer too: `objects.create` would draw keys from a sequence, which a rolled back
+        # run does not rewind, and the rows generated after them would differ from one run to the next.
+        country = Country.objects.filter(name="United States").first()
+        self.country_id = country.pk if country else self.writer.add(Country(name="United States", code="US"))
+        self.state_ids = self.writer.write(
+            State(name=f"Generated State {i}", code=f"G{i}", country_id=self.country_id)
+            for i in range(self.sizes["states"])
+        )
+
+    def address(self):
+        pk = self.writer.allocate(Address)
+        return self.writer.add(
+            Address(
+                pk=pk,
+                address_one=f"{pk} Main St",
+                postal_code=f"{pk % 100000:05}",
+                state_id=self.rng.choice(self.state_ids),
+                country_id=self.country_id,
+            )
+        )
+
+    def academics(self):
+        rng, writer = self.rng, self.writer
+        self.university_ids = writer.write(
+            University(
+                uuid=self.uuid(),
+                name=f"University of {rng.choice(LAST_NAMES)} {i}",
+                address_id=self.address(),
+                athletic_division=rng.choice(DIVISIONS),
+                acceptance_rate=round(rng.uniform(5, 90), 1),
+            )
+            for i in range(self.sizes["universities"])
+        )
+        for university_id in self.university_ids:
+            domain_id = writer.add(UniversityEmailDomain(university_id=university_id, domain=f"u{university_id}.edu"))
+            writer.add(
+                University.email_domains.through(university_id=university_id, universityemaildomain_id=domain_id)
+            )
+        self.highschool_ids = writer.write(
+            Highschool(uuid=self.uuid(), name=f"{rng.choice(LAST_NAMES)} High School {i}", address_id=self.address())
+            for i in range(self.sizes["highschools"])
+        )
+        self.exam_ids = writer.write(
+            Exam(uuid=self.uuid(), name=f"Exam {i}", exam_type="AP" if i % 2 else "IB")
+            for i in range(self.sizes["exams"])
+        )
+
+    def sports(self):
+        # Sports and positions are reference data seeded by migration, only fill them in when they are missing
+        self.positions_by_sport = {}
+        if not Sport.objects.exists():
+            for gender in ["male", "female"]:
+                sport_id = self.writer.add(Sport(name="Soccer", gender=gender))
+                self.positions_by_sport[sport_id] = [
+                    self.writer.add(Position(sport_id=sport_id, abbreviation=abbreviation, name=abbreviation))
+                    for abbreviation in DEFAULT_POSITIONS
+                ]
+        else:
+            for position_id, sport_id in Position.objects.values_list("id", "sport_id").order_by("id"):
+                self.positions_by_sport.setdefault(sport_id, []).append(position_id)
+        self.sport_ids = sorted(self.positions_by_sport) or list(
+            Sport.objects.order_by("id").values_list("id", flat=True)
+        )
+
+        self.clubs_by_sport = {}
+        for i in range(self.sizes["clubs"]):
+            sport_id = self.rng.choice(self.sport_ids)
+            club_id = self.writer.add(Club(name=f"FC {i}", sport_id=sport_id))
+            self.clubs_by_sport.setdefault(sport_id, []).append(club_id)
+        self.leagues_by_sport = {}
+        for i in range(self.sizes["leagues"]):
+            sport_id = self.rng.choice(self.sport_ids)
+            league = League(name=f"League {i}", sport_id=sport_id, level=self.rng.choice(LEAGUE_LEVELS))
+            self.leagues_by_sport.setdefault(sport_id, []).append(self.writer.add(league))
+
+    def account(self, kind):
+        Account = get_user_model()
+        pk = self.writer.allocate(Account)
+        self.writer.add(
+            Account(
+                pk=pk,
+                email=self.email(kind, pk),
+                first_name=self.rng.choice(FIRST_NAMES),
+                last_name=self.rng.choice(LAST_NAMES),
+                date_joined=self.timestamp(),
+            )
+        )
+        if self.rng.random() < 0.5:
+            self.writer.add(NotificationToken(account_id=pk, token=f"token-{pk}", created_at=self.timestamp()))
+        return pk
+
+    def athletes(self):
+        rng, writer = self.rng, self.writer
+        first = None
+        for _ in range(self.sizes["athletes"]):
+            sport_id = rng.choice(self.sport_ids)
+            positions = self.positions_by_sport.get(sport_id, [])
+            athlete_id = writer.add(
+                Athlete(
+                    uuid=self.uuid(),
+                    user_id=self.account("athlete"),
+                    sport_id=sport_id,
+                    position_id=rng.choice(positions) if positions else None,
+                    height=rng.randint(60, 80),
+                    weight=rng.randint(110, 230),
+                    gpa=round(rng.uniform(2.0, 4.0), 2),
+                    sat=rng.randrange(900, 1600, 10),
+                    act=rng.randint(15, 36),
+                    budget=rng.randrange(5000, 60000, 1000),
+                    highschool_grad_year=rng.randint(2025, 2029),
+                    highschool_id=rng.choice(self.highschool_ids),
+                    university_id=rng.choice(self.university_ids) if rng.random() < COMMITTED_ATHLETES else None,
+                )
+            )
+            first = athlete_id if first is None else first
+
+            clubs = self.sample(self.clubs_by_sport.get(sport_id, []), rng.randint(1, 2))
+            for club_id in clubs:
+                writer.add(Athlete.clubs.through(athlete_id=athlete_id, club_id=club_id))
+            if sport_id in self.leagues_by_sport:
+                league_id = rng.choice(self.leagues_by_sport[sport_id])
+                writer.add(Athlete.leagues.through(athlete_id=athlete_id, league_id=league_id))
+            for name in ["Goals", "Assists", "Minutes"]:
+                writer.add(
+                    SportStatistic(
+                        athlete_id=athlete_id,
+                        sport_id=sport_id,
+                        name=name,
+                        year=rng.randint(2022, 2025),
+                        season=rng.choice(SEASONS),
+                        value=str(rng.randint(0, 40)),
+                        club_id=clubs[0] if clubs else None,
+                        highschool_id=rng.choice(self.highschool_ids),
+                    )
+                )
+            writer.add(
+                PersonalStatistic(athlete_id=athlete_id, name="40 yard dash", value=f"{rng.uniform(4.3, 6):.2f}s")
+            )
+            writer.add(PersonalStatistic(athlete_id=athlete_id, name="Vertical", value=f"{rng.randint(15, 40)} in"))
+            for exam_id in self.sample(self.exam_ids, 2):
+                writer.add(AthleteExam(athlete_id=athlete_id, exam_id=exam_id, score=rng.randint(1, 5)))
+        self.athlete_ids = range(first, first + self.sizes["athletes"])
+
+    def coaches(self):
+        rng, writer = self.rng, self.writer
+        self.coach_ids = writer.write(
+            Coach(
+                uuid=self.uuid(),
+                user_id=self.account("coach"),
+                university_id=rng.choice(self.university_ids),
+                title="Head Coach",
+            )
+            for _ in range(self.sizes["coaches"])
+        )
+        for university_id in self.university_ids[:: round(1 / PAYING_UNIVERSITIES)]:
+            writer.add(
+                Payment(
+                    plan="university",
+                    university_id=university_id,
+                    stripe_customer_id=f"cus_u{university_id}",
+                    stripe_subscription_id=f"sub_u{university_id}",
+                    current_period_end=PERIOD_END,
+                    created_at=self.timestamp(),
+                    updated_at=EPOCH,
+                )
+            )
+        for coach_id in self.coach_ids:
+            for athlete_id in self.sample(self.athlete_ids, SAVED_PER_COACH):
+                writer.add(SavedAccount(coach_id=coach_id, athlete_id=athlete_id, saved_at=self.timestamp()))
+
+    def openings(self):
+        rng, writer = self.rng, self.writer
+        for _ in range(self.sizes["openings"]):
+            sport_id = rng.choice(self.sport_ids)
+            created_at = self.timestamp()
+            opening_id = writer.add(
+                Opening(
+                    posted_by_id=rng.choice(self.coach_ids),
+                    sport_id=sport_id,
+                    description="Looking for committed student athletes.",
+                    gpa=rng.choice([None, 2.5, 3.0, 3.5]),
+                    sat=rng.choice([None, 1000, 1200]),
+                    min_budget=rng.choice([None, 10000]),
+                    max_budget=rng.choice([None, 40000]),
+                    grad_year=rng.choice([None, 2026, 2027]),
+                    created_at=created_at,
+                    updated_at=created_at,
+                )
+            )
+            for position_id in self.sample(self.positions_by_sport.get(sport_id, []), 2):
+                writer.add(Opening.positions.through(opening_id=opening_id, position_id=position_id))
+            if rng.random() < 1 / 3:
+                writer.add(OpeningExamScore(opening_id=opening_id, exam_id=rng.choice(self.exam_ids), min_score=3))
+            for athlete_id in self.sample(self.athlete_ids, APPLICANTS_PER_OPENING):
+                applied_at = created_at + timedelta(seconds=rng.randrange(30 * 86400))
+                writer.add(
+                    Applicant(
+                        opening_id=opening_id,
+                        athlete_id=athlete_id,
+                        applied_at=applied_at,
+                        is_new=rng.random() < 0.5,
+                        status=rng.choice(APPLICANT_STATUSES),
+                        status_updated_at=applied_at,
+                    )
+                )
+
+    def posts(self):
+        for athlete_id in self.sample(self.athlete_ids, int(len(self.athlete_ids) * POSTS_PER_ATHLETE)):
+            pk = self.writer.allocate(Post)
+            self.writer.add(
+                Post(
+                    pk=pk,
+                    posted_by_id=athlete_id,
+                    title=f"Highlights {pk}",
+                    description="Game highlights from this season.",
+                    posted_date=self.timestamp().date(),
+                    video=f"videos/highlights-{pk}.mp4",
+                )
+            )
+
+    def referrals(self):
+        first = None
+        for _ in range(self.sizes["signups"]):
+            pk = self.writer.allocate(SignUp)
+            referred_by = None
+            if first is not None and self.rng.random() < REFERRED_SIGNUPS:
+                referred_by = self.rng.randrange(first, pk)
+            first = pk if first is None else first
+            self.writer.add(
+                SignUp(
+                    pk=pk,
+                    email=self.email("signup", pk),
+                    first_name=self.rng.choice(FIRST_NAMES),
+                    last_name=self.rng.choice(LAST_NAMES),
+                    created_at=self.timestamp(),
+                    referred_by_id=referred_by,
+                )
+            )
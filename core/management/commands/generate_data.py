@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.datagen import SIZES, Generator
+from openings import matching
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate a synthetic data set across every app for load and scale testing. "
+        f"--scale 1 creates {SIZES['athletes']:,} athletes, {SIZES['coaches']:,} coaches and "
+        f"{SIZES['openings']:,} openings with their related rows, about 1.6 million rows in total."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=float, default=1.0, help="Size multiplier, fractions are allowed")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed, the same seed gives the same data")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rows written per COPY/INSERT")
+        parser.add_argument("--email-domain", default="generated.example", help="Domain of the generated emails")
+        parser.add_argument("--eligibility", action="store_true", help="Rebuild the eligibility table afterwards")
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        generator = Generator(
+            scale=options["scale"],
+            seed=options["seed"],
+            batch_size=options["batch_size"],
+            email_domain=options["email_domain"],
+            log=self.stdout.write if options["verbosity"] > 1 else None,
+        )
+        counts = generator.run()
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated {sum(counts.values()):,} rows in {time.monotonic() - started:.1f}s.")
+        )
+        if options["eligibility"]:
+            matching.rebuild_all()
+            self.stdout.write(self.style.SUCCESS("Eligibility rebuilt."))
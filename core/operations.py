@@ -0,0 +1,57 @@
+"""
+Migration operations.
+
+The hot-path indexes are added with `AddIndexConcurrently` so they can be applied to a live Postgres without locking
+writes to the table for the length of the build. Migrations using it must set `atomic = False`. Other databases (only
+SQLite, for `benchmarks/sqlite_settings.py`; the tests run on Postgres) have no concurrent builds and get a plain
+`CREATE INDEX`.
+
+Foreign key indexes made redundant by a composite index leading with the same column are dropped the same way, with
+`RemoveForeignKeyIndexConcurrently`.
+"""
+
+from django.contrib.postgres import operations
+from django.db.migrations import AddIndex, AlterField
+
+
+class AddIndexConcurrently(operations.AddIndexConcurrently):
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_forwards(self, app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == "postgresql":
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+        else:
+            AddIndex.database_backwards(self, app_label, schema_editor, from_state, to_state)
+
+
+class RemoveForeignKeyIndexConcurrently(AlterField):
+    """
+    `AlterField` to a foreign key with `db_index=False`, dropping its index with DROP INDEX CONCURRENTLY and building
+    it back with CREATE INDEX CONCURRENTLY when reversed.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_forwards(app_label, schema_editor, from_state, to_state)
+        model = from_state.apps.get_model(app_label, self.model_name)
+        column = model._meta.get_field(self.name).column
+        connection = schema_editor.connection
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+        for name, constraint in constraints.items():
+            if constraint["index"] and not constraint["unique"] and constraint["columns"] == [column]:
+                schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}")
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return super().database_backwards(app_label, schema_editor, from_state, to_state)
+        model = to_state.apps.get_model(app_label, self.model_name)
+        field = model._meta.get_field(self.name)
+        schema_editor.execute(schema_editor._create_index_sql(model, fields=[field], concurrently=True))
+
+    def describe(self):
+        return f"Remove the index of {self.model_name}.{self.name} concurrently"
@@ -0,0 +1,231 @@
+"""
+Read-through cache of reference data.
+
+Sports, positions, clubs, leagues, exams, universities, high schools, countries and states rarely change but are
+rendered inside almost every profile, card and address, and listed whole by the catalog endpoints. `reference`
+keeps each of these tables in process memory as serialized fragments keyed by id, and `ReferenceField` renders a
+foreign key to one of them with a dict lookup instead of a join or a query.
+
+Every table has a version counter in the shared Django cache. Saving or deleting a row bumps the version of its
+table and of the tables embedding it (a high school renders its address, a position its sport) once the transaction
+commits, see `core.signals`. Until then only the thread making the change reads those tables from the database, and
+keeps what it reads to itself, so uncommitted rows never reach the shared cache and a rollback leaves nothing behind.
+The process making the change sees the new version at once; other processes check the versions at most every
+`REFERENCE_CACHE_CHECK_INTERVAL` seconds. A table whose version moved is reloaded from the shared cache, where the
+first process to load a version leaves it, or else from the database with one query.
+
+The versions only reach other processes through a cache they all share (see `CACHES` in `api.settings`). As a bound on
+staleness regardless, neither the shared nor the in-process copy of a table is kept longer than
+`REFERENCE_CACHE_TIMEOUT` seconds.
+
+Writes that skip model signals (`QuerySet.update`, raw SQL, `core.datagen`) have to call `reference.invalidate`.
+
+Output stored for later (see `accounts.documents`) is rendered with the `reference_markers` serializer context: each
+`ReferenceField` then emits a `{"$ref": label, "id": pk}` marker instead of the row, and `hydrate` swaps the current
+rows in when the output is read, so stored output never goes stale when reference data changes.
+"""
+
+import threading
+import time
+from collections import namedtuple
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils.module_loading import import_string
+from drf_spectacular.extensions import OpenApiSerializerFieldExtension
+from rest_framework import serializers
+
+from api.instrumentation import cache_fill
+
+MARKER = "$ref"
+
+Table = namedtuple("Table", ["serializer", "select_related", "depends_on"], defaults=[(), ()])
+
+ADDRESS_TABLES = ("core.Address", "core.State", "core.Country")
+
+TABLES = {
+    "sports.Sport": Table("sports.serializers.SportSerializer"),
+    "sports.Position": Table("sports.serializers.PositionSerializer", depends_on=("sports.Sport",)),
+    "sports.Club": Table("sports.serializers.ClubSerializer", depends_on=("sports.Sport",)),
+    "sports.League": Table("sports.serializers.LeagueSerializer", depends_on=("sports.Sport",)),
+    "academics.Exam": Table("academics.serializers.ExamSerializer"),
+    "academics.University": Table(
+        "academics.serializers.UniversitySerializer", select_related=("address",), depends_on=ADDRESS_TABLES
+    ),
+    "academics.Highschool": Table(
+        "academics.serializers.HighschoolSerializer", select_related=("address",), depends_on=ADDRESS_TABLES
+    ),
+    "core.Country": Table("core.serializers.CountrySerializer"),
+    "core.State": Table("core.serializers.StateSerializer"),
+}
+
+
+def version_key(label):
+    return f"reference:version:{label}"
+
+
+def fragments_key(label, version):
+    return f"reference:fragments:{label}:{version}"
+
+
+class ReferenceCache:
+    def __init__(self, tables):
+        self.tables = tables
+        self._loaded = {}
+        self._checked = {}
+        self._lock = threading.RLock()
+        # Tables changed by the current thread's open transaction, {label: fragments or None until read}
+        self._local = threading.local()
+
+    def get(self, label, pk):
+        """The serialized row `pk` of table `label`, or None. Fragments are shared, treat them as read-only."""
+        return self.fragments(label).get(pk)
+
+    def fragments(self, label):
+        """{pk: serialized row} for the whole table."""
+        uncommitted = self.uncommitted()
+        if label in uncommitted:
+            if uncommitted[label] is None:
+                uncommitted[label] = self.load(label)
+            return uncommitted[label]
+        version = self.version(label)
+        loaded = self._loaded.get(label)
+        if self.is_current(loaded, version):
+            return loaded[1]
+        with self._lock:
+            loaded = self._loaded.get(label)
+            if self.is_current(loaded, version):
+                return loaded[1]
+            fragments = cache.get(fragments_key(label, version))
+            if fragments is None:
+                fragments = self.load(label)
+                cache.set(fragments_key(label, version), fragments, settings.REFERENCE_CACHE_TIMEOUT)
+            self._loaded[label] = (version, fragments, time.monotonic())
+        return fragments
+
+    def is_current(self, loaded, version):
+        if loaded is None or loaded[0] != version:
+            return False
+        return time.monotonic() - loaded[2] < settings.REFERENCE_CACHE_TIMEOUT
+
+    def load(self, label):
+        table = self.tables[label]
+        serializer = import_string(table.serializer)
+        rows = apps.get_model(label).objects.select_related(*table.select_related).order_by("pk")
+        with cache_fill():
+            return {row.pk: dict(serializer(row).data) for row in rows}
+
+    def version(self, label):
+        now = time.monotonic()
+        checked = self._checked.get(label)
+        if checked is not None and now - checked[0] < getattr(settings, "REFERENCE_CACHE_CHECK_INTERVAL", 5):
+            return checked[1]
+        key = version_key(label)
+        version = cache.get(key)
+        if version is None:
+            # Start from the clock rather than 1 so a counter lost from the cache never repeats an old version
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        self._checked[label] = (now, version)
+        return version
+
+    def invalidate(self, *labels):
+        """Bump the version of `labels` and of every table embedding them."""
+        uncommitted = self.uncommitted()
+        for label in self.dependents(labels):
+            uncommitted.pop(label, None)
+            key = version_key(label)
+            try:
+                version = cache.incr(key)
+            except ValueError:
+                cache.add(key, time.time_ns(), None)
+                version = cache.get(key)
+            self._checked[label] = (time.monotonic(), version)
+
+    def invalidate_uncommitted(self, *labels):
+        """Read `labels` and every table embedding them from the database until the current transaction ends."""
+        uncommitted = self.uncommitted()
+        uncommitted.update(dict.fromkeys(self.dependents(labels)))
+        self._local.uncommitted = uncommitted
+
+    def uncommitted(self):
+        uncommitted = getattr(self._local, "uncommitted", None)
+        if not uncommitted:
+            return {}
+        if not connection.in_atomic_block:
+            # The transaction committed, and bumped the versions, or rolled back
+            self._local.uncommitted = {}
+            return {}
+        return uncommitted
+
+    def dependents(self, labels):
+        labels = set(labels)
+        return sorted(
+            label for label, table in self.tables.items() if label in labels or labels & set(table.depends_on)
+        )
+
+    def watched(self):
+        """Labels of every model whose changes invalidate a table."""
+        return sorted({label for label, table in self.tables.items() for label in [label, *table.depends_on]})
+
+    def clear(self):
+        with self._lock:
+            self._loaded.clear()
+            self._checked.clear()
+        self._local.uncommitted = {}
+
+
+reference = ReferenceCache(TABLES)
+
+
+def hydrate(data):
+    """Copy of `data` with every reference marker replaced by the row it points to."""
+    if isinstance(data, list):
+        return [hydrate(item) for item in data]
+    if isinstance(data, dict):
+        if MARKER in data:
+            return reference.get(data[MARKER], data["id"])
+        return {key: hydrate(value) for key, value in data.items()}
+    return data
+
+
+def invalidate_on_commit(*labels):
+    # Bumped on commit only: a version bumped earlier would let this transaction's rows, rolled back or not, be cached
+    # under it for every process
+    if connection.in_atomic_block:
+        reference.invalidate_uncommitted(*labels)
+    transaction.on_commit(lambda: reference.invalidate(*labels))
+
+
+class ReferenceField(serializers.Field):
+    """
+    Read-only rendering of a foreign key to a reference table. Only the `<relation>_id` column is read, so the
+    related row never needs to be selected.
+    """
+
+    def __init__(self, table, **kwargs):
+        self.table = table
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        for attr in self.source_attrs[:-1]:
+            instance = getattr(instance, attr, None)
+            if instance is None:
+                return None
+        return getattr(instance, f"{self.source_attrs[-1]}_id")
+
+    def to_representation(self, value):
+        if self.context.get("reference_markers"):
+            return {MARKER: self.table, "id": value}
+        return reference.get(self.table, value)
+
+
+class ReferenceFieldExtension(OpenApiSerializerFieldExtension):
+    target_class = ReferenceField
+
+    def map_serializer_field(self, auto_schema, direction):
+        serializer = import_string(TABLES[self.target.table].serializer)
+        return auto_schema.resolve_serializer(serializer, direction).ref
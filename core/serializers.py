@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from .models import Address, Country, State
+from .reference import ReferenceField
 
 
 class CountrySerializer(serializers.ModelSerializer):
@@ -16,8 +17,8 @@ class StateSerializer(serializers.ModelSerializer):
 
 
 class AddressSerializer(serializers.ModelSerializer):
-    state = StateSerializer(read_only=True)
-    country = CountrySerializer(read_only=True)
+    state = ReferenceField("core.State")
+    country = ReferenceField("core.Country")
 
     class Meta:
         model = Address
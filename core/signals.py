@@ -0,0 +1,15 @@
+from django.apps import apps
+from django.db.models.signals import post_delete, post_save
+
+from .reference import invalidate_on_commit, reference
+
+
+def invalidate_reference(sender, **kwargs):
+    invalidate_on_commit(sender._meta.label)
+
+
+def connect_reference_signals():
+    for label in reference.watched():
+        model = apps.get_model(label)
+        post_save.connect(invalidate_reference, sender=model, dispatch_uid=f"reference-save-{label}")
+        post_delete.connect(invalidate_reference, sender=model, dispatch_uid=f"reference-delete-{label}")
@@ -0,0 +1,65 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from sports.models import Club, Position, Sport
+
+
+@pytest.fixture
+def sports():
+    soccer = Sport.objects.create(name="Soccer", gender="female")
+    lacrosse = Sport.objects.create(name="Lacrosse", gender="male")
+    Position.objects.create(sport=soccer, abbreviation="GK", name="Goalkeeper")
+    Position.objects.create(sport=lacrosse, abbreviation="A", name="Attack")
+    return soccer, lacrosse
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestCatalog:
+    def test_lists_without_authentication(self, api_client, sports):
+        response = api_client.get(reverse("sport-catalog"))
+        assert response.status_code == status.HTTP_200_OK
+        assert [sport["name"] for sport in response.json()] == ["Soccer", "Lacrosse"]
+        assert response["ETag"].startswith('"')
+        assert response["Cache-Control"] == "public, max-age=300"
+
+    def test_filters_by_sport(self, api_client, sports):
+        response = api_client.get(reverse("position-catalog"), {"sport": sports[1].id})
+        assert [position["abbreviation"] for position in response.json()] == ["A"]
+        assert api_client.get(reverse("position-catalog"), {"sport": "x"}).status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_invalid_filter_is_rejected_before_the_etag_check(self, api_client, sports):
+        etag = api_client.get(reverse("position-catalog"))["ETag"]
+        response = api_client.get(reverse("position-catalog"), {"sport": "x"}, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_not_modified_without_touching_the_database(self, api_client, sports):
+        etag = api_client.get(reverse("sport-catalog"))["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse("sport-catalog"), HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+        assert response.content == b""
+        assert len(queries) == 0
+
+    def test_changes_move_the_etag(self, api_client, sports, django_capture_on_commit_callbacks):
+        etag = api_client.get(reverse("position-catalog"))["ETag"]
+        with django_capture_on_commit_callbacks(execute=True):
+            sports[0].name = "Football"
+            sports[0].save()
+        response = api_client.get(reverse("position-catalog"), HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response.json()[0]["sport"]["name"] == "Football"
+
+    def test_clubs_created_by_profile_updates_are_listed(self, api_client, sports, create_athlete):
+        assert api_client.get(reverse("club-catalog")).json() == []
+        athlete = create_athlete(email="athlete@example.com", password="pass", sport=sports[0])
+        api_client.force_authenticate(user=athlete.user)
+        payload = {"athlete": {"clubs": [{"name": "FC Example"}]}}
+        assert api_client.put(reverse("account-update"), payload, format="json").status_code == status.HTTP_200_OK
+        assert [club["name"] for club in api_client.get(reverse("club-catalog")).json()] == ["FC Example"]
+        assert Club.objects.count() == 1
@@ -0,0 +1,56 @@
+import pytest
+from django.core.management import call_command
+from django.db import transaction
+from django.db.models import Max
+
+from academics.models import University
+from accounts.models import Account, Athlete, Payment, SavedAccount
+from core.datagen import Generator, sizes_for
+from openings.models import Applicant, Opening
+from posts.models import Post
+from referrals.models import SignUp
+
+SCALE = 0.0005
+
+
+def generate(seed):
+    with transaction.atomic():
+        counts = Generator(scale=SCALE, seed=seed).run()
+        snapshot = (
+            list(Athlete.objects.order_by("id").values_list("id", "uuid", "user__email", "sport_id", "gpa")),
+            list(Applicant.objects.order_by("id").values_list("opening_id", "athlete_id", "applied_at", "status")),
+            list(SignUp.objects.order_by("id").values_list("email", "referred_by_id")),
+            list(Payment.objects.order_by("id").values_list("university_id", "current_period_end")),
+        )
+        transaction.set_rollback(True)
+    return counts, snapshot
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestGenerateData:
+    def test_builds_a_connected_graph_across_apps(self):
+        call_command("generate_data", "--scale", str(SCALE), "--batch-size", "7")
+
+        sizes = sizes_for(SCALE)
+        assert Athlete.objects.filter(user__isnull=False, sport__isnull=False).count() == sizes["athletes"]
+        assert Opening.objects.count() == sizes["openings"]
+        assert SignUp.objects.count() == sizes["signups"]
+        assert University.objects.filter(address__state__country__code="US").exists()
+        assert Applicant.objects.exists() and SavedAccount.objects.exists() and Post.objects.exists()
+        assert not Account.objects.exclude(email__endswith="@generated.example").exists()
+
+    def test_same_seed_gives_the_same_rows(self):
+        counts, snapshot = generate(seed=1)
+        assert counts["Athlete_clubs"] > 0
+        assert generate(seed=1) == (counts, snapshot)
+        assert generate(seed=2)[1] != snapshot
+
+    def test_keys_continue_after_existing_rows(self, create_athlete):
+        existing = create_athlete(email="athlete@example.com", password="pass")
+
+        Generator(scale=SCALE).run()
+
+        assert Athlete.objects.filter(id__gt=existing.id).count() == sizes_for(SCALE)["athletes"]
+        generated = Athlete.objects.aggregate(last=Max("id"))["last"]
+        assert create_athlete(email="late@example.com", password="pass").id > generated
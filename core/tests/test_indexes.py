@@ -0,0 +1,85 @@
+import pytest
+from django.db import connection, transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from accounts.models import Coach, NotificationToken, Payment, SavedAccount
+from core.datagen import Generator
+from openings.models import Applicant, Opening
+
+# Small enough to generate in about a second, large enough for the planner to weigh the indexes on real statistics
+SCALE = 0.01
+# Smaller than the rows of one opening or coach, as a page is in production, or sorting all of them would win
+PAGE = 3
+
+
+def applicants(**filters):
+    return Applicant.objects.filter(opening_id=1, **filters).order_by("-applied_at", "-id")[:PAGE]
+
+
+def openings(**filters):
+    return Opening.objects.filter(**filters).order_by("-created_at", "-id")[:PAGE]
+
+
+def paid_until(plan):
+    paying = Payment.objects.filter(plan=plan, active=True).values_list(f"{plan}_id", flat=True)[:2]
+    payments = Payment.objects.filter(Q(plan=plan, **{f"{plan}_id__in": list(paying)}), active=True)
+    return payments.values("plan", "university_id", "coach_id").annotate(paid_until=Max("current_period_end"))
+
+
+# The hot queries of the API and the indexes that may serve them. A filter matching a large share of the rows (there
+# are only two generated sports) is as well served by walking the unfiltered index in order.
+HOT_QUERIES = {
+    "applicants": (["applicant_opening_recent_idx"], lambda: applicants()),
+    "applicants by status": (["applicant_opening_status_idx"], lambda: applicants(status="accepted")),
+    "unread applicants": (["applicant_opening_recent_idx"], lambda: applicants(is_new=True)),
+    "openings": (["opening_recent_idx"], lambda: openings()),
+    "openings by sport": (["opening_sport_recent_idx", "opening_recent_idx"], lambda: openings(sport_id=1)),
+    "openings by sport and year": (
+        ["opening_sport_year_recent_idx", "opening_sport_recent_idx", "opening_recent_idx"],
+        lambda: openings(sport_id=1, grad_year=2026),
+    ),
+    "saved accounts": (
+        ["savedaccount_coach_recent_idx"],
+        lambda: SavedAccount.objects.filter(coach_id=1).order_by("-saved_at", "-id")[:PAGE],
+    ),
+    "university entitlements": (["payment_university_active_idx"], lambda: paid_until("university")),
+    "coach entitlements": (["payment_coach_active_idx"], lambda: paid_until("coach")),
+    "notification token": (
+        ["notificationtoken_account_idx"],
+        lambda: NotificationToken.objects.filter(account_id=1, token="token"),
+    ),
+}
+
+
+@pytest.fixture(scope="module")
+def generated_rows(django_db_setup, django_db_blocker):
+    """Generated rows and fresh planner statistics, rolled back after the module."""
+    with django_db_blocker.unblock(), transaction.atomic():
+        Generator(scale=SCALE, seed=1).run()
+        # The generator only sells university plans
+        Payment.objects.bulk_create(
+            Payment(plan="coach", coach_id=coach_id, current_period_end=timezone.now())
+            for coach_id in Coach.objects.values_list("id", flat=True)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        yield
+        transaction.set_rollback(True)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestHotQueryIndexes:
+    @pytest.mark.parametrize("query", HOT_QUERIES)
+    def test_query_uses_index(self, generated_rows, query):
+        indexes, queryset = HOT_QUERIES[query]
+        with connection.cursor() as cursor:
+            # Tables this small are cheaper to scan whole, the question is which index the planner picks otherwise
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        queryset = queryset()
+        plan = queryset.explain()
+        assert any(f" {index} " in plan for index in indexes), plan
+        if queryset.query.order_by:
+            # The page comes straight out of the index, in order
+            assert "Sort" not in plan, plan
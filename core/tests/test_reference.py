@@ -0,0 +1,101 @@
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from academics.models import University
+from core.models import Address, Country, State
+from core.reference import TABLES, ReferenceCache, reference
+from sports.models import Position, Sport
+
+
+@pytest.fixture
+def sport(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        return Sport.objects.create(name="Soccer", gender="female")
+
+
+@pytest.fixture
+def university(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        country = Country.objects.create(name="United States", code="US")
+        state = State.objects.create(name="Ohio", code="OH", country=country)
+        address = Address.objects.create(address_one="1 Main St", state=state, country=country)
+        return University.objects.create(name="Ohio State", address=address, athletic_division="NCAA Division I")
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestReferenceCache:
+    def test_loads_each_table_once(self, sport):
+        position = Position.objects.create(sport=sport, abbreviation="GK", name="Goalkeeper")
+        with CaptureQueriesContext(connection) as cold:
+            fragment = reference.get("sports.Position", position.pk)
+        assert fragment == {
+            "id": position.pk,
+            "sport": {"id": sport.pk, "name": "Soccer", "gender": "female"},
+            "abbreviation": "GK",
+            "name": "Goalkeeper",
+        }
+        assert len(cold) == 2  # positions, then the sports they embed
+        with CaptureQueriesContext(connection) as warm:
+            assert reference.get("sports.Position", position.pk) == fragment
+            assert reference.get("sports.Sport", sport.pk) == fragment["sport"]
+            assert reference.get("sports.Sport", 0) is None
+        assert len(warm) == 0
+
+    def test_saving_a_row_invalidates_its_table_and_the_tables_embedding_it(self, university):
+        assert reference.get("academics.University", university.pk)["address"]["state"]["name"] == "Ohio"
+        State.objects.filter(pk=university.address.state_id).update(name="Ignored")  # no signal, not seen
+        assert reference.get("academics.University", university.pk)["address"]["state"]["name"] == "Ohio"
+
+        state = university.address.state
+        state.name = "Iowa"
+        state.save()
+        assert reference.get("core.State", state.pk)["name"] == "Iowa"
+        assert reference.get("academics.University", university.pk)["address"]["state"]["name"] == "Iowa"
+
+        university.delete()
+        assert reference.get("academics.University", university.pk) is None
+
+    def test_other_processes_reuse_the_shared_cache(self, sport, settings, django_capture_on_commit_callbacks):
+        settings.REFERENCE_CACHE_CHECK_INTERVAL = 0
+        reference.get("sports.Sport", sport.pk)
+        other = ReferenceCache(TABLES)
+        with CaptureQueriesContext(connection) as queries:
+            assert other.get("sports.Sport", sport.pk)["name"] == "Soccer"
+        assert len(queries) == 0
+
+        with django_capture_on_commit_callbacks(execute=True):
+            sport.name = "Futsal"
+            sport.save()
+            # Not before the transaction commits, the change could still be rolled back
+            assert other.get("sports.Sport", sport.pk)["name"] == "Soccer"
+            assert reference.get("sports.Sport", sport.pk)["name"] == "Futsal"
+        assert other.get("sports.Sport", sport.pk)["name"] == "Futsal"
+
+    def test_rolled_back_rows_are_never_shared(self, sport, settings):
+        settings.REFERENCE_CACHE_CHECK_INTERVAL = 0
+        version = reference.version("sports.Sport")
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                sport.name = "Futsal"
+                sport.save()
+                assert reference.get("sports.Sport", sport.pk)["name"] == "Futsal"
+                raise RuntimeError
+        assert reference.version("sports.Sport") == version
+        assert ReferenceCache(TABLES).get("sports.Sport", sport.pk)["name"] == "Soccer"
+
+    def test_version_checks_are_throttled(self, sport, settings):
+        settings.REFERENCE_CACHE_CHECK_INTERVAL = 60
+        other = ReferenceCache(TABLES)
+        assert other.get("sports.Sport", sport.pk)["name"] == "Soccer"
+        sport.name = "Futsal"
+        sport.save()
+        assert other.get("sports.Sport", sport.pk)["name"] == "Soccer"
+        assert reference.get("sports.Sport", sport.pk)["name"] == "Futsal"
+
+    def test_loaded_tables_expire(self, sport, settings):
+        settings.REFERENCE_CACHE_TIMEOUT = 0
+        assert reference.get("sports.Sport", sport.pk)["name"] == "Soccer"
+        Sport.objects.filter(pk=sport.pk).update(name="Futsal")  # no signal, the version does not move
+        assert reference.get("sports.Sport", sport.pk)["name"] == "Futsal"
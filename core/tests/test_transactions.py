@@ -0,0 +1,44 @@
+from unittest import mock
+
+import pytest
+from django.db import transaction
+
+from core.transactions import once_on_commit
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestOnceOnCommit:
+    def test_runs_once_on_commit(self, django_capture_on_commit_callbacks):
+        work = mock.Mock()
+        with django_capture_on_commit_callbacks(execute=True):
+            assert once_on_commit("key", lambda: work) is work
+            assert once_on_commit("key", mock.Mock) is work
+            work.assert_not_called()
+        work.assert_called_once_with()
+
+    def test_keys_run_separately(self, django_capture_on_commit_callbacks):
+        first, second = mock.Mock(), mock.Mock()
+        with django_capture_on_commit_callbacks(execute=True):
+            once_on_commit("first", lambda: first)
+            once_on_commit("second", lambda: second)
+        first.assert_called_once_with()
+        second.assert_called_once_with()
+
+    def test_survives_rolled_back_savepoint(self, django_capture_on_commit_callbacks):
+        work = mock.Mock()
+        with django_capture_on_commit_callbacks(execute=True):
+            with pytest.raises(RuntimeError):
+                with transaction.atomic():
+                    once_on_commit("key", lambda: work)
+                    raise RuntimeError
+            # The hook registered in the savepoint is gone, this call registers one that survives
+            assert once_on_commit("key", mock.Mock) is work
+        work.assert_called_once_with()
+
+    def test_next_transaction_runs_again(self, django_capture_on_commit_callbacks):
+        work = mock.Mock()
+        for _ in range(2):
+            with django_capture_on_commit_callbacks(execute=True):
+                once_on_commit("key", lambda: work)
+        assert work.call_count == 2
@@ -0,0 +1,43 @@
+"""
+Work deferred until the current transaction commits, run once per key.
+
+`once_on_commit(key, factory)` creates `factory()` the first time `key` is asked for in a transaction and returns the
+same callable on every later call, so several signals touching the same rows collect their work in one place and it
+runs once on commit.
+
+Every call registers its own `transaction.on_commit` hook, all pointing at the shared callable, and the first hook
+to run calls it. The registry therefore never has to look into Django's list of pending hooks: when a savepoint rolls
+back, Django drops the hooks registered inside it while those registered before or after it still run the callable.
+Entries left behind by a rolled back transaction are discarded by the next commit.
+"""
+
+import threading
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+# Connections are per thread, so are the transactions the registry follows
+_local = threading.local()
+
+
+class _Once:
+    def __init__(self, func):
+        self.func = func
+        self.done = False
+
+    def run(self, registry):
+        # The transaction is over: whatever is still registered committed with it or was rolled back before
+        registry.clear()
+        if not self.done:
+            self.done = True
+            self.func()
+
+
+def once_on_commit(key, factory, using=None):
+    """The callable registered under `key` for the current transaction, created with `factory()` on first use."""
+    registries = _local.__dict__.setdefault("registries", {})
+    registry = registries.setdefault(using or DEFAULT_DB_ALIAS, {})
+    once = registry.get(key)
+    if once is None or once.done:
+        once = registry[key] = _Once(factory())
+    transaction.on_commit(lambda: once.run(registry), using=using)
+    return once.func
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from .views import CountryCatalogView, StateCatalogView
+
+urlpatterns = [
+    path("countries/", CountryCatalogView.as_view(), name="country-catalog"),
+    path("states/", StateCatalogView.as_view(), name="state-catalog"),
+]
@@ -1 +1,85 @@
-# Create your views here.
+from django.conf import settings
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework import serializers, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from api.instrumentation import TimedJSONRenderer
+
+from .reference import reference
+from .serializers import CountrySerializer, StateSerializer
+
+
+class ValidateCatalogQueryParams(serializers.Serializer):
+    sport = serializers.IntegerField(required=False, help_text="Only entries of this sport")
+
+
+class CatalogView(APIView):
+    """
+    Public, read-only list of a `core.reference` table, served from memory.
+
+    The ETag is the table's version, so a matching `If-None-Match` is answered with 304 before any database or cache
+    lookup beyond the version itself. `Cache-Control` lets browsers and CDNs reuse the list for
+    `CATALOG_CACHE_MAX_AGE` seconds and revalidate it after that.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+    # One representation per ETag, the browsable renderer would make the strong ETag lie
+    renderer_classes = [TimedJSONRenderer]
+    table = None
+    filter_by_sport = False
+
+    def get(self, request, *args, **kwargs):
+        sport = None
+        if self.filter_by_sport:
+            # Before the ETag check, an invalid filter is a 400 whatever the client has cached
+            query_params = ValidateCatalogQueryParams(data=request.query_params)
+            query_params.is_valid(raise_exception=True)
+            sport = query_params.validated_data.get("sport")
+
+        etag = f'"{reference.version(self.table)}"'
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            tags = {tag.removeprefix("W/") for tag in parse_etags(if_none_match)}
+            if etag in tags or "*" in tags:
+                return self.cacheable(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+
+        entries = list(reference.fragments(self.table).values())
+        if sport is not None:
+            entries = [entry for entry in entries if entry["sport"] and entry["sport"]["id"] == sport]
+        return self.cacheable(Response(entries), etag)
+
+    def cacheable(self, response, etag):
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=settings.CATALOG_CACHE_MAX_AGE)
+        return response
+
+
+def catalog_schema(serializer, filter_by_sport=False):
+    return extend_schema(
+        description="The whole list, public. Send the ETag back in If-None-Match to get a 304 while it is unchanged.",
+        parameters=[ValidateCatalogQueryParams] if filter_by_sport else None,
+        responses={
+            200: OpenApiResponse(response=serializer(many=True), description="Every entry, ordered by id"),
+            304: OpenApiResponse(description="Not modified since the version in If-None-Match"),
+        },
+    )
+
+
+class StateCatalogView(CatalogView):
+    table = "core.State"
+
+    @catalog_schema(StateSerializer)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class CountryCatalogView(CatalogView):
+    table = "core.Country"
+
+    @catalog_schema(CountrySerializer)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
@@ -0,0 +1,110 @@
+"""
+Gunicorn configuration, loaded automatically when gunicorn starts from the project root.
+
+The server is sized from the CPU and memory the container is allowed to use (cgroup limits, falling back to the
+host's). Every setting can be overridden with an environment variable:
+
+    GUNICORN_WORKER_CLASS   gthread (default, WSGI) or uvicorn (ASGI through api.asgi)
+    GUNICORN_WORKERS        number of worker processes, default 2 * CPUs + 1 capped by memory
+    GUNICORN_THREADS        threads per gthread worker, default 4
+    GUNICORN_WORKER_MEMORY_MB expected resident memory per worker in MB, default 160
+    PORT                    port to bind, default 8000
+
+The app is preloaded in the master so workers share its memory copy-on-write, which is what makes the extra
+workers affordable in a small container. Several workers need the shared cache configured in `api.settings`
+(`REDIS_URL`); the server refuses to start them on the per-process default.
+"""
+
+import math
+import os
+
+CGROUP_ROOT = "/sys/fs/cgroup"
+
+
+def _read(path):
+    try:
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def available_cpus():
+    # cgroup v2 "<quota> <period>", cgroup v1 split across two files; "max" / -1 mean unlimited
+    quota_period = _read(f"{CGROUP_ROOT}/cpu.max")
+    if quota_period and not quota_period.startswith("max"):
+        quota, period = quota_period.split()
+        return max(1, math.ceil(int(quota) / int(period)))
+    quota, period = _read(f"{CGROUP_ROOT}/cpu/cpu.cfs_quota_us"), _read(f"{CGROUP_ROOT}/cpu/cpu.cfs_period_us")
+    if quota and period and int(quota) > 0:
+        return max(1, math.ceil(int(quota) / int(period)))
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def available_memory_mb():
+    for path in [f"{CGROUP_ROOT}/memory.max", f"{CGROUP_ROOT}/memory/memory.limit_in_bytes"]:
+        limit = _read(path)
+        # cgroup v1 reports "unlimited" as a huge page-aligned number
+        if limit and limit.isdigit() and int(limit) < 2**60:
+            return int(limit) // 2**20
+    meminfo = _read("/proc/meminfo") or ""
+    for line in meminfo.splitlines():
+        if line.startswith("MemTotal:"):
+            return int(line.split()[1]) // 1024
+    return None
+
+
+def default_workers(cpus, memory_mb, worker_memory_mb):
+    workers = 2 * cpus + 1
+    if memory_mb:
+        # Leave a quarter of the memory for the master, page cache and spikes
+        workers = min(workers, int(memory_mb * 0.75) // worker_memory_mb)
+    return max(1, workers)
+
+
+WORKER_CLASSES = {
+    "gthread": ("gthread", "api.wsgi:application"),
+    "uvicorn": ("uvicorn_worker.UvicornWorker", "api.asgi:application"),
+}
+
+_worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread").lower()
+if _worker_class not in WORKER_CLASSES:
+    raise ValueError(f"GUNICORN_WORKER_CLASS must be one of {', '.join(WORKER_CLASSES)}, got {_worker_class!r}")
+
+worker_class, wsgi_app = WORKER_CLASSES[_worker_class]
+workers = int(
+    os.getenv("GUNICORN_WORKERS")
+    or default_workers(available_cpus(), available_memory_mb(), int(os.getenv("GUNICORN_WORKER_MEMORY_MB", "160")))
+)
+threads = int(os.getenv("GUNICORN_THREADS", "4")) if _worker_class == "gthread" else 1
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+preload_app = True
+timeout = 60
+graceful_timeout = 30
+# Longer than the load balancer's idle timeout so it never reuses a connection the worker already closed
+keepalive = 75
+# Recycle workers now and then so slow leaks can't accumulate, jittered so they don't all restart together
+max_requests = 2000
+max_requests_jitter = 200
+accesslog = "-"
+
+
+def on_starting(server):
+    # Cache invalidations made by one worker would never reach the others
+    from django.conf import settings
+
+    if server.cfg.workers > 1 and settings.CACHES["default"]["BACKEND"].endswith(".LocMemCache"):
+        raise RuntimeError(f"{server.cfg.workers} workers need a shared cache, set REDIS_URL or CACHE_BACKEND")
+
+
+def post_fork(server, worker):
+    # Nothing should have connected before the fork, but a connection inherited from the master must never be
+    # shared between workers.
+    from django.db import connections
+
+    for connection in connections.all(initialized_only=True):
+        connection.close()
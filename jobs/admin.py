@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("task", "queue", "status", "attempts", "run_at", "finished_at")
+    list_filter = ("queue", "status")
+    search_fields = ("task", "key")
+    readonly_fields = ("created_at", "started_at", "finished_at", "worker", "last_error")
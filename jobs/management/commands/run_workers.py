@@ -0,0 +1,30 @@
+import logging
+import signal
+
+from django.core.management.base import BaseCommand
+
+from jobs.worker import Worker
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs until stopped with SIGINT or SIGTERM, which lets running jobs finish."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--queue", action="append", default=[], help="Queue to work on, repeatable, default all")
+        parser.add_argument("--concurrency", type=int, default=4, help="Jobs run at the same time")
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between looking for jobs")
+        parser.add_argument("--burst", action="store_true", help="Exit once no job is due")
+
+    def handle(self, *args, **options):
+        if options["verbosity"] > 1:
+            logging.getLogger("jobs").setLevel(logging.INFO)
+        worker = Worker(
+            queues=options["queue"], concurrency=options["concurrency"], poll_interval=options["poll_interval"]
+        )
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: worker.stop())
+        self.stdout.write(f"Worker {worker.name} running {', '.join(worker.queues) or 'every queue'}.")
+        worker.run(burst=options["burst"])
+        self.stdout.write(
+            self.style.SUCCESS(f"Worker stopped: {worker.stats['done']} jobs done, {worker.stats['failed']} failed.")
+        )
@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Min
+from django.utils import timezone
+
+from jobs.models import Job
+
+STATUSES = [Job.QUEUED, Job.RUNNING, Job.DONE, Job.FAILED]
+
+
+def duration(end, start):
+    return ExpressionWrapper(F(end) - F(start), output_field=DurationField())
+
+
+def milliseconds(value):
+    return round(value.total_seconds() * 1000, 1) if value is not None else None
+
+
+def queue_stats():
+    """
+    Per queue: the jobs in each status, how long the oldest due job has been waiting (`lag_s`), and for the jobs
+    finished in the last `JOB_METRICS_WINDOW` seconds their count and mean wait and run times.
+    """
+    now = timezone.now()
+    stats = {}
+
+    def queue(name):
+        return stats.setdefault(
+            name, {**dict.fromkeys(STATUSES, 0), "lag_s": 0.0, "finished": 0, "wait_ms": None, "run_ms": None}
+        )
+
+    for name, status, count in Job.objects.values_list("queue", "status").annotate(count=Count("id")).order_by():
+        queue(name)[status] = count
+
+    due = Job.objects.filter(status=Job.QUEUED, run_at__lte=now).values("queue").annotate(oldest=Min("run_at"))
+    for row in due.order_by():
+        queue(row["queue"])["lag_s"] = round((now - row["oldest"]).total_seconds(), 1)
+
+    finished = (
+        Job.objects.filter(status=Job.DONE, finished_at__gte=now - timedelta(seconds=settings.JOB_METRICS_WINDOW))
+        .values("queue")
+        .annotate(
+            count=Count("id"),
+            wait=Avg(duration("started_at", "run_at")),
+            run=Avg(duration("finished_at", "started_at")),
+        )
+    )
+    for row in finished.order_by():
+        queue(row["queue"]).update(
+            finished=row["count"], wait_ms=milliseconds(row["wait"]), run_ms=milliseconds(row["run"])
+        )
+    return stats
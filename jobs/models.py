@@ -0,0 +1,45 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Job(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    queue = models.CharField(max_length=64, default="default")
+    task = models.CharField(max_length=255)
+    payload = models.JSONField(default=dict, blank=True)
+    # At most one queued or running job per key, see `jobs.queue.enqueue`
+    key = models.CharField(max_length=255, null=True, blank=True)
+    status = models.CharField(
+        max_length=16,
+        choices=[(QUEUED, "Queued"), (RUNNING, "Running"), (DONE, "Done"), (FAILED, "Failed")],
+        default=QUEUED,
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    worker = models.CharField(max_length=255, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            # Workers claim the due jobs of their queues in run_at order
+            models.Index(fields=["queue", "run_at", "id"], condition=Q(status="queued"), name="job_ready_idx"),
+            # Jobs of crashed workers are found by their start time
+            models.Index(fields=["started_at"], condition=Q(status="running"), name="job_running_idx"),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["key"], condition=Q(status__in=["queued", "running"]), name="job_pending_key_unique"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task} ({self.status})"
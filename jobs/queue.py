@@ -0,0 +1,97 @@
+"""
+A durable job queue in the application database.
+
+Functions decorated with `@task` are registered by name and queued with `enqueue` (or `<task>.enqueue`), which
+inserts a `Job` row. Inside a transaction the job only becomes visible to workers when it commits, so a job never
+runs for a write that was rolled back. Payloads are keyword arguments and have to be JSON serializable.
+
+`manage.py run_workers` claims due jobs with `SELECT ... FOR UPDATE SKIP LOCKED` (see `jobs.worker`), so any number
+of worker processes share the queues without handing out a job twice. A job that raises is retried with
+exponential backoff until it has run `max_attempts` times, then kept as failed. Tasks declared with `every` run
+periodically: the worker queues the next run when one finishes.
+
+Tasks are found in the `tasks` module of every installed app.
+"""
+
+import random
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from jobs.models import Job
+
+registry = {}
+
+
+class Task:
+    def __init__(self, func, name, queue="default", max_attempts=5, every=None):
+        self.func = func
+        self.name = name
+        self.queue = queue
+        self.max_attempts = max_attempts
+        self.every = every
+
+    def __call__(self, **kwargs):
+        return self.func(**kwargs)
+
+    def enqueue(self, run_at=None, delay=None, key=None, **kwargs):
+        return enqueue(self.name, kwargs, run_at=run_at, delay=delay, key=key)
+
+    @property
+    def periodic_key(self):
+        return f"periodic:{self.name}"
+
+
+def task(name=None, queue="default", max_attempts=5, every=None):
+    """
+    Register the decorated function as a task, by default under "<module>.<function>". `every` (a timedelta) makes it
+    periodic.
+    """
+
+    def register(func):
+        task_name = name or f"{func.__module__}.{func.__name__}"
+        registered = Task(func, task_name, queue=queue, max_attempts=max_attempts, every=every)
+        registry[task_name] = registered
+        return registered
+
+    return register
+
+
+def enqueue(name, payload=None, run_at=None, delay=None, key=None):
+    """
+    Queue task `name` to run with the keyword arguments in `payload`, at `run_at` or after `delay` seconds (a number
+    or timedelta), otherwise as soon as a worker is free. With a `key`, nothing is queued while another job with the
+    same key is queued or running. Returns the job, or None when it was not queued.
+    """
+    registered = registry.get(name)
+    if registered is None:
+        raise ValueError(f"Unknown task {name!r}")
+    if run_at is None:
+        run_at = timezone.now()
+        if delay is not None:
+            run_at += delay if isinstance(delay, timedelta) else timedelta(seconds=delay)
+    job = Job(
+        queue=registered.queue,
+        task=name,
+        payload=payload or {},
+        key=key,
+        max_attempts=registered.max_attempts,
+        run_at=run_at,
+    )
+    if key is None:
+        job.save()
+        return job
+    try:
+        with transaction.atomic():
+            job.save()
+    except IntegrityError:
+        return None
+    return job
+
+
+def retry_delay(attempts):
+    """Seconds before retrying a job that failed its `attempts`-th run: doubling from the base, with 10% jitter."""
+    delay = min(settings.JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1), settings.JOB_RETRY_MAX_DELAY)
+    return delay * random.uniform(0.9, 1.1)
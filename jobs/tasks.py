@@ -0,0 +1,14 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import task
+
+
+@task(queue="maintenance", every=timedelta(hours=1))
+def prune_finished_jobs():
+    """Delete the jobs that finished successfully more than `JOB_RETENTION_DAYS` ago. Failed jobs are kept."""
+    cutoff = timezone.now() - timedelta(days=settings.JOB_RETENTION_DAYS)
+    Job.objects.filter(status=Job.DONE, finished_at__lt=cutoff).delete()
@@ -0,0 +1,152 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from jobs.metrics import queue_stats
+from jobs.models import Job
+from jobs.queue import enqueue, task
+from jobs.worker import Worker, claim, reclaim_abandoned, run_pending, schedule_periodic
+
+calls = []
+
+
+@task(name="tests.record")
+def record(value=None):
+    calls.append(value)
+
+
+@task(name="tests.flaky", max_attempts=2)
+def flaky():
+    raise RuntimeError("boom")
+
+
+@task(name="tests.hourly", queue="maintenance", every=timedelta(hours=1))
+def hourly():
+    calls.append("hourly")
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestQueue:
+    def test_enqueue_and_run(self):
+        job = record.enqueue(value=1)
+        enqueue("tests.record", {"value": 2})
+        assert job.status == Job.QUEUED
+        assert run_pending() == 2
+        assert calls == [1, 2]
+        job.refresh_from_db()
+        assert job.status == Job.DONE
+        assert job.attempts == 1
+        assert job.finished_at is not None
+
+    def test_unknown_task(self):
+        with pytest.raises(ValueError):
+            enqueue("tests.missing")
+
+    def test_scheduled_jobs_wait(self):
+        record.enqueue(value="later", delay=60)
+        record.enqueue(value="past", run_at=timezone.now() - timedelta(seconds=1))
+        assert run_pending() == 1
+        assert calls == ["past"]
+
+    def test_key_deduplicates_pending_jobs(self):
+        assert record.enqueue(key="rebuild:1") is not None
+        assert record.enqueue(key="rebuild:1") is None
+        run_pending()
+        assert record.enqueue(key="rebuild:1") is not None
+
+    def test_claim_is_limited_to_queues(self):
+        record.enqueue()
+        hourly.enqueue()
+        jobs = claim(["maintenance"], 10, "worker-1")
+        assert [job.task for job in jobs] == ["tests.hourly"]
+        assert Job.objects.get(task="tests.hourly").worker == "worker-1"
+        assert claim(["maintenance"], 10, "worker-2") == []
+
+    def test_retries_with_backoff_then_fails(self, settings):
+        settings.JOB_RETRY_BASE_DELAY = 10
+        job = flaky.enqueue()
+        run_pending()
+        job.refresh_from_db()
+        assert job.status == Job.QUEUED
+        assert "boom" in job.last_error
+        assert 9 <= (job.run_at - timezone.now()).total_seconds() <= 11
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        run_pending()
+        job.refresh_from_db()
+        assert job.status == Job.FAILED
+        assert job.attempts == 2
+
+    def test_unregistered_task_is_not_retried(self):
+        job = Job.objects.create(task="tests.removed")
+        run_pending()
+        job.refresh_from_db()
+        assert job.status == Job.FAILED
+        assert job.attempts == 1
+
+    def test_periodic_tasks(self):
+        schedule_periodic()
+        schedule_periodic()
+        assert Job.objects.filter(task="tests.hourly").count() == 1
+        run_pending(["maintenance"])
+        assert calls == ["hourly"]
+        following = Job.objects.get(task="tests.hourly", status=Job.QUEUED)
+        assert 3590 <= (following.run_at - timezone.now()).total_seconds() <= 3600
+
+    def test_reclaims_abandoned_jobs(self):
+        stuck = record.enqueue()
+        exhausted = Job.objects.create(task="tests.record", max_attempts=1)
+        claim([], 10, "dead-worker")
+        Job.objects.update(started_at=timezone.now() - timedelta(hours=1))
+        assert reclaim_abandoned(timeout=60) == 2
+        stuck.refresh_from_db()
+        exhausted.refresh_from_db()
+        assert stuck.status == Job.QUEUED
+        assert exhausted.status == Job.FAILED
+
+
+@pytest.mark.unit
+class TestWorker:
+    def test_burst_runs_every_claimed_job(self):
+        batches = [[Job(pk=1), Job(pk=2), Job(pk=3)], [Job(pk=4)]]
+        worker = Worker(concurrency=2, poll_interval=0.01)
+        with (
+            mock.patch("jobs.worker.claim", side_effect=lambda queues, limit, name: batches.pop(0) if batches else []),
+            mock.patch("jobs.worker.execute", return_value=True) as execute,
+            mock.patch.object(worker, "_housekeeping"),
+        ):
+            worker.run(burst=True)
+        assert execute.call_count == 4
+        assert worker.stats == {"done": 4, "failed": 0}
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestJobMetrics:
+    def test_queue_stats(self):
+        record.enqueue(run_at=timezone.now() - timedelta(seconds=30))
+        hourly.enqueue(delay=60)
+        record.enqueue()
+        run_pending(["default"], worker="test")
+        stats = queue_stats()
+        assert stats["maintenance"]["queued"] == 1
+        assert stats["maintenance"]["lag_s"] == 0
+        assert stats["default"]["done"] == 2
+        assert stats["default"]["finished"] == 2
+        assert stats["default"]["run_ms"] >= 0
+
+    def test_endpoint_is_staff_only(self, api_client, create_user):
+        api_client.force_authenticate(user=create_user(email="user@example.com", password="pass"))
+        assert api_client.get(reverse("job-metrics")).status_code == status.HTTP_403_FORBIDDEN
+        api_client.force_authenticate(user=create_user(email="staff@example.com", password="pass", is_staff=True))
+        assert api_client.get(reverse("job-metrics")).status_code == status.HTTP_200_OK
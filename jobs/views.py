@@ -0,0 +1,16 @@
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from jobs.metrics import queue_stats
+
+
+class JobMetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    @extend_schema(
+        responses={200: OpenApiResponse(description="Jobs per status, lag, and recent wait and run times per queue")}
+    )
+    def get(self, request, *args, **kwargs):
+        return Response(queue_stats())
@@ -0,0 +1,164 @@
+"""
+Workers running the jobs of `jobs.queue`.
+
+A worker claims due jobs in one short transaction: `SELECT ... FOR UPDATE SKIP LOCKED` picks rows no other worker is
+claiming and an UPDATE marks them running, so the row locks are held for milliseconds rather than for the length of
+the job. Jobs then run on the worker's thread pool, each in autocommit mode like a request. A job whose worker
+died stays running until `JOB_TIMEOUT` seconds after it started, then it is queued again (or failed once it has no
+attempts left); tasks must finish well within that time and be safe to run twice.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from jobs.models import Job
+from jobs.queue import enqueue, registry, retry_delay
+
+logger = logging.getLogger(__name__)
+
+# Seconds between looking for abandoned jobs and periodic tasks without a queued run
+HOUSEKEEPING_INTERVAL = 60
+
+
+def claim(queues, limit, worker):
+    """Mark up to `limit` due jobs of `queues` (every queue when empty) as running in `worker`, and return them."""
+    now = timezone.now()
+    with transaction.atomic():
+        due = Job.objects.select_for_update(skip_locked=True).filter(status=Job.QUEUED, run_at__lte=now)
+        if queues:
+            due = due.filter(queue__in=queues)
+        jobs = list(due.order_by("run_at", "id")[:limit])
+        if jobs:
+            Job.objects.filter(pk__in=[job.pk for job in jobs]).update(
+                status=Job.RUNNING, started_at=now, worker=worker, attempts=F("attempts") + 1
+            )
+    for job in jobs:
+        job.status, job.started_at, job.worker, job.attempts = Job.RUNNING, now, worker, job.attempts + 1
+    return jobs
+
+
+def execute(job):
+    """Run a claimed job and record its outcome. Returns whether it succeeded."""
+    registered = registry.get(job.task)
+    try:
+        if registered is None:
+            raise LookupError(f"Unknown task {job.task!r}")
+        registered.func(**job.payload)
+    except Exception:
+        logger.exception("Job %s (%s) failed, attempt %d of %d", job.pk, job.task, job.attempts, job.max_attempts)
+        fail(job, traceback.format_exc(), retry=registered is not None)
+        return False
+    now = timezone.now()
+    with transaction.atomic():
+        Job.objects.filter(pk=job.pk).update(status=Job.DONE, finished_at=now, last_error="")
+        schedule_next(registered, now)
+    return True
+
+
+def fail(job, error, retry=True):
+    now = timezone.now()
+    if retry and job.attempts < job.max_attempts:
+        run_at = now + timedelta(seconds=retry_delay(job.attempts))
+        Job.objects.filter(pk=job.pk).update(status=Job.QUEUED, run_at=run_at, last_error=error)
+        return
+    with transaction.atomic():
+        Job.objects.filter(pk=job.pk).update(status=Job.FAILED, finished_at=now, last_error=error)
+        schedule_next(registry.get(job.task), now)
+
+
+def schedule_next(registered, now):
+    """Queue the next run of a periodic task, `every` after the last one ended."""
+    if registered is not None and registered.every:
+        enqueue(registered.name, run_at=now + registered.every, key=registered.periodic_key)
+
+
+def schedule_periodic():
+    """Queue an immediate run of every periodic task that has none queued or running, e.g. on first deploy."""
+    for registered in list(registry.values()):
+        if registered.every:
+            enqueue(registered.name, key=registered.periodic_key)
+
+
+def reclaim_abandoned(timeout=None):
+    """Queue again the jobs that have been running for longer than `timeout` seconds. Returns how many."""
+    timeout = settings.JOB_TIMEOUT if timeout is None else timeout
+    abandoned = Job.objects.filter(status=Job.RUNNING, started_at__lt=timezone.now() - timedelta(seconds=timeout))
+    error = f"Still running after {timeout} seconds, its worker is gone"
+    failed = abandoned.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.FAILED, finished_at=timezone.now(), last_error=error
+    )
+    return failed + abandoned.update(status=Job.QUEUED, run_at=timezone.now(), last_error=error)
+
+
+def run_pending(queues=(), worker="inline"):
+    """Run the due jobs one after the other in this thread until none is left, returns how many ran."""
+    count = 0
+    while jobs := claim(queues, 1, worker):
+        execute(jobs[0])
+        count += 1
+    return count
+
+
+class Worker:
+    """Runs the jobs of `queues` (every queue when empty), up to `concurrency` at a time."""
+
+    def __init__(self, queues=(), concurrency=4, poll_interval=1.0, name=None):
+        self.queues = list(queues)
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.stats = {"done": 0, "failed": 0}
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._housekeeping_at = None
+
+    def run(self, burst=False):
+        """Work until `stop` is called, or with `burst` until no job is due. Running jobs are always finished."""
+        running = set()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="jobs") as executor:
+            while not self._stop.is_set():
+                self._housekeeping()
+                free = self.concurrency - len(running)
+                jobs = claim(self.queues, free, self.name) if free else []
+                running |= {executor.submit(self._execute, job) for job in jobs}
+                if not running:
+                    if burst:
+                        break
+                    self._stop.wait(self.poll_interval)
+                elif not jobs or len(running) == self.concurrency:
+                    # Nothing more is due or every thread is busy: wait for a job to finish, polling meanwhile
+                    _, running = wait(running, timeout=self.poll_interval, return_when=FIRST_COMPLETED)
+            wait(running)
+
+    def stop(self):
+        self._stop.set()
+
+    def _execute(self, job):
+        try:
+            succeeded = execute(job)
+        finally:
+            # Worker threads live as long as the process, keep their connection only as long as a request would
+            connection.close_if_unusable_or_obsolete()
+        with self._lock:
+            self.stats["done" if succeeded else "failed"] += 1
+
+    def _housekeeping(self):
+        now = time.monotonic()
+        if self._housekeeping_at is not None and now - self._housekeeping_at < HOUSEKEEPING_INTERVAL:
+            return
+        self._housekeeping_at = now
+        reclaimed = reclaim_abandoned()
+        if reclaimed:
+            logger.warning("Reclaimed %d abandoned jobs", reclaimed)
+        schedule_periodic()
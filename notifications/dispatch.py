@@ -0,0 +1,154 @@
+"""
+Notification fan-out.
+
+`notify(kind, recipients, message)` pushes `message` to every device of the `recipients` (account ids or an account
+queryset) whose `notify_<kind>_in_app` preference is on. Nothing happens until the surrounding transaction commits;
+the delivery then runs on the dispatcher's worker pool, never on the request thread:
+
+- the recipients' tokens are resolved together with their preferences in one query,
+- the tokens are split into batches of the provider's `max_batch_size`, each sent by its own task, so a large
+  audience is spread over all workers,
+- tokens the provider reports as no longer registered are deleted, one query per batch, and counted as pruned,
+  those it failed to deliver to for any other reason (rate limits, oversized messages) are counted as failed.
+
+Several `notify` calls with the same `key` in one transaction deliver once, e.g. a profile saved field by field.
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from accounts.models import NotificationToken
+from core.transactions import once_on_commit
+from notifications.providers import ProviderError, build_provider
+
+logger = logging.getLogger(__name__)
+
+KINDS = ["applications", "messages", "profile_updates"]
+
+
+def resolve_tokens(kind, recipients):
+    """The device tokens of the `recipients` who want `kind` notifications."""
+    tokens = NotificationToken.objects.filter(
+        account__in=recipients, account__is_active=True, **{f"account__notify_{kind}_in_app": True}
+    )
+    return list(tokens.order_by("token").values_list("token", flat=True).distinct())
+
+
+class Dispatcher:
+    """
+    Sends notifications through `provider` on a pool of `max_workers` threads. With `max_workers=0` everything runs
+    inline in the caller, which tests rely on.
+    """
+
+    def __init__(self, provider, max_workers=4):
+        self.provider = provider
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notifications") if max_workers else None
+        )
+        self._stats = {"deliveries": 0, "sent": 0, "failed": 0, "pruned": 0}
+        self._lock = threading.Lock()
+
+    def submit(self, kind, recipients, message):
+        """Deliver `message` in the background."""
+        return self._run(self.deliver, kind, recipients, message)
+
+    def deliver(self, kind, recipients, message):
+        tokens = resolve_tokens(kind, recipients)
+        self._count(deliveries=1)
+        return self.send(tokens, message)
+
+    def send(self, tokens, message):
+        """Send `message` to `tokens` in batches, returns the batches' futures (None for those that ran inline)."""
+        size = self.provider.max_batch_size
+        return [
+            self._run(self._send_batch, tokens[start : start + size], message) for start in range(0, len(tokens), size)
+        ]
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def _send_batch(self, tokens, message):
+        try:
+            dead, failed = self.provider.send(tokens, message)
+        except ProviderError:
+            logger.exception("Failed to send %d notifications through %s", len(tokens), self.provider.name)
+            self._count(failed=len(tokens))
+            return
+        if failed:
+            logger.warning("%s failed to deliver %d of %d notifications", self.provider.name, len(failed), len(tokens))
+        self._count(sent=len(tokens) - len(dead) - len(failed), failed=len(failed), pruned=len(dead))
+        if dead:
+            NotificationToken.objects.filter(token__in=dead).delete()
+
+    def _count(self, **counts):
+        with self._lock:
+            for name, count in counts.items():
+                self._stats[name] += count
+
+    def _run(self, task, *args):
+        if self._executor is None:
+            task(*args)
+            return None
+        return self._executor.submit(self._in_worker, task, *args)
+
+    @staticmethod
+    def _in_worker(task, *args):
+        try:
+            task(*args)
+        except Exception:
+            logger.exception("Notification task failed")
+        finally:
+            # Workers live as long as the process, keep their connection only as long as a request thread would
+            connection.close_if_unusable_or_obsolete()
+
+
+class Delivery:
+    """A `notify` call waiting for the transaction to commit."""
+
+    def __init__(self, kind, recipients, message):
+        self.kind = kind
+        self.recipients = recipients
+        self.message = message
+
+    def __call__(self):
+        get_dispatcher().submit(self.kind, self.recipients, self.message)
+
+
+def notify(kind, recipients, message, key=None):
+    """Send `message` to the devices of `recipients` once the current transaction commits."""
+    if kind not in KINDS:
+        raise ValueError(f"Unknown notification kind {kind!r}")
+    if key is None:
+        transaction.on_commit(Delivery(kind, recipients, message))
+    else:
+        once_on_commit(("notifications.notify", key), lambda: Delivery(kind, recipients, message))
+
+
+_dispatcher = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher():
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = Dispatcher(build_provider(), max_workers=settings.NOTIFICATION_WORKERS)
+    return _dispatcher
+
+
+def set_dispatcher(dispatcher):
+    """Replace the process-wide dispatcher, e.g. with an inline one around a fake provider. Returns the previous one."""
+    global _dispatcher
+    with _dispatcher_lock:
+        previous, _dispatcher = _dispatcher, dispatcher
+    return previous
@@ -0,0 +1,50 @@
+"""The notifications the API sends, see `notifications.signals` for what triggers them."""
+
+from django.contrib.auth import get_user_model
+
+from notifications.dispatch import notify
+from notifications.providers import Message
+
+
+def new_applicant(applicant):
+    """Tell the coach who posted the opening."""
+    notify(
+        "applications",
+        get_user_model().objects.filter(coach__opening=applicant.opening_id),
+        Message(
+            "New applicant",
+            "An athlete applied to your opening.",
+            {"type": "applicant", "opening": applicant.opening_id, "applicant": applicant.pk},
+        ),
+    )
+
+
+def status_changed(opening_id, applicants):
+    """Tell the athletes of `applicants` (of one opening) their application has a new status."""
+    by_status = {}
+    for applicant in applicants:
+        by_status.setdefault(applicant.status, []).append(applicant.pk)
+    for status, ids in by_status.items():
+        notify(
+            "applications",
+            get_user_model().objects.filter(athlete__applicant__in=ids),
+            Message(
+                "Application update",
+                f"Your application was marked {status}.",
+                {"type": "applicant_status", "opening": opening_id, "status": status},
+            ),
+        )
+
+
+def profile_updated(athlete):
+    """Tell the coaches who saved the athlete, once per transaction however many times the profile is saved."""
+    notify(
+        "profile_updates",
+        get_user_model().objects.filter(coach__savedaccount__athlete=athlete.pk),
+        Message(
+            "Profile updated",
+            "An athlete you saved updated their profile.",
+            {"type": "profile_update", "athlete": str(athlete.uuid)},
+        ),
+        key=("profile_update", athlete.pk),
+    )
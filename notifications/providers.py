@@ -0,0 +1,95 @@
+"""
+Push notification providers.
+
+A provider sends one `Message` to a batch of at most `max_batch_size` device tokens. It returns a `SendResult` with the
+tokens the service reported as no longer registered, which the dispatcher deletes, and those it could not deliver to for
+any other reason, and raises `ProviderError` when the batch could not be sent at all. `NOTIFICATION_PROVIDER` selects
+the provider: "expo" sends through Expo's push service, "fake" keeps the messages in memory for tests, local development
+and benchmarks.
+"""
+
+import json
+import threading
+import time
+from collections import deque, namedtuple
+from urllib import error, request
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+Message = namedtuple("Message", ["title", "body", "data"])
+SendResult = namedtuple("SendResult", ["dead", "failed"])
+
+
+class ProviderError(Exception):
+    pass
+
+
+class ExpoProvider:
+    name = "expo"
+    max_batch_size = 100
+    url = "https://exp.host/--/api/v2/push/send"
+
+    def __init__(self, access_token=None, timeout=10):
+        self.access_token = access_token
+        self.timeout = timeout
+
+    def send(self, tokens, message):
+        payload = [
+            {"to": token, "title": message.title, "body": message.body, "data": message.data} for token in tokens
+        ]
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if self.access_token:
+            headers["Authorization"] = f"Bearer {self.access_token}"
+        push = request.Request(self.url, data=json.dumps(payload).encode(), headers=headers, method="POST")
+        try:
+            with request.urlopen(push, timeout=self.timeout) as response:
+                tickets = json.loads(response.read())["data"]
+        except (error.URLError, TimeoutError, ValueError, KeyError) as e:
+            raise ProviderError(str(e)) from e
+        # One ticket per message, in the order they were sent
+        dead, failed = set(), set()
+        for token, ticket in zip(tokens, tickets):
+            if ticket.get("status") == "error":
+                unregistered = ticket.get("details", {}).get("error") == "DeviceNotRegistered"
+                (dead if unregistered else failed).add(token)
+        return SendResult(dead, failed)
+
+
+class FakeProvider:
+    """
+    Records what it is asked to send, keeping the last `max_batches` batches and a count of every token. `latency`
+    seconds of sleep per batch simulate the round trip, tokens in `dead_tokens` are reported as no longer registered.
+    """
+
+    name = "fake"
+
+    def __init__(self, latency=0.0, max_batch_size=100, dead_tokens=(), max_batches=1000):
+        self.latency = latency
+        self.max_batch_size = max_batch_size
+        self.dead_tokens = set(dead_tokens)
+        self.batches = deque(maxlen=max_batches)
+        self.sent_count = 0
+        self._lock = threading.Lock()
+
+    def send(self, tokens, message):
+        if self.latency:
+            time.sleep(self.latency)
+        with self._lock:
+            self.batches.append((list(tokens), message))
+            self.sent_count += len(tokens)
+        return SendResult(self.dead_tokens.intersection(tokens), set())
+
+    @property
+    def sent(self):
+        """Every (token, message) of the batches kept."""
+        with self._lock:
+            return [(token, message) for tokens, message in self.batches for token in tokens]
+
+
+def build_provider():
+    if settings.NOTIFICATION_PROVIDER == "fake":
+        return FakeProvider(latency=settings.NOTIFICATION_FAKE_LATENCY)
+    if settings.NOTIFICATION_PROVIDER == "expo":
+        return ExpoProvider(access_token=settings.EXPO_ACCESS_TOKEN, timeout=settings.NOTIFICATION_TIMEOUT)
+    raise ImproperlyConfigured(f"Unknown NOTIFICATION_PROVIDER {settings.NOTIFICATION_PROVIDER!r}")
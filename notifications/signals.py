@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from accounts.models import Athlete
+from openings.models import Applicant
+
+from . import events
+
+
+@receiver(post_save, sender=Applicant)
+def notify_new_applicant(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        events.new_applicant(instance)
+
+
+@receiver(post_save, sender=Athlete)
+def notify_profile_update(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        events.profile_updated(instance)
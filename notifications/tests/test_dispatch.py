@@ -0,0 +1,169 @@
+import io
+import json
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+
+from academics.models import University
+from accounts.models import NotificationToken, SavedAccount
+from notifications.dispatch import Dispatcher, notify
+from notifications.providers import ExpoProvider, FakeProvider, Message, ProviderError, SendResult
+from openings.models import Applicant, Opening
+from sports.models import Sport
+
+MESSAGE = Message("Title", "Body", {})
+
+
+@pytest.fixture
+def coach(create_coach):
+    coach = create_coach(email="coach@example.com", password="pass", university=University.objects.create(name="U"))
+    NotificationToken.objects.create(account=coach.user, token="coach-phone")
+    return coach
+
+
+@pytest.fixture
+def athlete(create_athlete):
+    athlete = create_athlete(email="athlete@example.com", password="pass")
+    NotificationToken.objects.create(account=athlete.user, token="athlete-phone")
+    return athlete
+
+
+@pytest.fixture
+def opening(coach):
+    return Opening.objects.create(posted_by=coach, sport=Sport.objects.create(name="Soccer", gender="female"))
+
+
+def tokens(provider):
+    return sorted(token for token, _ in provider.sent)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestDispatcher:
+    def test_respects_preferences(self, coach, athlete, fake_push, django_capture_on_commit_callbacks):
+        athlete.user.notify_applications_in_app = False
+        athlete.user.save()
+        with django_capture_on_commit_callbacks(execute=True):
+            notify("applications", [coach.user.pk, athlete.user.pk], MESSAGE)
+        assert tokens(fake_push) == ["coach-phone"]
+
+    def test_sends_nothing_before_commit(self, coach, fake_push, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks() as callbacks:
+            notify("applications", [coach.user.pk], MESSAGE)
+        assert len(callbacks) == 1
+        assert fake_push.sent == []
+
+    def test_batches_and_prunes_dead_tokens(self, create_user):
+        users = [create_user(email=f"user{i}@example.com", password="pass") for i in range(5)]
+        for user in users:
+            NotificationToken.objects.create(account=user, token=f"token-{user.pk}")
+        dead = {f"token-{users[0].pk}", f"token-{users[3].pk}"}
+        provider = FakeProvider(max_batch_size=2, dead_tokens=dead)
+        dispatcher = Dispatcher(provider, max_workers=0)
+
+        dispatcher.deliver("applications", [user.pk for user in users], MESSAGE)
+        assert [len(batch) for batch, _ in provider.batches] == [2, 2, 1]
+        assert dispatcher.stats() == {"deliveries": 1, "sent": 3, "failed": 0, "pruned": 2}
+        assert not NotificationToken.objects.filter(token__in=dead).exists()
+        assert NotificationToken.objects.count() == 3
+
+    def test_provider_errors_do_not_stop_other_batches(self, create_user):
+        users = [create_user(email=f"user{i}@example.com", password="pass") for i in range(3)]
+        for user in users:
+            NotificationToken.objects.create(account=user, token=f"token-{user.pk}")
+        provider = FakeProvider(max_batch_size=1)
+        sent = SendResult(set(), set())
+        with mock.patch.object(provider, "send", side_effect=[sent, ProviderError("down"), sent]):
+            dispatcher = Dispatcher(provider, max_workers=0)
+            dispatcher.deliver("applications", [user.pk for user in users], MESSAGE)
+        assert dispatcher.stats()["sent"] == 2
+        assert dispatcher.stats()["failed"] == 1
+
+    def test_undelivered_tokens_count_as_failed(self, create_user):
+        users = [create_user(email=f"user{i}@example.com", password="pass") for i in range(3)]
+        for user in users:
+            NotificationToken.objects.create(account=user, token=f"token-{user.pk}")
+        provider = FakeProvider(max_batch_size=3)
+        result = SendResult({f"token-{users[0].pk}"}, {f"token-{users[1].pk}"})
+        with mock.patch.object(provider, "send", return_value=result):
+            dispatcher = Dispatcher(provider, max_workers=0)
+            dispatcher.deliver("applications", [user.pk for user in users], MESSAGE)
+        assert dispatcher.stats() == {"deliveries": 1, "sent": 1, "failed": 1, "pruned": 1}
+        assert NotificationToken.objects.count() == 2
+
+    def test_worker_pool(self):
+        provider = FakeProvider(max_batch_size=10)
+        dispatcher = Dispatcher(provider, max_workers=4)
+        futures = dispatcher.send([f"token-{i}" for i in range(95)], MESSAGE)
+        for future in futures:
+            future.result()
+        dispatcher.shutdown()
+        assert len(provider.batches) == 10
+        assert len(provider.sent) == 95
+
+    def test_fake_provider_keeps_a_bounded_history(self):
+        provider = FakeProvider(max_batch_size=1, max_batches=2)
+        for i in range(5):
+            provider.send([f"token-{i}"], MESSAGE)
+        assert tokens(provider) == ["token-3", "token-4"]
+        assert provider.sent_count == 5
+
+    def test_unknown_kind(self):
+        with pytest.raises(ValueError):
+            notify("newsletter", [], MESSAGE)
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestEvents:
+    def test_new_applicant_notifies_coach(self, coach, athlete, opening, fake_push, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            applicant = Applicant.objects.create(opening=opening, athlete=athlete)
+        assert tokens(fake_push) == ["coach-phone"]
+        assert fake_push.sent[0][1].data == {"type": "applicant", "opening": opening.pk, "applicant": applicant.pk}
+
+    def test_status_change_notifies_athlete(
+        self, api_client, coach, athlete, opening, fake_push, django_capture_on_commit_callbacks
+    ):
+        applicant = Applicant.objects.create(opening=opening, athlete=athlete)
+        api_client.force_authenticate(user=coach.user)
+        url = reverse("opening-applicants", kwargs={"id": opening.pk})
+        with django_capture_on_commit_callbacks(execute=True):
+            api_client.patch(url, {"applicants": [{"id": applicant.pk, "status": "accepted"}]}, format="json")
+            api_client.patch(url, {"applicants": [{"id": applicant.pk, "is_new": False}]}, format="json")
+        assert tokens(fake_push) == ["athlete-phone"]
+        assert fake_push.sent[0][1].data["status"] == "accepted"
+
+    def test_profile_update_notifies_saving_coaches_once(
+        self, coach, athlete, fake_push, django_capture_on_commit_callbacks
+    ):
+        SavedAccount.objects.create(coach=coach, athlete=athlete)
+        with django_capture_on_commit_callbacks(execute=True):
+            athlete.save()
+            athlete.save()
+        assert tokens(fake_push) == ["coach-phone"]
+
+
+@pytest.mark.unit
+class TestExpoProvider:
+    def response(self, tickets):
+        return io.BytesIO(json.dumps({"data": tickets}).encode())
+
+    def test_reports_unregistered_devices_and_failures(self):
+        tickets = [
+            {"status": "ok", "id": "1"},
+            {"status": "error", "details": {"error": "DeviceNotRegistered"}},
+            {"status": "error", "details": {"error": "MessageRateExceeded"}},
+        ]
+        with mock.patch("notifications.providers.request.urlopen", return_value=self.response(tickets)) as urlopen:
+            result = ExpoProvider(access_token="secret").send(["a", "b", "c"], MESSAGE)
+        assert result == SendResult(dead={"b"}, failed={"c"})
+        sent = urlopen.call_args.args[0]
+        assert [message["to"] for message in json.loads(sent.data)] == ["a", "b", "c"]
+        assert sent.get_header("Authorization") == "Bearer secret"
+
+    def test_unavailable(self):
+        with mock.patch("notifications.providers.request.urlopen", side_effect=TimeoutError()):
+            with pytest.raises(ProviderError):
+                ExpoProvider().send(["a"], MESSAGE)
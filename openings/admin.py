@@ -1,6 +1,7 @@
 from django.contrib import admin
 
-from .models import Applicant, Opening
+from .models import Applicant, Eligibility, Opening
 
 admin.site.register(Opening)
 admin.site.register(Applicant)
+admin.site.register(Eligibility)
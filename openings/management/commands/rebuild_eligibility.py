@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from openings import matching
+from openings.models import Eligibility
+
+
+class Command(BaseCommand):
+    help = "Recompute the athlete/opening eligibility table from scratch."
+
+    def handle(self, *args, **options):
+        matching.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"Eligibility rebuilt: {Eligibility.objects.count()} matches."))
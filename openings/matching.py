@@ -0,0 +1,182 @@
+"""
+Athlete/opening matching.
+
+An athlete is eligible for an opening when they play the opening's sport and meet every requirement the opening
+sets: graduation year, minimum GPA/SAT/ACT, budget range, one of the listed positions and the minimum score on each
+required exam. A requirement the athlete has no data for counts as unmet. Eligible pairs are stored in the
+`Eligibility` table so "openings I qualify for" and "athletes who qualify for my opening" are index lookups; the
+rows are refreshed for one athlete or one opening at a time as either side changes (see `openings.signals`).
+"""
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch, Q
+
+from academics.models import AthleteExam
+from accounts.models import Athlete
+
+from .models import Eligibility, Opening, OpeningExamScore
+
+SCORE_SCALES = {"sat": 1600, "act": 36}
+GPA_SCALE = {True: 5.0, False: 4.0}
+EXAM_SCALES = {"AP": 5, "IB": 7}
+BATCH_SIZE = 1000
+
+
+def best_exam_scores(athlete_exams):
+    """Map exam id to the athlete's best score on it (None when only unscored attempts are recorded)."""
+    scores = {}
+    for athlete_exam in athlete_exams:
+        best = scores.get(athlete_exam.exam_id)
+        if athlete_exam.score is not None and (best is None or athlete_exam.score > best):
+            best = athlete_exam.score
+        scores[athlete_exam.exam_id] = best
+    return scores
+
+
+def eligible_openings(athlete, exam_scores):
+    """Openings `athlete` qualifies for, given their `best_exam_scores`."""
+    if athlete.sport_id is None:
+        return Opening.objects.none()
+    openings = Opening.objects.filter(sport_id=athlete.sport_id)
+    values = {
+        "grad_year": athlete.highschool_grad_year,
+        "gpa": athlete.gpa,
+        "sat": athlete.sat,
+        "act": athlete.act,
+    }
+    for field, value in values.items():
+        lookup = "exact" if field == "grad_year" else "lte"
+        if value is None:
+            openings = openings.filter(**{f"{field}__isnull": True})
+        else:
+            openings = openings.filter(Q(**{f"{field}__isnull": True}) | Q(**{f"{field}__{lookup}": value}))
+    if athlete.budget is None:
+        openings = openings.filter(min_budget__isnull=True, max_budget__isnull=True)
+    else:
+        openings = openings.filter(Q(min_budget__isnull=True) | Q(min_budget__lte=athlete.budget))
+        openings = openings.filter(Q(max_budget__isnull=True) | Q(max_budget__gte=athlete.budget))
+
+    positions = Opening.positions.through.objects.filter(opening=OuterRef("pk"))
+    openings = openings.filter(~Exists(positions) | Exists(positions.filter(position_id=athlete.position_id)))
+
+    unmet = ~Q(exam_id__in=exam_scores)
+    for exam_id, score in exam_scores.items():
+        if score is None:
+            unmet |= Q(exam_id=exam_id, min_score__isnull=False)
+        else:
+            unmet |= Q(exam_id=exam_id, min_score__gt=score)
+    return openings.filter(~Exists(OpeningExamScore.objects.filter(unmet, opening=OuterRef("pk"))))
+
+
+def eligible_athletes(opening, exam_requirements):
+    """Athletes qualifying for `opening`, given its `OpeningExamScore` rows."""
+    athletes = Athlete.objects.filter(sport_id=opening.sport_id)
+    if opening.grad_year is not None:
+        athletes = athletes.filter(highschool_grad_year=opening.grad_year)
+    for field in ["gpa", "sat", "act"]:
+        if getattr(opening, field) is not None:
+            athletes = athletes.filter(**{f"{field}__gte": getattr(opening, field)})
+    if opening.min_budget is not None:
+        athletes = athletes.filter(budget__gte=opening.min_budget)
+    if opening.max_budget is not None:
+        athletes = athletes.filter(budget__lte=opening.max_budget)
+    position_ids = [position.id for position in opening.positions.all()]
+    if position_ids:
+        athletes = athletes.filter(position_id__in=position_ids)
+    for requirement in exam_requirements:
+        exams = AthleteExam.objects.filter(athlete=OuterRef("pk"), exam_id=requirement.exam_id)
+        if requirement.min_score is not None:
+            exams = exams.filter(score__gte=requirement.min_score)
+        athletes = athletes.filter(Exists(exams))
+    return athletes
+
+
+def _headroom(value, threshold, scale):
+    if value is None or scale <= (threshold or 0):
+        return None
+    return max(0.0, min(1.0, (value - (threshold or 0)) / (scale - (threshold or 0))))
+
+
+def match_score(athlete, opening, exam_scores, exam_requirements):
+    """
+    Score in 0-100 of how comfortably an eligible athlete clears the opening's academic bar: the average, over
+    GPA, SAT, ACT and each required exam, of how far the athlete sits between the opening's minimum (zero when none
+    is set) and the top of that scale.
+    """
+    parts = [
+        _headroom(athlete.gpa, opening.gpa, GPA_SCALE[athlete.is_gpa_weighted]),
+        _headroom(athlete.sat, opening.sat, SCORE_SCALES["sat"]),
+        _headroom(athlete.act, opening.act, SCORE_SCALES["act"]),
+    ]
+    for requirement in exam_requirements:
+        scale = EXAM_SCALES.get(requirement.exam.exam_type)
+        if scale:
+            parts.append(_headroom(exam_scores.get(requirement.exam_id), requirement.min_score, scale))
+    parts = [part for part in parts if part is not None]
+    if not parts:
+        return 0
+    return round(100 * sum(parts) / len(parts))
+
+
+@transaction.atomic
+def refresh_athlete(athlete_id):
+    """Recompute every `Eligibility` row of one athlete."""
+    athlete = Athlete.objects.filter(pk=athlete_id).first()
+    if athlete is None:
+        return
+    exam_scores = best_exam_scores(AthleteExam.objects.filter(athlete=athlete))
+    openings = eligible_openings(athlete, exam_scores).prefetch_related("openingexamscore_set__exam")
+    rows = [
+        Eligibility(
+            opening=opening,
+            athlete=athlete,
+            score=match_score(athlete, opening, exam_scores, opening.openingexamscore_set.all()),
+        )
+        for opening in openings
+    ]
+    Eligibility.objects.filter(athlete=athlete).exclude(opening__in=[row.opening for row in rows]).delete()
+    _save(rows)
+
+
+@transaction.atomic
+def refresh_opening(opening_id):
+    """Recompute every `Eligibility` row of one opening."""
+    opening = Opening.objects.prefetch_related("positions").filter(pk=opening_id).first()
+    if opening is None:
+        return
+    exam_requirements = list(OpeningExamScore.objects.select_related("exam").filter(opening=opening))
+    athletes = eligible_athletes(opening, exam_requirements)
+    Eligibility.objects.filter(opening=opening).exclude(athlete__in=athletes.values("pk")).delete()
+    if exam_requirements:
+        required = AthleteExam.objects.filter(exam_id__in=[r.exam_id for r in exam_requirements])
+        athletes = athletes.prefetch_related(Prefetch("athleteexam_set", queryset=required))
+    rows = []
+    for athlete in athletes.iterator(chunk_size=BATCH_SIZE):
+        exam_scores = best_exam_scores(athlete.athleteexam_set.all()) if exam_requirements else {}
+        rows.append(
+            Eligibility(
+                opening=opening,
+                athlete=athlete,
+                score=match_score(athlete, opening, exam_scores, exam_requirements),
+            )
+        )
+        if len(rows) >= BATCH_SIZE:
+            _save(rows)
+            rows = []
+    _save(rows)
+
+
+def _save(rows):
+    if rows:
+        Eligibility.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=["opening", "athlete"],
+            update_fields=["score", "updated_at"],
+        )
+
+
+def rebuild_all():
+    """Recompute the whole table, one opening at a time. Used to backfill and after bulk imports."""
+    for opening_id in Opening.objects.values_list("id", flat=True).iterator():
+        refresh_opening(opening_id)
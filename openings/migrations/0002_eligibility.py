@@ -0,0 +1,45 @@
+# Generated by Django 5.2.1 on 2026-10-18 20:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0004_account_notify_applications_in_app_and_more"),
+        ("openings", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Eligibility",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "score",
+                    models.PositiveSmallIntegerField(help_text="How comfortably the athlete clears the bar (0-100)"),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "athlete",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="eligibilities", to="accounts.athlete"
+                    ),
+                ),
+                (
+                    "opening",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="eligibilities", to="openings.opening"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "Eligibilities",
+                "indexes": [
+                    models.Index(fields=["athlete", "-score", "-id"], name="eligibility_athlete_score_idx"),
+                    models.Index(fields=["opening", "-score", "-id"], name="eligibility_opening_score_idx"),
+                ],
+                "unique_together": {("opening", "athlete")},
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+from core.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("openings", "0002_eligibility"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="applicant",
+            index=models.Index(fields=["opening", "-applied_at", "-id"], name="applicant_opening_recent_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="applicant",
+            index=models.Index(fields=["opening", "status", "-applied_at", "-id"], name="applicant_opening_status_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="opening",
+            index=models.Index(fields=["-created_at", "-id"], name="opening_recent_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="opening",
+            index=models.Index(fields=["sport", "-created_at", "-id"], name="opening_sport_recent_idx"),
+        ),
+        AddIndexConcurrently(
+            model_name="opening",
+            index=models.Index(
+                fields=["sport", "grad_year", "-created_at", "-id"], name="opening_sport_year_recent_idx"
+            ),
+        ),
+    ]
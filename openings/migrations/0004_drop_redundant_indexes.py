@@ -0,0 +1,29 @@
+# Generated by Django 5.2.1 on 2026-10-18 21:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from core.operations import RemoveForeignKeyIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # DROP INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ("openings", "0003_hot_indexes"),
+        ("sports", "0002_soccer"),
+    ]
+
+    operations = [
+        RemoveForeignKeyIndexConcurrently(
+            model_name="applicant",
+            name="opening",
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to="openings.opening"),
+        ),
+        RemoveForeignKeyIndexConcurrently(
+            model_name="opening",
+            name="sport",
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to="sports.sport"),
+        ),
+    ]
@@ -4,7 +4,8 @@ from django.db import models
 class Opening(models.Model):
     posted_by = models.ForeignKey("accounts.Coach", on_delete=models.CASCADE)
     description = models.TextField()
-    sport = models.ForeignKey("sports.Sport", on_delete=models.CASCADE)
+    # Indexed by opening_sport_recent_idx, which leads with the sport
+    sport = models.ForeignKey("sports.Sport", on_delete=models.CASCADE, db_index=False)
     positions = models.ManyToManyField("sports.Position", blank=True)
 
     gpa = models.FloatField(null=True, blank=True)
@@ -32,6 +33,14 @@ class Opening(models.Model):
             f"{self.posted_by.university.name if self.posted_by.university else 'No University'}"
         )
 
+    class Meta:
+        # `OpeningView` pages newest first, optionally narrowed to a sport and graduation year
+        indexes = [
+            models.Index(fields=["-created_at", "-id"], name="opening_recent_idx"),
+            models.Index(fields=["sport", "-created_at", "-id"], name="opening_sport_recent_idx"),
+            models.Index(fields=["sport", "grad_year", "-created_at", "-id"], name="opening_sport_year_recent_idx"),
+        ]
+
 
 class OpeningExamScore(models.Model):
     opening = models.ForeignKey(Opening, on_delete=models.CASCADE)
@@ -43,7 +52,8 @@ class OpeningExamScore(models.Model):
 
 
 class Applicant(models.Model):
-    opening = models.ForeignKey(Opening, on_delete=models.CASCADE)
+    # Indexed by the unique (opening, athlete) constraint and applicant_opening_recent_idx, which lead with the opening
+    opening = models.ForeignKey(Opening, on_delete=models.CASCADE, db_index=False)
     athlete = models.ForeignKey("accounts.Athlete", on_delete=models.CASCADE)
     applied_at = models.DateTimeField(auto_now_add=True)
     is_new = models.BooleanField(default=True)
@@ -64,3 +74,32 @@ class Applicant(models.Model):
 
     class Meta:
         unique_together = ("opening", "athlete")
+        # A coach's applicant list pages newest first, optionally narrowed to a status. The unread filter scans the
+        # recent index: `is_new` flips on every review, a partial index on it would be rewritten as often.
+        indexes = [
+            models.Index(fields=["opening", "-applied_at", "-id"], name="applicant_opening_recent_idx"),
+            models.Index(fields=["opening", "status", "-applied_at", "-id"], name="applicant_opening_status_idx"),
+        ]
+
+
+class Eligibility(models.Model):
+    """
+    Denormalized athlete/opening pairs where the athlete meets every requirement of the opening, maintained by
+    `openings.matching` whenever either side changes.
+    """
+
+    opening = models.ForeignKey(Opening, related_name="eligibilities", on_delete=models.CASCADE)
+    athlete = models.ForeignKey("accounts.Athlete", related_name="eligibilities", on_delete=models.CASCADE)
+    score = models.PositiveSmallIntegerField(help_text="How comfortably the athlete clears the bar (0-100)")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.athlete} eligible for {self.opening} ({self.score})"
+
+    class Meta:
+        verbose_name_plural = "Eligibilities"
+        unique_together = ("opening", "athlete")
+        indexes = [
+            models.Index(fields=["athlete", "-score", "-id"], name="eligibility_athlete_score_idx"),
+            models.Index(fields=["opening", "-score", "-id"], name="eligibility_opening_score_idx"),
+        ]
@@ -0,0 +1,13 @@
+from api.pagination import KeysetPagination
+
+
+class OpeningPagination(KeysetPagination):
+    ordering = ("-created_at", "-id")
+
+
+class MatchPagination(KeysetPagination):
+    ordering = ("-score", "-id")
+
+
+class ApplicantPagination(KeysetPagination):
+    ordering = ("-applied_at", "-id")
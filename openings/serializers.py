@@ -1,6 +1,8 @@
 from rest_framework import serializers
 
-from .models import Applicant, Opening
+from accounts.serializers import AthleteCardSerializer
+
+from .models import Applicant, Eligibility, Opening
 
 
 class OpeningSerializer(serializers.ModelSerializer):
@@ -26,6 +28,17 @@ class OpeningSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "posted_by", "created_at", "updated_at"]
 
 
+class ValidateOpeningQueryParams(serializers.Serializer):
+    sport = serializers.IntegerField(required=False, help_text="Only openings for this sport")
+    position = serializers.IntegerField(required=False, help_text="Only openings looking for this position")
+    grad_year = serializers.IntegerField(required=False, help_text="Only openings for this graduation year")
+    gpa = serializers.FloatField(required=False, help_text="Only openings whose GPA requirement this GPA meets")
+    sat = serializers.IntegerField(required=False, help_text="Only openings whose SAT requirement this score meets")
+    act = serializers.IntegerField(required=False, help_text="Only openings whose ACT requirement this score meets")
+    min_budget = serializers.IntegerField(required=False, help_text="Only openings whose budget range reaches this")
+    max_budget = serializers.IntegerField(required=False, help_text="Only openings whose budget range starts below")
+
+
 class ApplicantSerializer(serializers.ModelSerializer):
     class Meta:
         model = Applicant
@@ -38,3 +51,59 @@ class ApplicantSerializer(serializers.ModelSerializer):
             "status",
             "status_updated_at",
         ]
+
+
+APPLICANT_STATUSES = [choice for choice, _ in Applicant._meta.get_field("status").choices]
+BULK_APPLICANT_UPDATE_MAX_SIZE = 500
+
+
+class OpeningApplicantSerializer(serializers.ModelSerializer):
+    athlete = AthleteCardSerializer(read_only=True)
+
+    class Meta:
+        model = Applicant
+        fields = ["id", "applied_at", "is_new", "status", "status_updated_at", "athlete"]
+
+
+class ValidateApplicantQueryParams(serializers.Serializer):
+    status = serializers.ChoiceField(choices=APPLICANT_STATUSES, required=False, help_text="Only this status")
+    is_new = serializers.BooleanField(
+        required=False, allow_null=True, default=None, help_text="Only unread (true) or read (false) applicants"
+    )
+
+
+class ApplicantUpdateSerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    status = serializers.ChoiceField(choices=APPLICANT_STATUSES, required=False)
+    is_new = serializers.BooleanField(required=False)
+
+    def validate(self, data):
+        if "status" not in data and "is_new" not in data:
+            raise serializers.ValidationError("Provide status, is_new or both.")
+        return data
+
+
+class BulkApplicantUpdateSerializer(serializers.Serializer):
+    applicants = ApplicantUpdateSerializer(many=True, min_length=1, max_length=BULK_APPLICANT_UPDATE_MAX_SIZE)
+
+    def validate_applicants(self, applicants):
+        ids = [applicant["id"] for applicant in applicants]
+        if len(ids) != len(set(ids)):
+            raise serializers.ValidationError("Each applicant can only be listed once.")
+        return applicants
+
+
+class OpeningMatchSerializer(serializers.ModelSerializer):
+    opening = OpeningSerializer(read_only=True)
+
+    class Meta:
+        model = Eligibility
+        fields = ["score", "opening"]
+
+
+class AthleteMatchSerializer(serializers.ModelSerializer):
+    athlete = AthleteCardSerializer(read_only=True)
+
+    class Meta:
+        model = Eligibility
+        fields = ["score", "athlete"]
@@ -0,0 +1,56 @@
+from functools import partial
+
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from academics.models import AthleteExam
+from accounts.models import Athlete
+from core.transactions import once_on_commit
+
+from . import matching
+from .models import Opening, OpeningExamScore
+
+
+def schedule(refresh, pk):
+    """
+    Run `refresh(pk)` once the current transaction commits. A request that saves an opening, its positions and its
+    exam scores triggers several signals, the refresh only needs to run once.
+    """
+    once_on_commit(("openings.refresh", refresh, pk), lambda: partial(refresh, pk))
+
+
+@receiver(post_save, sender=Athlete)
+def refresh_athlete_eligibility(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule(matching.refresh_athlete, instance.pk)
+
+
+@receiver(post_save, sender=AthleteExam)
+@receiver(post_delete, sender=AthleteExam)
+def refresh_athlete_exam_eligibility(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule(matching.refresh_athlete, instance.athlete_id)
+
+
+@receiver(post_save, sender=Opening)
+def refresh_opening_eligibility(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule(matching.refresh_opening, instance.pk)
+
+
+@receiver(post_save, sender=OpeningExamScore)
+@receiver(post_delete, sender=OpeningExamScore)
+def refresh_opening_exam_eligibility(sender, instance, raw=False, **kwargs):
+    if not raw:
+        schedule(matching.refresh_opening, instance.opening_id)
+
+
+@receiver(m2m_changed, sender=Opening.positions.through)
+def refresh_opening_positions_eligibility(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    # Clearing a position's openings (reverse, post_clear) does not say which openings were affected, it is not
+    # done anywhere in the app and `rebuild_eligibility` repairs the table if it ever is.
+    opening_ids = (pk_set or []) if reverse else [instance.pk]
+    for opening_id in opening_ids:
+        schedule(matching.refresh_opening, opening_id)
@@ -0,0 +1,148 @@
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from academics.models import AthleteExam, Exam, University
+from openings import matching
+from openings.models import Eligibility, Opening, OpeningExamScore
+from sports.models import Position, Sport
+
+
+@pytest.fixture
+def sport():
+    return Sport.objects.create(name="Soccer", gender="female")
+
+
+@pytest.fixture
+def coach(create_coach):
+    return create_coach(email="coach@example.com", password="pass", university=University.objects.create(name="U"))
+
+
+@pytest.fixture
+def athlete(create_athlete, sport):
+    return create_athlete(
+        email="athlete@example.com",
+        password="pass",
+        sport=sport,
+        position=Position.objects.create(sport=sport, abbreviation="GK", name="Goalkeeper"),
+        gpa=3.6,
+        sat=1300,
+        budget=15000,
+        highschool_grad_year=2026,
+    )
+
+
+def eligible_opening_ids(athlete):
+    return set(Eligibility.objects.filter(athlete=athlete).values_list("opening_id", flat=True))
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestEligibility:
+    def test_requirements(self, athlete, coach, sport):
+        def opening(**kwargs):
+            return Opening.objects.create(posted_by=coach, sport=kwargs.pop("sport", sport), description="", **kwargs)
+
+        open_to_all = opening()
+        met = opening(gpa=3.5, sat=1200, grad_year=2026, min_budget=10000, max_budget=20000)
+        opening(gpa=3.8)
+        opening(act=20)
+        opening(grad_year=2027)
+        opening(max_budget=10000)
+        opening(sport=Sport.objects.create(name="Tennis", gender="female"))
+        other_position = opening()
+        other_position.positions.add(Position.objects.create(sport=sport, abbreviation="ST", name="Striker"))
+        same_position = opening()
+        same_position.positions.add(athlete.position)
+
+        matching.refresh_athlete(athlete.pk)
+        assert eligible_opening_ids(athlete) == {open_to_all.id, met.id, same_position.id}
+        for opening_id in Opening.objects.values_list("id", flat=True):
+            matching.refresh_opening(opening_id)
+        assert eligible_opening_ids(athlete) == {open_to_all.id, met.id, same_position.id}
+
+    def test_exam_requirements(self, athlete, coach, sport):
+        calculus = Exam.objects.create(name="Calculus", exam_type="AP")
+        biology = Exam.objects.create(name="Biology", exam_type="AP")
+        AthleteExam.objects.create(athlete=athlete, exam=calculus, score=4)
+        openings = {}
+        for name, exam, min_score in [("any", calculus, None), ("met", calculus, 4), ("high", calculus, 5)]:
+            openings[name] = Opening.objects.create(posted_by=coach, sport=sport, description=name)
+            OpeningExamScore.objects.create(opening=openings[name], exam=exam, min_score=min_score)
+        openings["missing"] = Opening.objects.create(posted_by=coach, sport=sport, description="missing")
+        OpeningExamScore.objects.create(opening=openings["missing"], exam=biology)
+
+        matching.refresh_athlete(athlete.pk)
+        assert eligible_opening_ids(athlete) == {openings["any"].id, openings["met"].id}
+        Eligibility.objects.all().delete()
+        for opening in openings.values():
+            matching.refresh_opening(opening.id)
+        assert eligible_opening_ids(athlete) == {openings["any"].id, openings["met"].id}
+
+    def test_score_rewards_headroom(self, athlete, coach, sport):
+        easy = Opening.objects.create(posted_by=coach, sport=sport, description="", gpa=2.0)
+        hard = Opening.objects.create(posted_by=coach, sport=sport, description="", gpa=3.5, sat=1250)
+        matching.refresh_athlete(athlete.pk)
+        scores = dict(Eligibility.objects.values_list("opening_id", "score"))
+        assert 0 <= scores[hard.id] < scores[easy.id] <= 100
+
+    def test_changes_refresh_incrementally(self, create_athlete, coach, sport, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            position = Position.objects.create(sport=sport, abbreviation="GK", name="Goalkeeper")
+            athlete = create_athlete(email="a@example.com", password="pass", sport=sport, position=position, gpa=3.6)
+            opening = Opening.objects.create(posted_by=coach, sport=sport, description="", gpa=3.5)
+        assert eligible_opening_ids(athlete) == {opening.id}
+
+        with django_capture_on_commit_callbacks(execute=True):
+            athlete.gpa = 3.0
+            athlete.save()
+        assert eligible_opening_ids(athlete) == set()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            opening.gpa = None
+            opening.save()
+            opening.positions.add(athlete.position)
+        assert eligible_opening_ids(athlete) == {opening.id}
+
+        exam = Exam.objects.create(name="Calculus", exam_type="AP")
+        with mock.patch("openings.matching.refresh_opening", wraps=matching.refresh_opening) as refresh:
+            with django_capture_on_commit_callbacks(execute=True):
+                OpeningExamScore.objects.create(opening=opening, exam=exam, min_score=3)
+                OpeningExamScore.objects.filter(opening=opening).first().save()
+        refresh.assert_called_once_with(opening.id)
+        assert eligible_opening_ids(athlete) == set()
+
+        with django_capture_on_commit_callbacks(execute=True):
+            AthleteExam.objects.create(athlete=athlete, exam=exam, score=5)
+        assert eligible_opening_ids(athlete) == {opening.id}
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestMatchViews:
+    def test_athlete_sees_openings_they_qualify_for(self, api_client, athlete, coach, sport):
+        low = Opening.objects.create(posted_by=coach, sport=sport, description="", gpa=2.0)
+        high = Opening.objects.create(posted_by=coach, sport=sport, description="", gpa=3.5)
+        Opening.objects.create(posted_by=coach, sport=sport, description="", gpa=3.9)
+        matching.refresh_athlete(athlete.pk)
+        api_client.force_authenticate(user=athlete.user)
+        response = api_client.get(reverse("opening-matches"))
+        assert response.status_code == status.HTTP_200_OK
+        assert [match["opening"]["id"] for match in response.data["results"]] == [low.id, high.id]
+
+    def test_coach_sees_qualifying_athletes(self, api_client, athlete, coach, sport):
+        opening = Opening.objects.create(posted_by=coach, sport=sport, description="")
+        matching.refresh_opening(opening.id)
+        api_client.force_authenticate(user=coach.user)
+        response = api_client.get(reverse("opening-athlete-matches", kwargs={"id": opening.id}))
+        assert response.status_code == status.HTTP_200_OK
+        assert [match["athlete"]["uuid"] for match in response.data["results"]] == [str(athlete.uuid)]
+
+    def test_coach_from_other_university_is_forbidden(self, api_client, coach, sport, create_coach):
+        opening = Opening.objects.create(posted_by=coach, sport=sport, description="")
+        other = create_coach(email="other@example.com", password="pass", university=University.objects.create(name="V"))
+        api_client.force_authenticate(user=other.user)
+        response = api_client.get(reverse("opening-athlete-matches", kwargs={"id": opening.id}))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
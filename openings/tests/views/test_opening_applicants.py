@@ -0,0 +1,118 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from academics.models import University
+from openings.models import Applicant, Opening
+from sports.models import Position, Sport
+
+
+@pytest.fixture
+def university():
+    return University.objects.create(name="U")
+
+
+@pytest.fixture
+def coach(create_coach, university):
+    return create_coach(email="coach@example.com", password="pass", university=university)
+
+
+@pytest.fixture
+def opening(coach):
+    return Opening.objects.create(posted_by=coach, sport=Sport.objects.create(name="Soccer", gender="female"))
+
+
+def apply(create_athlete, opening, count, start=0):
+    position, _ = Position.objects.get_or_create(
+        sport=opening.sport, abbreviation="GK", defaults={"name": "Goalkeeper"}
+    )
+    return [
+        Applicant.objects.create(
+            opening=opening,
+            athlete=create_athlete(
+                email=f"athlete{i}@example.com", password="pass", sport=opening.sport, position=position
+            ),
+        )
+        for i in range(start, start + count)
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestOpeningApplicants:
+    def url(self, opening):
+        return reverse("opening-applicants", kwargs={"id": opening.id})
+
+    def test_lists_newest_first_with_constant_queries(self, api_client, coach, opening, create_athlete):
+        api_client.force_authenticate(user=coach.user)
+        applicants = apply(create_athlete, opening, 1)
+        api_client.get(self.url(opening))  # fills the reference cache
+        with CaptureQueriesContext(connection) as small:
+            api_client.get(self.url(opening))
+        applicants += apply(create_athlete, opening, 4, start=1)
+        with CaptureQueriesContext(connection) as large:
+            response = api_client.get(self.url(opening), {"page_size": 3})
+        assert response.status_code == status.HTTP_200_OK
+        assert [a["id"] for a in response.data["results"]] == [a.id for a in applicants[::-1][:3]]
+        assert response.data["results"][0]["athlete"]["position"]["abbreviation"] == "GK"
+        assert len(large) == len(small)
+
+        response = api_client.get(response.data["next"])
+        assert [a["id"] for a in response.data["results"]] == [applicants[1].id, applicants[0].id]
+
+    def test_filters(self, api_client, coach, opening, create_athlete):
+        applicants = apply(create_athlete, opening, 3)
+        Applicant.objects.filter(id=applicants[0].id).update(status="accepted", is_new=False)
+        api_client.force_authenticate(user=coach.user)
+        response = api_client.get(self.url(opening), {"status": "accepted"})
+        assert [a["id"] for a in response.data["results"]] == [applicants[0].id]
+        response = api_client.get(self.url(opening), {"is_new": "true"})
+        assert {a["id"] for a in response.data["results"]} == {applicants[1].id, applicants[2].id}
+
+    def test_other_university_is_forbidden(self, api_client, opening, create_coach):
+        other = create_coach(email="other@example.com", password="pass", university=University.objects.create(name="V"))
+        api_client.force_authenticate(user=other.user)
+        assert api_client.get(self.url(opening)).status_code == status.HTTP_403_FORBIDDEN
+        response = api_client.patch(self.url(opening), {"applicants": [{"id": 1, "is_new": False}]}, format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_bulk_update_in_one_statement(self, api_client, coach, opening, create_athlete):
+        applicants = apply(create_athlete, opening, 3)
+        before = applicants[1].status_updated_at
+        api_client.force_authenticate(user=coach.user)
+        changes = [
+            {"id": applicants[0].id, "status": "accepted", "is_new": False},
+            {"id": applicants[1].id, "is_new": False},
+            {"id": applicants[2].id, "status": "rejected"},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.patch(self.url(opening), {"applicants": changes}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {"updated": 3}
+        assert sum(query["sql"].startswith("UPDATE") for query in queries) == 1
+
+        rows = {a.id: a for a in Applicant.objects.all()}
+        assert (rows[applicants[0].id].status, rows[applicants[0].id].is_new) == ("accepted", False)
+        assert (rows[applicants[1].id].status, rows[applicants[1].id].is_new) == ("pending", False)
+        assert rows[applicants[1].id].status_updated_at == before
+        assert (rows[applicants[2].id].status, rows[applicants[2].id].is_new) == ("rejected", True)
+        assert rows[applicants[2].id].status_updated_at > applicants[2].status_updated_at
+
+    def test_bulk_update_rejects_foreign_applicants(self, api_client, coach, opening, create_athlete):
+        applicant = apply(create_athlete, opening, 1)[0]
+        other_opening = Opening.objects.create(posted_by=coach, sport=opening.sport)
+        foreign = Applicant.objects.create(opening=other_opening, athlete=applicant.athlete)
+        api_client.force_authenticate(user=coach.user)
+        changes = [{"id": applicant.id, "status": "accepted"}, {"id": foreign.id, "status": "accepted"}]
+        response = api_client.patch(self.url(opening), {"applicants": changes}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["ids"] == [foreign.id]
+        assert not Applicant.objects.filter(status="accepted").exists()
+
+    def test_bulk_update_validation(self, api_client, coach, opening):
+        api_client.force_authenticate(user=coach.user)
+        for payload in [{"applicants": []}, {"applicants": [{"id": 1}]}, {"applicants": [{"id": 1, "status": "x"}]}]:
+            response = api_client.patch(self.url(opening), payload, format="json")
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
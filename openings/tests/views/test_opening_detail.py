@@ -0,0 +1,79 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from academics.models import University
+from openings.models import Applicant, Opening
+from sports.models import Sport
+
+
+@pytest.fixture
+def opening(create_coach):
+    coach = create_coach(email="coach@example.com", password="pass", university=University.objects.create(name="U"))
+    return Opening.objects.create(posted_by=coach, sport=Sport.objects.create(name="Soccer", gender="female"))
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestOpeningDetail:
+    def url(self, opening):
+        return reverse("opening-detail", kwargs={"id": opening.id})
+
+    def test_any_account_can_read(self, api_client, opening, create_athlete):
+        api_client.force_authenticate(user=create_athlete(email="athlete@example.com", password="pass").user)
+        response = api_client.get(self.url(opening))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["id"] == opening.id
+
+    def test_athlete_applies(self, api_client, opening, create_athlete):
+        athlete = create_athlete(email="athlete@example.com", password="pass")
+        api_client.force_authenticate(user=athlete.user)
+        response = api_client.post(self.url(opening))
+        assert response.status_code == status.HTTP_200_OK
+        assert Applicant.objects.filter(opening=opening, athlete=athlete).exists()
+
+    def test_coach_cannot_apply(self, api_client, opening):
+        api_client.force_authenticate(user=opening.posted_by.user)
+        response = api_client.post(self.url(opening))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not Applicant.objects.exists()
+
+    def test_athlete_cannot_apply_twice(self, api_client, opening, create_athlete):
+        athlete = create_athlete(email="athlete@example.com", password="pass")
+        api_client.force_authenticate(user=athlete.user)
+        api_client.post(self.url(opening))
+        response = api_client.post(self.url(opening))
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert Applicant.objects.filter(opening=opening, athlete=athlete).count() == 1
+
+    def test_coach_updates_own_opening(self, api_client, opening):
+        api_client.force_authenticate(user=opening.posted_by.user)
+        response = api_client.patch(
+            self.url(opening), {"description": "Updated", "sport": opening.sport_id}, format="json"
+        )
+        assert response.status_code == status.HTTP_200_OK
+        opening.refresh_from_db()
+        assert opening.description == "Updated"
+
+    def test_coach_deletes_own_opening(self, api_client, opening):
+        api_client.force_authenticate(user=opening.posted_by.user)
+        response = api_client.delete(self.url(opening))
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not Opening.objects.filter(id=opening.id).exists()
+
+    def test_other_university_cannot_update(self, api_client, opening, create_coach):
+        other = create_coach(email="other@example.com", password="pass", university=University.objects.create(name="V"))
+        api_client.force_authenticate(user=other.user)
+        response = api_client.patch(
+            self.url(opening), {"description": "Updated", "sport": opening.sport_id}, format="json"
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        opening.refresh_from_db()
+        assert opening.description == ""
+
+    def test_other_university_cannot_delete(self, api_client, opening, create_coach):
+        other = create_coach(email="other@example.com", password="pass", university=University.objects.create(name="V"))
+        api_client.force_authenticate(user=other.user)
+        response = api_client.delete(self.url(opening))
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert Opening.objects.filter(id=opening.id).exists()
@@ -0,0 +1,81 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from academics.models import Exam, University
+from openings.models import Opening, OpeningExamScore
+from sports.models import Position, Sport
+
+
+@pytest.fixture
+def coach(create_coach):
+    return create_coach(email="coach@example.com", password="pass", university=University.objects.create(name="U"))
+
+
+@pytest.fixture
+def sport():
+    return Sport.objects.create(name="Soccer", gender="female")
+
+
+def create_opening(coach, sport, **kwargs):
+    opening = Opening.objects.create(posted_by=coach, sport=sport, description="Opening", **kwargs)
+    position = Position.objects.create(sport=sport, abbreviation="GK", name="Goalkeeper")
+    opening.positions.add(position)
+    OpeningExamScore.objects.create(opening=opening, exam=Exam.objects.create(name="Calc", exam_type="AP"))
+    return opening
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestOpeningList:
+    url = reverse("opening")
+
+    def test_paginates_newest_first(self, api_client, coach, sport):
+        openings = [create_opening(coach, sport) for _ in range(3)]
+        api_client.force_authenticate(user=coach.user)
+        response = api_client.get(self.url, {"page_size": 2})
+        assert response.status_code == status.HTTP_200_OK
+        assert [o["id"] for o in response.data["results"]] == [openings[2].id, openings[1].id]
+        response = api_client.get(response.data["next"])
+        assert [o["id"] for o in response.data["results"]] == [openings[0].id]
+        assert response.data["next"] is None
+
+    def test_query_count_is_constant(self, api_client, coach, sport):
+        api_client.force_authenticate(user=coach.user)
+        create_opening(coach, sport)
+        with CaptureQueriesContext(connection) as small:
+            api_client.get(self.url)
+        for _ in range(5):
+            create_opening(coach, sport)
+        with CaptureQueriesContext(connection) as large:
+            response = api_client.get(self.url)
+        assert len(response.data["results"]) == 6
+        assert all(len(o["positions"]) == 1 and len(o["exam_scores"]) == 1 for o in response.data["results"])
+        assert len(large) == len(small)
+
+    def test_filters(self, api_client, coach, sport):
+        other_sport = Sport.objects.create(name="Tennis", gender="female")
+        strict = create_opening(coach, sport, gpa=3.8, sat=1400, grad_year=2026, min_budget=10000, max_budget=20000)
+        lenient = create_opening(coach, sport, grad_year=2026)
+        create_opening(coach, other_sport, grad_year=2026)
+        api_client.force_authenticate(user=coach.user)
+
+        def ids(**params):
+            response = api_client.get(self.url, params)
+            assert response.status_code == status.HTTP_200_OK
+            return {o["id"] for o in response.data["results"]}
+
+        assert ids(sport=sport.id) == {strict.id, lenient.id}
+        assert ids(sport=sport.id, gpa=3.5) == {lenient.id}
+        assert ids(sport=sport.id, gpa=3.9, sat=1450) == {strict.id, lenient.id}
+        assert ids(sport=sport.id, max_budget=5000) == {lenient.id}
+        assert ids(sport=sport.id, min_budget=15000, max_budget=30000) == {strict.id, lenient.id}
+        assert ids(position=strict.positions.get().id) == {strict.id}
+        assert ids(grad_year=2027) == set()
+
+    def test_rejects_invalid_filters(self, api_client, coach):
+        api_client.force_authenticate(user=coach.user)
+        response = api_client.get(self.url, {"gpa": "high"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
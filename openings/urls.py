@@ -1,9 +1,19 @@
 from django.urls import path
 
-from .views import ApplicantListView, OpeningDetailView, OpeningView
+from .views import (
+    ApplicantListView,
+    AthleteMatchListView,
+    OpeningApplicantListView,
+    OpeningDetailView,
+    OpeningMatchListView,
+    OpeningView,
+)
 
 urlpatterns = [
     path("<int:id>/", OpeningDetailView.as_view(), name="opening-detail"),
+    path("<int:id>/applicants/", OpeningApplicantListView.as_view(), name="opening-applicants"),
+    path("<int:id>/matches/", AthleteMatchListView.as_view(), name="opening-athlete-matches"),
+    path("matches/", OpeningMatchListView.as_view(), name="opening-matches"),
     path("", OpeningView.as_view(), name="opening"),
     path("my-applications/", ApplicantListView.as_view(), name="applicant-list"),
 ]
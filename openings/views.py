@@ -1,15 +1,66 @@
+from django.db import transaction
+from django.db.models import Prefetch, Q
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import generics
-from rest_framework.decorators import permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from academics.models import Exam
+from accounts.serializers import ATHLETE_CARD_RELATIONS
+from notifications import events
+from sports.models import Position
 from user_auth.permissions import AllowAthlete, AllowCoach, AllowSameUniversity
 
-from .models import Applicant, Opening
-from .serializers import ApplicantSerializer, OpeningSerializer
+from .models import Applicant, Eligibility, Opening
+from .pagination import ApplicantPagination, MatchPagination, OpeningPagination
+from .serializers import (
+    ApplicantSerializer,
+    AthleteMatchSerializer,
+    BulkApplicantUpdateSerializer,
+    OpeningApplicantSerializer,
+    OpeningMatchSerializer,
+    OpeningSerializer,
+    ValidateApplicantQueryParams,
+    ValidateOpeningQueryParams,
+)
+
+
+def filter_openings(queryset, filters):
+    """
+    Narrow `queryset` to the openings matching the validated `ValidateOpeningQueryParams` data. GPA, SAT and ACT are
+    compared against each opening's minimum, a missing minimum matches everything.
+    """
+    if "sport" in filters:
+        queryset = queryset.filter(sport_id=filters["sport"])
+    if "position" in filters:
+        queryset = queryset.filter(positions=filters["position"])
+    if "grad_year" in filters:
+        queryset = queryset.filter(grad_year=filters["grad_year"])
+    for threshold in ["gpa", "sat", "act"]:
+        if threshold in filters:
+            queryset = queryset.filter(
+                Q(**{f"{threshold}__isnull": True}) | Q(**{f"{threshold}__lte": filters[threshold]})
+            )
+    if "min_budget" in filters:
+        queryset = queryset.filter(Q(max_budget__isnull=True) | Q(max_budget__gte=filters["min_budget"]))
+    if "max_budget" in filters:
+        queryset = queryset.filter(Q(min_budget__isnull=True) | Q(min_budget__lte=filters["max_budget"]))
+    return queryset
+
+
+def opening_prefetches(prefix=""):
+    # OpeningSerializer renders the M2M columns as primary keys, prefetch just those
+    return [
+        Prefetch(f"{prefix}positions", queryset=Position.objects.only("id")),
+        Prefetch(f"{prefix}exam_scores", queryset=Exam.objects.only("id")),
+    ]
+
+
+def opening_queryset():
+    return Opening.objects.prefetch_related(*opening_prefetches())
 
 
 class OpeningView(APIView):
@@ -19,14 +70,22 @@ class OpeningView(APIView):
         return [IsAuthenticated()]
 
     @extend_schema(
+        parameters=[ValidateOpeningQueryParams],
         responses={
-            200: OpenApiResponse(description="List of openings retrieved successfully"),
+            200: OpenApiResponse(
+                response=OpeningSerializer(many=True),
+                description="Page of openings, newest first",
+            ),
         },
     )
     def get(self, request, *args, **kwargs):
-        openings = Opening.objects.all()
-        serializer = OpeningSerializer(openings, many=True)
-        return Response(serializer.data)
+        query_params = ValidateOpeningQueryParams(data=request.query_params)
+        query_params.is_valid(raise_exception=True)
+        openings = filter_openings(opening_queryset(), query_params.validated_data)
+        paginator = OpeningPagination()
+        page = paginator.paginate_queryset(openings, request, view=self)
+        serializer = OpeningSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @extend_schema(
         request=OpeningSerializer,
@@ -58,17 +117,29 @@ class OpeningView(APIView):
 
 
 class OpeningDetailView(APIView):
+    def get_permissions(self):
+        if self.request.method == "POST":
+            return [IsAuthenticated(), AllowAthlete()]
+        if self.request.method in ("PATCH", "DELETE"):
+            return [IsAuthenticated(), AllowCoach(), AllowSameUniversity()]
+        return [IsAuthenticated()]
+
+    def get_own_opening(self, request, opening_id):
+        """The opening, once the requesting coach is confirmed to be from the university that posted it."""
+        opening = get_object_or_404(Opening.objects.select_related("posted_by__university"), id=opening_id)
+        self.check_object_permissions(request, opening)
+        return opening
+
     @extend_schema(
         responses={
             200: OpenApiResponse(description="Opening retrieved successfully"),
             404: OpenApiResponse(description="Opening not found"),
         },
     )
-    @permission_classes([IsAuthenticated])
     def get(self, request, *args, **kwargs):
         opening_id = kwargs.get("id")
         try:
-            opening = Opening.objects.get(id=opening_id)
+            opening = opening_queryset().get(id=opening_id)
         except Opening.DoesNotExist:
             return Response({"detail": "Opening not found"}, status=404)
         serializer = OpeningSerializer(opening)
@@ -79,16 +150,12 @@ class OpeningDetailView(APIView):
         responses={
             200: OpenApiResponse(description="Opening updated successfully"),
             400: OpenApiResponse(description="Invalid data"),
+            403: OpenApiResponse(description="Opening posted by another university"),
             404: OpenApiResponse(description="Opening not found"),
         },
     )
-    @permission_classes([IsAuthenticated, AllowCoach, AllowSameUniversity])
     def patch(self, request, *args, **kwargs):
-        opening_id = kwargs.get("id")
-        try:
-            opening = Opening.objects.get(id=opening_id)
-        except Opening.DoesNotExist:
-            return Response({"detail": "Opening not found"}, status=404)
+        opening = self.get_own_opening(request, kwargs.get("id"))
         serializer = OpeningSerializer(opening, data=request.data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -100,30 +167,28 @@ class OpeningDetailView(APIView):
             200: OpenApiResponse(description="Applied successfully"),
             400: OpenApiResponse(description="Invalid data"),
             404: OpenApiResponse(description="Opening not found"),
+            409: OpenApiResponse(description="Already applied to this opening"),
         },
         summary="Apply to an opening",
     )
-    @permission_classes([IsAuthenticated, AllowAthlete])
     def post(self, request, *args, **kwargs):
         opening_id = kwargs.get("id")
         opening = get_object_or_404(Opening, id=opening_id)
-        Applicant.objects.create(opening=opening, athlete=request.user.athlete)
+        _, created = Applicant.objects.get_or_create(opening=opening, athlete=request.user.athlete)
+        if not created:
+            return Response({"detail": "Already applied to this opening."}, status=409)
         # Logic for applying to the opening goes here
         return Response({"detail": "Applied successfully"}, status=200)
 
     @extend_schema(
         responses={
             204: OpenApiResponse(description="Opening deleted successfully"),
+            403: OpenApiResponse(description="Opening posted by another university"),
             404: OpenApiResponse(description="Opening not found"),
         },
     )
-    @permission_classes([IsAuthenticated, AllowCoach, AllowSameUniversity])
     def delete(self, request, *args, **kwargs):
-        opening_id = kwargs.get("id")
-        try:
-            opening = Opening.objects.get(id=opening_id)
-        except Opening.DoesNotExist:
-            return Response({"detail": "Opening not found"}, status=404)
+        opening = self.get_own_opening(request, kwargs.get("id"))
         opening.delete()
         return Response(status=204)
 
@@ -137,3 +202,123 @@ class ApplicantListView(generics.ListAPIView):
         if athlete_id:
             return Applicant.objects.filter(athlete_id=athlete_id)
         return Applicant.objects.none()
+
+
+class OpeningApplicantListView(APIView):
+    permission_classes = [IsAuthenticated, AllowCoach, AllowSameUniversity]
+
+    def get_opening(self, request, opening_id):
+        opening = get_object_or_404(Opening.objects.select_related("posted_by__university"), id=opening_id)
+        self.check_object_permissions(request, opening)
+        return opening
+
+    @extend_schema(
+        parameters=[ValidateApplicantQueryParams],
+        responses={
+            200: OpenApiResponse(
+                response=OpeningApplicantSerializer(many=True),
+                description="Page of the opening's applicants, most recent first",
+            ),
+            404: OpenApiResponse(description="Opening not found"),
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        opening = self.get_opening(request, kwargs.get("id"))
+        query_params = ValidateApplicantQueryParams(data=request.query_params)
+        query_params.is_valid(raise_exception=True)
+        filters = query_params.validated_data
+
+        applicants = Applicant.objects.filter(opening=opening).select_related(
+            *[f"athlete__{relation}" for relation in ATHLETE_CARD_RELATIONS]
+        )
+        if "status" in filters:
+            applicants = applicants.filter(status=filters["status"])
+        if filters.get("is_new") is not None:
+            applicants = applicants.filter(is_new=filters["is_new"])
+        paginator = ApplicantPagination()
+        page = paginator.paginate_queryset(applicants, request, view=self)
+        return paginator.get_paginated_response(OpeningApplicantSerializer(page, many=True).data)
+
+    @extend_schema(
+        request=BulkApplicantUpdateSerializer,
+        responses={
+            200: OpenApiResponse(description="Applicants updated"),
+            400: OpenApiResponse(description="Invalid data or applicants not belonging to the opening"),
+            404: OpenApiResponse(description="Opening not found"),
+        },
+        summary="Change the status and/or read state of many applicants at once",
+    )
+    def patch(self, request, *args, **kwargs):
+        opening = self.get_opening(request, kwargs.get("id"))
+        serializer = BulkApplicantUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        changes = {change["id"]: change for change in serializer.validated_data["applicants"]}
+
+        with transaction.atomic():
+            applicants = list(
+                Applicant.objects.select_for_update()
+                .filter(opening=opening, id__in=changes)
+                .only("id", "status", "is_new", "status_updated_at")
+            )
+            missing = changes.keys() - {applicant.id for applicant in applicants}
+            if missing:
+                return Response({"detail": "Applicants not found for this opening", "ids": sorted(missing)}, status=400)
+            # bulk_update bypasses save(), so auto_now is not applied; only a status change moves status_updated_at
+            now = timezone.now()
+            status_changed = []
+            for applicant in applicants:
+                change = changes[applicant.id]
+                if "status" in change and change["status"] != applicant.status:
+                    applicant.status = change["status"]
+                    applicant.status_updated_at = now
+                    status_changed.append(applicant)
+                applicant.is_new = change.get("is_new", applicant.is_new)
+            Applicant.objects.bulk_update(applicants, ["status", "is_new", "status_updated_at"], batch_size=500)
+            # bulk_update sends no post_save, the athletes are notified here
+            events.status_changed(opening.pk, status_changed)
+        return Response({"updated": len(applicants)}, status=200)
+
+
+class OpeningMatchListView(APIView):
+    permission_classes = [IsAuthenticated, AllowAthlete]
+
+    @extend_schema(
+        responses={
+            200: OpenApiResponse(
+                response=OpeningMatchSerializer(many=True),
+                description="Openings the athlete qualifies for, best match first",
+            ),
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        matches = (
+            Eligibility.objects.filter(athlete=request.user.athlete)
+            .select_related("opening")
+            .prefetch_related(*opening_prefetches("opening__"))
+        )
+        paginator = MatchPagination()
+        page = paginator.paginate_queryset(matches, request, view=self)
+        return paginator.get_paginated_response(OpeningMatchSerializer(page, many=True).data)
+
+
+class AthleteMatchListView(APIView):
+    permission_classes = [IsAuthenticated, AllowCoach, AllowSameUniversity]
+
+    @extend_schema(
+        responses={
+            200: OpenApiResponse(
+                response=AthleteMatchSerializer(many=True),
+                description="Athletes qualifying for the opening, best match first",
+            ),
+            404: OpenApiResponse(description="Opening not found"),
+        },
+    )
+    def get(self, request, *args, **kwargs):
+        opening = get_object_or_404(Opening.objects.select_related("posted_by__university"), id=kwargs.get("id"))
+        self.check_object_permissions(request, opening)
+        matches = Eligibility.objects.filter(opening=opening).select_related(
+            *[f"athlete__{relation}" for relation in ATHLETE_CARD_RELATIONS]
+        )
+        paginator = MatchPagination()
+        page = paginator.paginate_queryset(matches, request, view=self)
+        return paginator.get_paginated_response(AthleteMatchSerializer(page, many=True).data)
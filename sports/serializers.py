@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from academics.serializers import HighschoolSerializer
+from core.reference import ReferenceField
 
 from .models import Club, League, PersonalStatistic, Position, Sport, SportStatistic
 
@@ -12,7 +12,7 @@ class SportSerializer(serializers.ModelSerializer):
 
 
 class ClubSerializer(serializers.ModelSerializer):
-    sport = SportSerializer(read_only=True)
+    sport = ReferenceField("sports.Sport")
 
     class Meta:
         model = Club
@@ -26,8 +26,8 @@ class PersonalStatisticSerializer(serializers.ModelSerializer):
 
 
 class SportStatisticSerializer(serializers.ModelSerializer):
-    sport = SportSerializer(read_only=True)
-    highschool = HighschoolSerializer(read_only=True)
+    sport = ReferenceField("sports.Sport")
+    highschool = ReferenceField("academics.Highschool")
     club = ClubSerializer(read_only=True)
 
     class Meta:
@@ -45,7 +45,7 @@ class SportStatisticSerializer(serializers.ModelSerializer):
 
 
 class PositionSerializer(serializers.ModelSerializer):
-    sport = SportSerializer(read_only=True)
+    sport = ReferenceField("sports.Sport")
 
     class Meta:
         model = Position
@@ -53,8 +53,47 @@ class PositionSerializer(serializers.ModelSerializer):
 
 
 class LeagueSerializer(serializers.ModelSerializer):
-    sport = SportSerializer(read_only=True)
+    sport = ReferenceField("sports.Sport")
 
     class Meta:
         model = League
         fields = ["id", "name", "sport", "level"]
+
+
+class ClubUpdateSerializer(serializers.Serializer):
+    """A club on a profile update, matched by name within the athlete's sport and created when missing."""
+
+    name = serializers.CharField(max_length=255)
+
+
+class LeagueUpdateSerializer(serializers.Serializer):
+    """A league on a profile update, matched by name and level within the athlete's sport and created when missing."""
+
+    name = serializers.CharField(max_length=255)
+    level = serializers.ChoiceField(choices=League._meta.get_field("level").choices, default="highschool")
+
+
+class PersonalStatisticUpdateSerializer(serializers.ModelSerializer):
+    """A personal statistic on a profile update, rows without an `id` are created."""
+
+    id = serializers.IntegerField(required=False)
+
+    class Meta:
+        model = PersonalStatistic
+        fields = ["id", "name", "value"]
+
+
+class SportStatisticUpdateSerializer(serializers.ModelSerializer):
+    """
+    A sport statistic on a profile update, rows without an `id` are created. References are plain ids (the high
+    school by uuid) and are resolved for the whole list at once; `sport` defaults to the athlete's sport.
+    """
+
+    id = serializers.IntegerField(required=False)
+    sport = serializers.IntegerField(required=False)
+    club = serializers.IntegerField(required=False, allow_null=True)
+    highschool = serializers.UUIDField(required=False, allow_null=True)
+
+    class Meta:
+        model = SportStatistic
+        fields = ["id", "sport", "name", "year", "season", "club", "highschool", "value"]
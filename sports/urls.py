@@ -0,0 +1,10 @@
+from django.urls import path
+
+from .views import ClubCatalogView, LeagueCatalogView, PositionCatalogView, SportCatalogView
+
+urlpatterns = [
+    path("clubs/", ClubCatalogView.as_view(), name="club-catalog"),
+    path("leagues/", LeagueCatalogView.as_view(), name="league-catalog"),
+    path("positions/", PositionCatalogView.as_view(), name="position-catalog"),
+    path("", SportCatalogView.as_view(), name="sport-catalog"),
+]
@@ -1 +1,38 @@
-# Create your views here.
+from core.views import CatalogView, catalog_schema
+
+from .serializers import ClubSerializer, LeagueSerializer, PositionSerializer, SportSerializer
+
+
+class SportCatalogView(CatalogView):
+    table = "sports.Sport"
+
+    @catalog_schema(SportSerializer)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class PositionCatalogView(CatalogView):
+    table = "sports.Position"
+    filter_by_sport = True
+
+    @catalog_schema(PositionSerializer, filter_by_sport=True)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class ClubCatalogView(CatalogView):
+    table = "sports.Club"
+    filter_by_sport = True
+
+    @catalog_schema(ClubSerializer, filter_by_sport=True)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+
+class LeagueCatalogView(CatalogView):
+    table = "sports.League"
+    filter_by_sport = True
+
+    @catalog_schema(LeagueSerializer, filter_by_sport=True)
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
@@ -0,0 +1,129 @@
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityTracker:
+    """
+    Write-behind buffer of account activity: when each account was last seen and how many requests it made.
+
+    `record` only touches memory. Every `flush_interval` seconds, or as soon as `max_pending` accounts are waiting, a
+    background thread writes everything buffered with a single `UPDATE ... FROM (VALUES ...)` per `batch_size` accounts,
+    setting `last_login` and adding to `request_count`. Each batch commits on its own, a flush that fails puts the rows
+    of the batches it did not write back to be retried with the next one. What is still buffered when the process exits
+    is flushed by an `atexit` hook; a crashed process loses at most one interval of activity.
+    """
+
+    def __init__(self, flush_interval=60, max_pending=10000, batch_size=1000):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+
+        self._seen = {}
+        self._requests = {}
+        self._lock = threading.Lock()
+        self._flushed_at = time.monotonic()
+        self._flushing = False
+
+    def record(self, account_id):
+        now = timezone.now()
+        with self._lock:
+            self._seen[account_id] = now
+            self._requests[account_id] = self._requests.get(account_id, 0) + 1
+            due = len(self._seen) >= self.max_pending or time.monotonic() - self._flushed_at >= self.flush_interval
+        if due:
+            self._flush_in_background()
+
+    def pending(self):
+        """The requests counted per account since the last flush."""
+        with self._lock:
+            return dict(self._requests)
+
+    def flush(self):
+        """Write the buffered activity, returns the number of accounts written."""
+        with self._lock:
+            seen, requests = self._seen, self._requests
+            self._seen, self._requests = {}, {}
+            self._flushed_at = time.monotonic()
+        rows = [(account_id, seen[account_id], requests[account_id]) for account_id in sorted(seen)]
+        written = 0
+        try:
+            for start in range(0, len(rows), self.batch_size):
+                write_activity(rows[start : start + self.batch_size])
+                written = start + self.batch_size
+        except Exception:
+            # Restoring a batch that was written would count its requests twice
+            self._restore(rows[written:])
+            raise
+        return len(rows)
+
+    def clear(self):
+        with self._lock:
+            self._seen, self._requests = {}, {}
+            self._flushed_at = time.monotonic()
+
+    def _restore(self, rows):
+        with self._lock:
+            for account_id, at, requests in rows:
+                self._seen[account_id] = max(at, self._seen.get(account_id, at))
+                self._requests[account_id] = self._requests.get(account_id, 0) + requests
+
+    def _flush_in_background(self):
+        with self._lock:
+            if self._flushing:
+                return
+            self._flushing = True
+
+        def run():
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Failed to write account activity")
+            finally:
+                # The thread's connection is not closed by Django's request handling
+                connection.close()
+                self._flushing = False
+
+        threading.Thread(target=run, name="activity-flush", daemon=True).start()
+
+
+def write_activity(rows):
+    """Set `last_login` and add to `request_count` for `rows` of (account id, last seen, requests) in one query."""
+    if not rows:
+        return
+    Account = get_user_model()
+    last_login = Account._meta.get_field("last_login")
+    table = connection.ops.quote_name(Account._meta.db_table)
+    placeholders = ", ".join(["(%s, %s, %s)"] * len(rows))
+    params = []
+    for account_id, seen, requests in rows:
+        params += [account_id, last_login.get_db_prep_save(seen, connection), requests]
+    # VALUES columns are named column1, column2, ... by both Postgres and SQLite
+    sql = (
+        f"UPDATE {table} SET last_login = activity.column2, request_count = request_count + activity.column3 "
+        f"FROM (VALUES {placeholders}) AS activity WHERE {table}.id = activity.column1"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+tracker = ActivityTracker(
+    flush_interval=getattr(settings, "ACTIVITY_FLUSH_INTERVAL", 60),
+    max_pending=getattr(settings, "ACTIVITY_MAX_PENDING", 10000),
+)
+
+
+@atexit.register
+def _flush_at_exit():
+    try:
+        tracker.flush()
+    except Exception:
+        logger.exception("Failed to write account activity at exit")
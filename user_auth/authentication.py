@@ -0,0 +1,40 @@
+import jwt
+from django.contrib.auth import get_user_model
+from django.utils.translation import gettext as _
+from rest_framework import exceptions
+from rest_framework_jwt.authentication import JSONWebTokenAuthentication
+
+from api.replicas import identify
+from user_auth.jwt import get_verified_token
+
+
+class CognitoJSONWebTokenAuthentication(JSONWebTokenAuthentication):
+    """
+    JWT authentication that resolves the user from the verified-token cache.
+
+    A cached token skips signature verification and the account upsert, leaving a single primary key lookup.
+    """
+
+    def authenticate(self, request):
+        jwt_value = self.get_jwt_value(request)
+        if jwt_value is None:
+            return None
+
+        try:
+            verified = get_verified_token(jwt_value)
+        except jwt.ExpiredSignature:
+            raise exceptions.AuthenticationFailed(_("Signature has expired."))
+        except jwt.DecodeError:
+            raise exceptions.AuthenticationFailed(_("Error decoding signature."))
+        except jwt.InvalidTokenError:
+            raise exceptions.AuthenticationFailed()
+
+        identify(verified.account_id)
+        user = get_user_model().objects.filter(pk=verified.account_id).first()
+        if user is None:
+            raise exceptions.AuthenticationFailed(_("Invalid signature."))
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User account is disabled."))
+
+        user.jwt_claims = verified.claims
+        return (user, jwt_value)
@@ -0,0 +1,144 @@
+"""
+Async gateway to the Cognito user pool.
+
+boto3 is synchronous, so every call runs on a small dedicated thread pool and the calling coroutine awaits it. The
+pool, boto's HTTP connection pool and its retry budget are sized together from settings, which bounds how many
+Cognito round trips are in flight per process no matter how many requests are waiting on them. Errors from boto
+(service errors as well as timeouts) are raised as `CognitoError` so views only deal with one exception type, and so
+is a sign in answered with a challenge (e.g. NEW_PASSWORD_REQUIRED), which these endpoints cannot complete.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
+from django.conf import settings
+
+# Errors meaning Cognito could not serve the call right now, as opposed to rejecting it
+UNAVAILABLE_CODES = {"TooManyRequestsException", "LimitExceededException", "InternalErrorException", "Unavailable"}
+
+
+class CognitoError(Exception):
+    def __init__(self, code, message=""):
+        super().__init__(message or code)
+        self.code = code
+
+    @property
+    def status_code(self):
+        """HTTP status to answer with when a view has no more specific mapping for `code`."""
+        return 503 if self.code in UNAVAILABLE_CODES else 500
+
+
+class CognitoGateway:
+    """
+    The user pool operations used by `user_auth.views`, as coroutines.
+
+    `client` is a boto3 `cognito-idp` client or anything with the same methods, such as
+    `user_auth.fake_cognito.FakeCognitoClient`.
+    """
+
+    def __init__(self, client, client_id, max_workers=10):
+        self.client = client
+        self.client_id = client_id
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cognito")
+
+    async def sign_up(self, email, password, attributes):
+        return await self._call(
+            "sign_up",
+            Username=email,
+            Password=password,
+            UserAttributes=[{"Name": name, "Value": value} for name, value in attributes.items()],
+        )
+
+    async def confirm_sign_up(self, email, code):
+        return await self._call("confirm_sign_up", Username=email, ConfirmationCode=code)
+
+    async def resend_confirmation_code(self, email):
+        return await self._call("resend_confirmation_code", Username=email)
+
+    async def login(self, email, password):
+        response = await self._call(
+            "initiate_auth",
+            AuthFlow="USER_PASSWORD_AUTH",
+            AuthParameters={"USERNAME": email, "PASSWORD": password},
+        )
+        return authentication_result(response)
+
+    async def refresh(self, refresh_token):
+        response = await self._call(
+            "initiate_auth",
+            AuthFlow="REFRESH_TOKEN_AUTH",
+            AuthParameters={"REFRESH_TOKEN": refresh_token},
+        )
+        return authentication_result(response)
+
+    async def forgot_password(self, email):
+        return await self._call("forgot_password", Username=email)
+
+    async def confirm_forgot_password(self, email, code, password):
+        return await self._call("confirm_forgot_password", Username=email, ConfirmationCode=code, Password=password)
+
+    async def _call(self, operation, **params):
+        call = partial(getattr(self.client, operation), ClientId=self.client_id, **params)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, call)
+        except ClientError as e:
+            error = e.response.get("Error", {})
+            raise CognitoError(error.get("Code", "Unknown"), error.get("Message", "")) from e
+        except BotoCoreError as e:
+            # Connection errors and timeouts, after boto has used up its retry budget
+            raise CognitoError("Unavailable", str(e)) from e
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def authentication_result(response):
+    """The tokens of an `initiate_auth` response, or `CognitoError("ChallengeRequired")` when it holds a challenge."""
+    if "AuthenticationResult" not in response:
+        challenge = response.get("ChallengeName", "unknown")
+        raise CognitoError("ChallengeRequired", f"Cognito requires the {challenge} challenge to sign in")
+    return response["AuthenticationResult"]
+
+
+def build_client():
+    if settings.COGNITO_BACKEND == "fake":
+        from user_auth.fake_cognito import FakeCognitoClient
+
+        return FakeCognitoClient(latency=settings.COGNITO_FAKE_LATENCY)
+    config = Config(
+        max_pool_connections=settings.COGNITO_MAX_CONNECTIONS,
+        connect_timeout=settings.COGNITO_CONNECT_TIMEOUT,
+        read_timeout=settings.COGNITO_READ_TIMEOUT,
+        retries={"mode": "standard", "total_max_attempts": settings.COGNITO_MAX_ATTEMPTS},
+    )
+    return boto3.client("cognito-idp", region_name=settings.AWS_REGION, config=config)
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    global _gateway
+    if _gateway is None:
+        with _gateway_lock:
+            if _gateway is None:
+                _gateway = CognitoGateway(
+                    build_client(),
+                    client_id=settings.APP_CLIENT_ID,
+                    max_workers=settings.COGNITO_MAX_CONNECTIONS,
+                )
+    return _gateway
+
+
+def set_gateway(gateway):
+    """Replace the process-wide gateway, e.g. with one around a fake client in tests. Returns the previous one."""
+    global _gateway
+    with _gateway_lock:
+        previous, _gateway = _gateway, gateway
+    return previous
@@ -0,0 +1,99 @@
+"""
+In-memory stand-in for the boto3 `cognito-idp` client, for tests, local development and benchmarks.
+
+It implements the operations `user_auth.cognito.CognitoGateway` uses with the same parameters and raises
+`botocore.exceptions.ClientError` with Cognito's error codes, so the gateway's error handling is exercised exactly
+as with the real service. `latency` seconds of sleep are added to every call to simulate the network round trip.
+Tokens are opaque random strings, not JWTs.
+"""
+
+import secrets
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+
+class FakeCognitoClient:
+    def __init__(self, latency=0.0, confirmation_code="123456"):
+        self.latency = latency
+        self.confirmation_code = confirmation_code
+        self.users = {}
+        self.refresh_tokens = {}
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def sign_up(self, ClientId, Username, Password, UserAttributes):
+        with self._call("SignUp"):
+            if Username in self.users:
+                raise self._error("UsernameExistsException", "User already exists", "SignUp")
+            attributes = {attribute["Name"]: attribute["Value"] for attribute in UserAttributes}
+            self.users[Username] = {"password": Password, "attributes": attributes, "confirmed": False}
+            return {"UserConfirmed": False, "UserSub": secrets.token_hex(16)}
+
+    def confirm_sign_up(self, ClientId, Username, ConfirmationCode):
+        with self._call("ConfirmSignUp"):
+            self._user(Username, "ConfirmSignUp")
+            self._check_code(ConfirmationCode, "ConfirmSignUp")
+            self.users[Username]["confirmed"] = True
+            return {}
+
+    def resend_confirmation_code(self, ClientId, Username):
+        with self._call("ResendConfirmationCode"):
+            self._user(Username, "ResendConfirmationCode")
+            return {"CodeDeliveryDetails": {"DeliveryMedium": "EMAIL", "AttributeName": "email"}}
+
+    def initiate_auth(self, ClientId, AuthFlow, AuthParameters):
+        with self._call("InitiateAuth"):
+            if AuthFlow == "REFRESH_TOKEN_AUTH":
+                if AuthParameters["REFRESH_TOKEN"] not in self.refresh_tokens:
+                    raise self._error("NotAuthorizedException", "Invalid Refresh Token", "InitiateAuth")
+                return {"AuthenticationResult": self._tokens()}
+            user = self._user(AuthParameters["USERNAME"], "InitiateAuth")
+            if user["password"] != AuthParameters["PASSWORD"]:
+                raise self._error("NotAuthorizedException", "Incorrect username or password.", "InitiateAuth")
+            if not user["confirmed"]:
+                raise self._error("UserNotConfirmedException", "User is not confirmed.", "InitiateAuth")
+            refresh_token = secrets.token_urlsafe(32)
+            self.refresh_tokens[refresh_token] = AuthParameters["USERNAME"]
+            return {"AuthenticationResult": {**self._tokens(), "RefreshToken": refresh_token}}
+
+    def forgot_password(self, ClientId, Username):
+        with self._call("ForgotPassword"):
+            self._user(Username, "ForgotPassword")
+            return {"CodeDeliveryDetails": {"DeliveryMedium": "EMAIL", "AttributeName": "email"}}
+
+    def confirm_forgot_password(self, ClientId, Username, ConfirmationCode, Password):
+        with self._call("ConfirmForgotPassword"):
+            user = self._user(Username, "ConfirmForgotPassword")
+            self._check_code(ConfirmationCode, "ConfirmForgotPassword")
+            user["password"] = Password
+            return {}
+
+    def _call(self, operation):
+        self.calls.append(operation)
+        if self.latency:
+            time.sleep(self.latency)
+        return self._lock
+
+    def _user(self, username, operation):
+        user = self.users.get(username)
+        if user is None:
+            raise self._error("UserNotFoundException", "User does not exist.", operation)
+        return user
+
+    def _check_code(self, code, operation):
+        if code != self.confirmation_code:
+            raise self._error("CodeMismatchException", "Invalid verification code provided.", operation)
+
+    def _tokens(self):
+        return {
+            "AccessToken": secrets.token_urlsafe(32),
+            "IdToken": secrets.token_urlsafe(32),
+            "ExpiresIn": 3600,
+            "TokenType": "Bearer",
+        }
+
+    @staticmethod
+    def _error(code, message, operation):
+        return ClientError({"Error": {"Code": code, "Message": message}}, operation)
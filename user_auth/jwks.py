@@ -0,0 +1,171 @@
+import json
+import logging
+import threading
+import time
+from urllib import request
+
+from django.conf import settings
+from jwt.algorithms import RSAAlgorithm
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_jwks(url, timeout):
+    with request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def load_jwks_file(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+class JWKSKeyStore:
+    """
+    In-memory store of parsed Cognito public keys, indexed by `kid`.
+
+    Keys are loaded lazily on first use (from `jwks_file` when given, otherwise from `jwks_url`) and kept for
+    `ttl` seconds. Once the TTL has passed, the current keys keep being served while a background thread refreshes
+    them. A `kid` that is not in the store triggers a synchronous refresh, at most once per `refresh_interval`
+    seconds whatever the kid; only one thread fetches at a time and the others wait for its result. Kids that are
+    still unknown after a refresh are remembered for `negative_ttl` seconds. A flood of forged tokens therefore
+    costs one JWKS download per `refresh_interval` at most, and the kids remembered stay bounded by the same rate.
+    """
+
+    def __init__(
+        self, jwks_url=None, jwks_file=None, ttl=3600, negative_ttl=300, refresh_interval=60, timeout=5, fetch=None
+    ):
+        self.jwks_url = jwks_url
+        self.jwks_file = jwks_file
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        self._fetch = fetch or fetch_jwks
+
+        self._keys = {}
+        self._loaded_at = None
+        self._fetched_at = None
+        self._unknown_kids = {}
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get_key(self, kid):
+        """
+        Return the public key object for `kid`, or None if the JWKS does not contain it.
+        """
+        loaded_at = self._loaded_at
+        if loaded_at is None:
+            self._load_initial()
+        elif self._is_expired():
+            self._refresh_in_background()
+
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        if self._is_negatively_cached(kid) or self._fetched_recently():
+            return None
+        self._refresh(kid, loaded_at)
+        key = self._keys.get(kid)
+        if key is None:
+            now = time.monotonic()
+            self._unknown_kids = {known: at for known, at in self._unknown_kids.items() if now - at < self.negative_ttl}
+            self._unknown_kids[kid] = now
+        return key
+
+    def set_jwks(self, jwks):
+        keys = {}
+        for jwk in jwks.get("keys", []):
+            try:
+                keys[jwk["kid"]] = RSAAlgorithm.from_jwk(json.dumps(jwk))
+            except (KeyError, ValueError):
+                logger.warning("Skipping malformed JWK %s", jwk.get("kid"))
+        self._keys = keys
+        self._loaded_at = time.monotonic()
+        self._unknown_kids = {kid: at for kid, at in self._unknown_kids.items() if kid not in keys}
+
+    def clear(self):
+        with self._lock:
+            self._keys = {}
+            self._loaded_at = None
+            self._fetched_at = None
+            self._unknown_kids = {}
+
+    def _load_initial(self):
+        with self._lock:
+            if self._loaded_at is not None:
+                return
+            if self.jwks_file:
+                self.set_jwks(load_jwks_file(self.jwks_file))
+            else:
+                self._fetch_and_set()
+
+    def _refresh(self, kid, loaded_at):
+        with self._lock:
+            # Keys were (re)loaded since the caller looked at them, that result is fresh enough.
+            if self._loaded_at != loaded_at or kid in self._keys or self._fetched_recently():
+                return
+            self._fetch_and_set()
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                with self._lock:
+                    self._fetch_and_set()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="jwks-refresh", daemon=True).start()
+
+    def _fetch_and_set(self):
+        if not self.jwks_url:
+            # Keys seeded from a file without a URL to refresh from, just extend their lifetime.
+            self._loaded_at = time.monotonic()
+            return
+        self._fetched_at = time.monotonic()
+        try:
+            self.set_jwks(self._fetch(self.jwks_url, self.timeout))
+        except Exception:
+            logger.exception("Failed to fetch JWKS from %s", self.jwks_url)
+            if self._loaded_at is None:
+                # Nothing to fall back on yet, retry after `negative_ttl` instead of on every request.
+                self._loaded_at = time.monotonic() - max(self.ttl - self.negative_ttl, 0)
+            else:
+                # Keep serving the keys we have and try again after another TTL.
+                self._loaded_at = time.monotonic()
+
+    def _is_expired(self):
+        return time.monotonic() - self._loaded_at > self.ttl
+
+    def _fetched_recently(self):
+        return self._fetched_at is not None and time.monotonic() - self._fetched_at < self.refresh_interval
+
+    def _is_negatively_cached(self, kid):
+        seen_at = self._unknown_kids.get(kid)
+        return seen_at is not None and time.monotonic() - seen_at < self.negative_ttl
+
+
+_key_store = None
+_key_store_lock = threading.Lock()
+
+
+def get_key_store():
+    global _key_store
+    if _key_store is None:
+        with _key_store_lock:
+            if _key_store is None:
+                _key_store = JWKSKeyStore(
+                    jwks_url=settings.COGNITO_JWKS_URL,
+                    jwks_file=settings.COGNITO_JWKS_FILE,
+                    ttl=settings.COGNITO_JWKS_TTL,
+                    negative_ttl=settings.COGNITO_JWKS_NEGATIVE_TTL,
+                    refresh_interval=settings.COGNITO_JWKS_REFRESH_INTERVAL,
+                    timeout=settings.COGNITO_JWKS_TIMEOUT,
+                )
+    return _key_store
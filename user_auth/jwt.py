@@ -1,12 +1,13 @@
-from datetime import datetime
-
 import jwt
 from django.contrib.auth import authenticate, get_user_model
+from django.utils import timezone
 from jwt import DecodeError
-from jwt.algorithms import RSAAlgorithm
 from rest_framework_jwt.settings import api_settings
 
 from accounts.models import Athlete, Coach
+from user_auth.activity import tracker
+from user_auth.jwks import get_key_store
+from user_auth.token_cache import token_cache
 
 
 def get_username_from_payload_handler(payload):
@@ -16,6 +17,21 @@ def get_username_from_payload_handler(payload):
 
 
 def cognito_jwt_decode_handler(token):
+    return get_verified_token(token).claims
+
+
+def get_verified_token(token):
+    """
+    Return the cached verification result for `token`, verifying it (and upserting its account) on a cache miss.
+    """
+    verified = token_cache.get(token)
+    if verified is None:
+        verified = verify_token(token)
+    tracker.record(verified.account_id)
+    return verified
+
+
+def verify_token(token):
     """
     To verify the signature of an Amazon Cognito JWT, first search for the public key with a key ID that
     matches the key ID in the header of the token. (c)
@@ -28,12 +44,9 @@ def cognito_jwt_decode_handler(token):
     if "kid" not in unverified_header:
         raise DecodeError("Incorrect authentication credentials.")
 
-    kid = jwt.get_unverified_header(token)["kid"]
-    try:
-        # pick a proper public key according to `kid` from token header
-        public_key = RSAAlgorithm.from_jwk(api_settings.JWT_PUBLIC_KEY[kid])
-    except KeyError:
-        # in this place we could refresh cached jwks and try again https://immoatlas.atlassian.net/browse/DEV-69
+    # pick a proper public key according to `kid` from token header, the key store refreshes jwks for unknown kids
+    public_key = get_key_store().get_key(unverified_header["kid"])
+    if public_key is None:
         raise DecodeError("Can't find proper public key in jwks")
 
     claims = jwt.decode(
@@ -61,12 +74,10 @@ def cognito_jwt_decode_handler(token):
         defaults={
             "first_name": first_name,
             "last_name": last_name,
+            "last_login": timezone.now(),
         },
     )
 
-    user.last_login = datetime.now()
-    user.save()
-
     if created:
         if account_type == "athlete":
             Athlete.objects.create(user=user)
@@ -76,4 +87,4 @@ def cognito_jwt_decode_handler(token):
             user.is_staff = True
             user.is_superuser = True
             user.save()
-    return claims
+    return token_cache.set(token, claims, user.pk)
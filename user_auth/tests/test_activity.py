@@ -0,0 +1,89 @@
+from unittest import mock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import Account
+from user_auth.activity import ActivityTracker, tracker, write_activity
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestActivityTracker:
+    def test_record_only_buffers(self, create_user):
+        user = create_user(email="user@example.com", password="pass")
+        activity = ActivityTracker()
+        with CaptureQueriesContext(connection) as queries:
+            activity.record(user.pk)
+            activity.record(user.pk)
+        assert len(queries) == 0
+        assert activity.pending() == {user.pk: 2}
+
+    def test_flush_writes_every_account_in_one_query(self, create_user):
+        users = [create_user(email=f"user{i}@example.com", password="pass") for i in range(3)]
+        activity = ActivityTracker()
+        for user in users + users[:1]:
+            activity.record(user.pk)
+        with CaptureQueriesContext(connection) as queries:
+            assert activity.flush() == 3
+        assert len(queries) == 1
+        assert activity.pending() == {}
+
+        counts = dict(Account.objects.values_list("pk", "request_count"))
+        assert counts == {users[0].pk: 2, users[1].pk: 1, users[2].pk: 1}
+        assert all(user.last_login is not None for user in Account.objects.all())
+
+        activity.record(users[1].pk)
+        activity.flush()
+        assert Account.objects.get(pk=users[1].pk).request_count == 2
+
+    def test_failed_flush_is_retried(self, create_user):
+        user = create_user(email="user@example.com", password="pass")
+        activity = ActivityTracker()
+        activity.record(user.pk)
+        with mock.patch("user_auth.activity.write_activity", side_effect=RuntimeError("down")):
+            with pytest.raises(RuntimeError):
+                activity.flush()
+        activity.record(user.pk)
+        assert activity.pending() == {user.pk: 2}
+        activity.flush()
+        assert Account.objects.get(pk=user.pk).request_count == 2
+
+    def test_only_unwritten_batches_are_retried(self, create_user):
+        users = [create_user(email=f"user{i}@example.com", password="pass") for i in range(3)]
+        activity = ActivityTracker(batch_size=1)
+        for user in users:
+            activity.record(user.pk)
+        calls = []
+
+        def fail_after_first_batch(rows):
+            calls.append(rows)
+            if len(calls) > 1:
+                raise RuntimeError("down")
+            write_activity(rows)
+
+        with mock.patch("user_auth.activity.write_activity", side_effect=fail_after_first_batch):
+            with pytest.raises(RuntimeError):
+                activity.flush()
+        assert activity.pending() == {users[1].pk: 1, users[2].pk: 1}
+        activity.flush()
+        assert set(Account.objects.values_list("request_count", flat=True)) == {1}
+
+    def test_flushes_in_background_when_full(self):
+        activity = ActivityTracker(max_pending=2)
+        with mock.patch.object(activity, "_flush_in_background") as flush:
+            activity.record(1)
+            flush.assert_not_called()
+            activity.record(2)
+            flush.assert_called_once()
+
+    def test_authenticated_requests_are_recorded(self, api_client, cognito_token):
+        token = cognito_token("active@example.com")
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        url = reverse("account-notification-token")
+        api_client.post(url, {"token": "device-1"})
+        api_client.post(url, {"token": "device-2"})
+        account = Account.objects.get(email="active@example.com")
+        assert tracker.pending() == {account.pk: 2}
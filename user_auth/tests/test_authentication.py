@@ -0,0 +1,63 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+
+from accounts.models import Account, Athlete
+from user_auth.token_cache import TokenCache, token_cache
+
+
+@pytest.mark.unit
+class TestTokenCache:
+    def test_evicts_least_recently_used(self):
+        cache = TokenCache(max_size=2)
+        exp = 2**31
+        cache.set("a", {"exp": exp}, 1)
+        cache.set("b", {"exp": exp}, 2)
+        assert cache.get("a").account_id == 1
+        cache.set("c", {"exp": exp}, 3)
+        assert cache.get("b") is None
+        assert cache.get("c").account_id == 3
+        assert cache.stats() == {"size": 2, "max_size": 2, "hits": 2, "misses": 1, "evictions": 1}
+
+    def test_expired_tokens_are_dropped(self):
+        cache = TokenCache()
+        cache.set("a", {"exp": 1}, 1)
+        cache.set("b", {}, 2)
+        assert cache.get("a") is None
+        assert cache.get("b") is None
+        assert cache.stats()["size"] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestCognitoAuthentication:
+    def test_first_request_creates_account(self, api_client, cognito_token):
+        token = cognito_token("new@example.com", account_type="athlete")
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        user = Account.objects.create_user(email="other@example.com", password="pass")
+        response = api_client.get(reverse("account-detail", kwargs={"pk": user.pk}))
+        assert response.status_code == status.HTTP_200_OK
+        account = Account.objects.get(email="new@example.com")
+        assert account.last_login is not None
+        assert Athlete.objects.filter(user=account).exists()
+
+    def test_cached_token_skips_verification_and_upsert(self, api_client, cognito_token):
+        token = cognito_token("cached@example.com")
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        url = reverse("account-notification-token")
+        api_client.post(url, {"token": "device-1"})
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(url, {"token": "device-2"})
+        assert response.status_code == status.HTTP_200_OK
+        assert token_cache.stats()["hits"] == 1
+        account_queries = [q["sql"] for q in queries if '"accounts_account"' in q["sql"]]
+        assert len(account_queries) == 1
+        assert account_queries[0].startswith("SELECT")
+
+    def test_expired_token_is_rejected(self, api_client, cognito_token):
+        token = cognito_token("expired@example.com", expires_in=-10)
+        api_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        response = api_client.post(reverse("account-notification-token"), {"token": "device"})
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,132 @@
+import asyncio
+import time
+
+import pytest
+from botocore.exceptions import ConnectTimeoutError
+from django.urls import reverse
+from rest_framework import status
+
+from academics.models import University, UniversityEmailDomain
+from user_auth.cognito import CognitoError, CognitoGateway, set_gateway
+from user_auth.fake_cognito import FakeCognitoClient
+
+
+class TimingOutClient(FakeCognitoClient):
+    def initiate_auth(self, **kwargs):
+        raise ConnectTimeoutError(endpoint_url="https://cognito-idp.us-east-1.amazonaws.com/")
+
+
+class ChallengingClient(FakeCognitoClient):
+    def initiate_auth(self, **kwargs):
+        return {"ChallengeName": "NEW_PASSWORD_REQUIRED", "Session": "session", "ChallengeParameters": {}}
+
+
+@pytest.mark.unit
+class TestCognitoGateway:
+    def test_calls_run_concurrently_up_to_pool_size(self):
+        gateway = CognitoGateway(FakeCognitoClient(latency=0.2), client_id="client", max_workers=8)
+
+        async def register_many():
+            await asyncio.gather(
+                *[gateway.sign_up(f"user{i}@example.com", "password", {"email": "x"}) for i in range(8)]
+            )
+
+        started = time.monotonic()
+        asyncio.run(register_many())
+        assert time.monotonic() - started < 1.0
+        assert len(gateway.client.users) == 8
+        gateway.shutdown()
+
+    def test_client_errors_are_translated(self):
+        gateway = CognitoGateway(FakeCognitoClient(), client_id="client")
+        with pytest.raises(CognitoError) as excinfo:
+            asyncio.run(gateway.login("missing@example.com", "password"))
+        assert excinfo.value.code == "UserNotFoundException"
+        assert excinfo.value.status_code == 500
+        gateway.shutdown()
+
+    def test_challenges_are_reported(self):
+        gateway = CognitoGateway(ChallengingClient(), client_id="client")
+        with pytest.raises(CognitoError) as excinfo:
+            asyncio.run(gateway.login("athlete@example.com", "password"))
+        assert excinfo.value.code == "ChallengeRequired"
+        assert "NEW_PASSWORD_REQUIRED" in str(excinfo.value)
+        gateway.shutdown()
+
+    def test_timeouts_are_reported_as_unavailable(self):
+        gateway = CognitoGateway(TimingOutClient(), client_id="client")
+        with pytest.raises(CognitoError) as excinfo:
+            asyncio.run(gateway.refresh("token"))
+        assert excinfo.value.code == "Unavailable"
+        assert excinfo.value.status_code == 503
+        gateway.shutdown()
+
+
+@pytest.mark.unit
+@pytest.mark.django_db
+class TestAuthViews:
+    def test_register_confirm_login_refresh(self, api_client, fake_cognito):
+        email = "athlete@example.com"
+        response = api_client.put(
+            reverse("user-register"), {"account_type": "athlete", "email": email, "password": "pw"}, format="json"
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        assert fake_cognito.users[email]["attributes"]["custom:account_type"] == "athlete"
+
+        response = api_client.post(reverse("user-login"), {"email": email, "password": "pw"}, format="json")
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+        response = api_client.post(reverse("user-confirm"), {"email": email, "code": "000000"}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        response = api_client.post(reverse("user-confirm"), {"email": email, "code": "123456"}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+
+        response = api_client.post(reverse("user-login"), {"email": email, "password": "pw"}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        refresh_token = response.data["RefreshToken"]
+
+        response = api_client.post(reverse("user-refresh-token"), {"refresh_token": refresh_token}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert "AccessToken" in response.data
+        response = api_client.post(reverse("user-refresh-token"), {"refresh_token": "forged"}, format="json")
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_login_challenge_is_a_json_error(self, api_client):
+        gateway = CognitoGateway(ChallengingClient(), client_id="client")
+        previous = set_gateway(gateway)
+        try:
+            response = api_client.post(
+                reverse("user-login"), {"email": "athlete@example.com", "password": "pw"}, format="json"
+            )
+        finally:
+            set_gateway(previous)
+            gateway.shutdown()
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert "NEW_PASSWORD_REQUIRED" in response.data["error"]
+
+    def test_coach_registration_requires_university_domain(self, api_client, fake_cognito):
+        data = {"account_type": "coach", "email": "coach@uni.edu", "password": "pw"}
+        response = api_client.put(reverse("user-register"), data, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert fake_cognito.calls == []
+
+        UniversityEmailDomain.objects.create(university=University.objects.create(name="U"), domain="uni.edu")
+        response = api_client.put(reverse("user-register"), data, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+
+    def test_invalid_payload_is_rejected_before_calling_cognito(self, api_client, fake_cognito):
+        response = api_client.post(reverse("user-login"), {"email": "not-an-email"}, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert fake_cognito.calls == []
+
+    def test_reset_password(self, api_client, fake_cognito):
+        fake_cognito.users["a@example.com"] = {"password": "old", "attributes": {}, "confirmed": True}
+        response = api_client.post(reverse("user-forgot-password"), {"email": "a@example.com"}, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        response = api_client.post(
+            reverse("user-confirm-forgot-password"),
+            {"email": "a@example.com", "confirmation_code": "123456", "password": "new"},
+            format="json",
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert fake_cognito.users["a@example.com"]["password"] == "new"
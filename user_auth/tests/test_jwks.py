@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+from user_auth.jwks import JWKSKeyStore
+
+
+def make_jwk(kid):
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    jwk = json.loads(RSAAlgorithm.to_jwk(private_key.public_key()))
+    jwk.update({"kid": kid, "alg": "RS256", "use": "sig"})
+    return jwk
+
+
+@pytest.mark.unit
+class TestJWKSKeyStore:
+    def test_loads_lazily_and_caches_parsed_keys(self):
+        calls = []
+
+        def fetch(url, timeout):
+            calls.append(url)
+            return {"keys": [make_jwk("a")]}
+
+        store = JWKSKeyStore(jwks_url="https://example.com/jwks.json", fetch=fetch)
+        assert calls == []
+        key = store.get_key("a")
+        assert key is not None
+        assert store.get_key("a") is key
+        assert len(calls) == 1
+
+    def test_seeds_from_file_without_network(self, tmp_path):
+        path = tmp_path / "jwks.json"
+        path.write_text(json.dumps({"keys": [make_jwk("a")]}))
+
+        def fetch(url, timeout):
+            raise AssertionError("should not fetch")
+
+        store = JWKSKeyStore(jwks_url="https://example.com/jwks.json", jwks_file=str(path), fetch=fetch)
+        assert store.get_key("a") is not None
+
+    def test_unknown_kid_refreshes_once_and_is_negatively_cached(self):
+        jwks = {"keys": [make_jwk("a")]}
+        calls = []
+
+        def fetch(url, timeout):
+            calls.append(url)
+            return jwks
+
+        store = JWKSKeyStore(jwks_url="https://example.com/jwks.json", refresh_interval=0, fetch=fetch)
+        store.get_key("a")
+        jwks = {"keys": [make_jwk("a"), make_jwk("b")]}
+        assert store.get_key("b") is not None
+        assert len(calls) == 2
+
+        assert store.get_key("forged") is None
+        assert store.get_key("forged") is None
+        assert len(calls) == 3
+
+    def test_unknown_kids_refresh_once_per_interval(self):
+        calls = []
+
+        def fetch(url, timeout):
+            calls.append(url)
+            return {"keys": [make_jwk("a")]}
+
+        store = JWKSKeyStore(jwks_url="https://example.com/jwks.json", fetch=fetch)
+        store.get_key("a")
+        for i in range(100):
+            assert store.get_key(f"forged-{i}") is None
+        assert len(calls) == 1
+        assert store._unknown_kids == {}
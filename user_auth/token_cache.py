@@ -0,0 +1,78 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+
+VerifiedToken = namedtuple("VerifiedToken", ["claims", "account_id", "expires_at"])
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified bearer tokens.
+
+    Entries are keyed by a SHA-256 digest of the token so raw credentials are never kept in memory, and hold the
+    verified claims plus the id of the account the token resolved to. An entry is dropped once the token's `exp`
+    has passed, so a cached token is never accepted for longer than a freshly verified one would be.
+    """
+
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def digest(token):
+        if isinstance(token, str):
+            token = token.encode()
+        return hashlib.sha256(token).hexdigest()
+
+    def get(self, token):
+        key = self.digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, token, claims, account_id):
+        entry = VerifiedToken(claims, account_id, claims.get("exp"))
+        if not entry.expires_at or self.max_size <= 0:
+            # Tokens without an `exp` claim are never cached, they are verified on every request.
+            return entry
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+token_cache = TokenCache(max_size=getattr(settings, "JWT_TOKEN_CACHE_SIZE", 10000))
@@ -1,12 +1,11 @@
-import boto3
-from django.conf import settings
 from drf_spectacular.utils import OpenApiResponse, extend_schema
 from rest_framework import status
 from rest_framework.response import Response
-from rest_framework.views import APIView
 
 from academics.models import UniversityEmailDomain
+from api.views import AsyncAPIView
 
+from .cognito import CognitoError, get_gateway
 from .serializers import (
     ConfirmCodeSerializer,
     ConfirmForgotPasswordSerializer,
@@ -18,10 +17,8 @@ from .serializers import (
     ResendCodeSerializer,
 )
 
-client = boto3.client("cognito-idp", region_name=settings.AWS_REGION)
 
-
-class RegisterView(APIView):
+class RegisterView(AsyncAPIView):
     permission_classes = []
 
     @extend_schema(
@@ -32,7 +29,7 @@ class RegisterView(APIView):
             500: OpenApiResponse(description="Registration failed"),
         },
     )
-    def put(self, request, *args, **kwargs):
+    async def put(self, request, *args, **kwargs):
         serializer = RegisterSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data["email"]
@@ -41,31 +38,26 @@ class RegisterView(APIView):
         phone = serializer.validated_data.get("phone", "")
         if account_type == "coach":
             domain = email.split("@")[-1]
-            if not UniversityEmailDomain.objects.filter(domain=domain).exists():
+            if not await UniversityEmailDomain.objects.filter(domain=domain).aexists():
                 return Response(
                     {"error": "Email domain is not allowed for coach registration"},
                     status=status.HTTP_400_BAD_REQUEST,
                 )
         try:
-            client.sign_up(
-                ClientId=settings.APP_CLIENT_ID,
-                Username=email,
-                Password=password,
-                UserAttributes=[
-                    {"Name": "email", "Value": email},
-                    {"Name": "phone_number", "Value": phone},
-                    {"Name": "custom:account_type", "Value": account_type},
-                ],
+            await get_gateway().sign_up(
+                email,
+                password,
+                {"email": email, "phone_number": phone, "custom:account_type": account_type},
             )
-            return Response({"message": "User registered successfully"}, status=status.HTTP_201_CREATED)
-        except client.exceptions.UsernameExistsException:
-            # TODO: resend confirmation code logic
-            return Response({"error": "User already exists"}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            return Response({"error": f"Registration failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        except CognitoError as e:
+            if e.code == "UsernameExistsException":
+                # TODO: resend confirmation code logic
+                return Response({"error": "User already exists"}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"error": f"Registration failed: {str(e)}"}, status=e.status_code)
+        return Response({"message": "User registered successfully"}, status=status.HTTP_201_CREATED)
 
 
-class ConfirmCodeView(APIView):
+class ConfirmCodeView(AsyncAPIView):
     permission_classes = []
 
     @extend_schema(
@@ -76,27 +68,23 @@ class ConfirmCodeView(APIView):
             500: OpenApiResponse(description="Confirmation failed"),
         },
     )
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         serializer = ConfirmCodeSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data["email"]
         code = serializer.validated_data["code"]
         try:
-            client.confirm_sign_up(
-                ClientId=settings.APP_CLIENT_ID,
-                Username=email,
-                ConfirmationCode=code,
-            )
-            return Response({"message": "User confirmed successfully"}, status=status.HTTP_200_OK)
-        except client.exceptions.CodeMismatchException:
-            return Response({"error": "Invalid confirmation code"}, status=status.HTTP_400_BAD_REQUEST)
-        except client.exceptions.ExpiredCodeException:
-            return Response({"error": "Confirmation code expired"}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            return Response({"error": f"Confirmation failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            await get_gateway().confirm_sign_up(email, code)
+        except CognitoError as e:
+            if e.code == "CodeMismatchException":
+                return Response({"error": "Invalid confirmation code"}, status=status.HTTP_400_BAD_REQUEST)
+            if e.code == "ExpiredCodeException":
+                return Response({"error": "Confirmation code expired"}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"error": f"Confirmation failed: {str(e)}"}, status=e.status_code)
+        return Response({"message": "User confirmed successfully"}, status=status.HTTP_200_OK)
 
 
-class ResendCodeView(APIView):
+class ResendCodeView(AsyncAPIView):
     permission_classes = []
 
     @extend_schema(
@@ -107,23 +95,20 @@ class ResendCodeView(APIView):
             500: OpenApiResponse(description="Internal server error"),
         },
     )
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         serializer = ResendCodeSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data["email"]
         try:
-            client.resend_confirmation_code(
-                ClientId=settings.APP_CLIENT_ID,
-                Username=email,
-            )
-            return Response({"message": "Confirmation code resent successfully"}, status=status.HTTP_200_OK)
-        except client.exceptions.UserNotFoundException:
-            return Response({"error": "User not found"}, status=status.HTTP_400_BAD_REQUEST)
-        except Exception as e:
-            return Response({"error": f"Resend code failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            await get_gateway().resend_confirmation_code(email)
+        except CognitoError as e:
+            if e.code == "UserNotFoundException":
+                return Response({"error": "User not found"}, status=status.HTTP_400_BAD_REQUEST)
+            return Response({"error": f"Resend code failed: {str(e)}"}, status=e.status_code)
+        return Response({"message": "Confirmation code resent successfully"}, status=status.HTTP_200_OK)
 
 
-class LoginView(APIView):
+class LoginView(AsyncAPIView):
     permission_classes = []
 
     @extend_schema(
@@ -131,116 +116,96 @@ class LoginView(APIView):
         responses={
             200: LoginResponseSerializer,
             401: OpenApiResponse(description="Invalid credentials"),
-            403: OpenApiResponse(description="User not confirmed"),
+            403: OpenApiResponse(description="User not confirmed, or Cognito requires a challenge to sign in"),
             404: OpenApiResponse(description="User not found"),
             500: OpenApiResponse(description="Login failed"),
         },
     )
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         serializer = LoginSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         try:
-            response = client.initiate_auth(
-                ClientId=settings.APP_CLIENT_ID,
-                AuthFlow="USER_PASSWORD_AUTH",
-                AuthParameters={
-                    "USERNAME": serializer.validated_data["email"],
-                    "PASSWORD": serializer.validated_data["password"],
-                },
+            tokens = await get_gateway().login(
+                serializer.validated_data["email"],
+                serializer.validated_data["password"],
             )
-            return Response(response["AuthenticationResult"], status=status.HTTP_200_OK)
-        except client.exceptions.NotAuthorizedException:
-            return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
-        except client.exceptions.UserNotConfirmedException:
-            return Response({"error": "User not confirmed"}, status=status.HTTP_403_FORBIDDEN)
-        except client.exceptions.UserNotFoundException:
-            return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
-        except Exception as e:
-            return Response({"error": f"Login failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-
-
-class ForgotPasswordView(APIView):
+        except CognitoError as e:
+            if e.code == "NotAuthorizedException":
+                return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
+            if e.code == "UserNotConfirmedException":
+                return Response({"error": "User not confirmed"}, status=status.HTTP_403_FORBIDDEN)
+            if e.code == "ChallengeRequired":
+                return Response({"error": f"Login failed: {str(e)}"}, status=status.HTTP_403_FORBIDDEN)
+            if e.code == "UserNotFoundException":
+                return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+            return Response({"error": f"Login failed: {str(e)}"}, status=e.status_code)
+        return Response(tokens, status=status.HTTP_200_OK)
+
+
+class ForgotPasswordView(AsyncAPIView):
     permission_classes = []
 
     @extend_schema(
         request=ForgotPasswordSerializer, responses={200: OpenApiResponse(description="Forgot Password endpoint")}
     )
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         serializer = ForgotPasswordSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data["email"]
         try:
-            client.forgot_password(
-                ClientId=settings.APP_CLIENT_ID,
-                Username=email,
-            )
-            return Response({"message": "Password reset code sent successfully"}, status=status.HTTP_200_OK)
-        except client.exceptions.UserNotFoundException:
-            return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
-        except Exception as e:
-            return Response(
-                {"error": f"Forgot Password failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
+            await get_gateway().forgot_password(email)
+        except CognitoError as e:
+            if e.code == "UserNotFoundException":
+                return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+            return Response({"error": f"Forgot Password failed: {str(e)}"}, status=e.status_code)
+        return Response({"message": "Password reset code sent successfully"}, status=status.HTTP_200_OK)
 
 
-class ConfirmForgotPasswordView(APIView):
+class ConfirmForgotPasswordView(AsyncAPIView):
     permission_classes = []
 
     @extend_schema(
         request=ConfirmForgotPasswordSerializer,
         responses={200: OpenApiResponse(description="Confirm Forgot Password endpoint")},
     )
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         serializer = ConfirmForgotPasswordSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         email = serializer.validated_data["email"]
         confirmation_code = serializer.validated_data["confirmation_code"]
         password = serializer.validated_data["password"]
         try:
-            client.confirm_forgot_password(
-                ClientId=settings.APP_CLIENT_ID,
-                Username=email,
-                ConfirmationCode=confirmation_code,
-                Password=password,
-            )
-            return Response({"message": "Password has been reset successfully"}, status=status.HTTP_200_OK)
-        except client.exceptions.UserNotFoundException:
-            return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
-        except client.exceptions.CodeMismatchException:
-            return Response({"error": "Invalid confirmation code"}, status=status.HTTP_400_BAD_REQUEST)
-        except client.exceptions.ExpiredCodeException:
-            return Response({"error": "Confirmation code has expired"}, status=status.HTTP_400_BAD_REQUEST)
-        except client.exceptions.UserNotConfirmedException:
-            # TODO: handle user not confirmed case
-            return Response({"error": "User not confirmed"}, status=status.HTTP_403_FORBIDDEN)
-        except Exception as e:
-            return Response(
-                {"error": f"Confirm Forgot Password failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-
-
-class RefreshTokenView(APIView):
+            await get_gateway().confirm_forgot_password(email, confirmation_code, password)
+        except CognitoError as e:
+            if e.code == "UserNotFoundException":
+                return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+            if e.code == "CodeMismatchException":
+                return Response({"error": "Invalid confirmation code"}, status=status.HTTP_400_BAD_REQUEST)
+            if e.code == "ExpiredCodeException":
+                return Response({"error": "Confirmation code has expired"}, status=status.HTTP_400_BAD_REQUEST)
+            if e.code == "UserNotConfirmedException":
+                # TODO: handle user not confirmed case
+                return Response({"error": "User not confirmed"}, status=status.HTTP_403_FORBIDDEN)
+            return Response({"error": f"Confirm Forgot Password failed: {str(e)}"}, status=e.status_code)
+        return Response({"message": "Password has been reset successfully"}, status=status.HTTP_200_OK)
+
+
+class RefreshTokenView(AsyncAPIView):
     permission_classes = []
 
     @extend_schema(
         request=RefreshTokenSerializer, responses={200: OpenApiResponse(description="Refresh Token endpoint")}
     )
-    def post(self, request, *args, **kwargs):
+    async def post(self, request, *args, **kwargs):
         serializer = RefreshTokenSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         refresh_token = serializer.validated_data["refresh_token"]
         try:
-            response = client.initiate_auth(
-                ClientId=settings.APP_CLIENT_ID,
-                AuthFlow="REFRESH_TOKEN_AUTH",
-                AuthParameters={
-                    "REFRESH_TOKEN": refresh_token,
-                },
-            )
-            return Response(response["AuthenticationResult"], status=status.HTTP_200_OK)
-        except client.exceptions.NotAuthorizedException:
-            return Response({"error": "Invalid refresh token"}, status=status.HTTP_401_UNAUTHORIZED)
-        except client.exceptions.UserNotFoundException:
-            return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
-        except Exception as e:
-            return Response({"error": f"Refresh Token failed: {str(e)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            tokens = await get_gateway().refresh(refresh_token)
+        except CognitoError as e:
+            if e.code == "NotAuthorizedException":
+                return Response({"error": "Invalid refresh token"}, status=status.HTTP_401_UNAUTHORIZED)
+            if e.code == "UserNotFoundException":
+                return Response({"error": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+            return Response({"error": f"Refresh Token failed: {str(e)}"}, status=e.status_code)
+        return Response(tokens, status=status.HTTP_200_OK)